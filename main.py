@@ -10,6 +10,8 @@ RAG 전체 파이프라인 실행 스크립트
     python main.py --step all              # 전체 실행
     python main.py --step preprocess       # 전처리만
     python main.py --step embed            # 임베딩만
+    python main.py --step bm25             # BM25 인덱스 + 검색기 스냅샷만 재구축
+    python main.py --step dense            # 임베딩 인덱스(전수 검색용)만 재구축
     python main.py --step rag              # RAG 테스트만
 """
 
@@ -31,6 +33,8 @@ def parse_arguments():
   python main.py --step all                    # 전체 파이프라인 실행
   python main.py --step preprocess             # 전처리만 실행
   python main.py --step embed                  # 임베딩만 실행
+  python main.py --step bm25                   # 기존 벡터DB로 BM25 인덱스 + 검색기 스냅샷만 재구축
+  python main.py --step dense                  # 기존 벡터DB로 임베딩 인덱스만 재구축
   python main.py --step rag --query "질문"    # RAG 테스트
   
   python main.py --step preprocess --chunk-size 500  # 청크 크기 조정
@@ -41,7 +45,7 @@ def parse_arguments():
     parser.add_argument(
         '--step',
         type=str,
-        choices=['all', 'preprocess', 'embed', 'rag'],
+        choices=['all', 'preprocess', 'embed', 'bm25', 'dense', 'rag'],
         default='all',
         help='실행할 단계 (기본값: all)'
     )
@@ -146,6 +150,52 @@ def step_embed(args):
         sys.exit(1)
 
 
+def step_bm25(args):
+    """2-1단계: 기존 벡터DB로 BM25 인덱스 구축"""
+    print("\n" + "="*70)
+    print("🔧 BM25 인덱스 구축 시작")
+    print("="*70)
+    
+    try:
+        from src.embedding.rag_data_processing import RAGVectorDBPipeline
+        
+        pipeline = RAGVectorDBPipeline()
+        pipeline.build_bm25_index()
+        
+        print("\n" + "="*70)
+        print("✅ BM25 인덱스 구축 완료")
+        print("="*70)
+        
+    except Exception as e:
+        print(f"❌ BM25 인덱스 구축 중 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+def step_dense(args):
+    """2-2단계: 기존 벡터DB로 임베딩 인덱스 구축"""
+    print("\n" + "="*70)
+    print("🔧 임베딩 인덱스 구축 시작")
+    print("="*70)
+    
+    try:
+        from src.embedding.rag_data_processing import RAGVectorDBPipeline
+        
+        pipeline = RAGVectorDBPipeline()
+        pipeline.build_dense_index()
+        
+        print("\n" + "="*70)
+        print("✅ 임베딩 인덱스 구축 완료")
+        print("="*70)
+        
+    except Exception as e:
+        print(f"❌ 임베딩 인덱스 구축 중 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
 def step_rag(args):
     """3단계: RAG 파이프라인 테스트"""
     print("\n" + "="*70)
@@ -216,6 +266,12 @@ def main():
         elif args.step == 'embed':
             step_embed(args)
             
+        elif args.step == 'bm25':
+            step_bm25(args)
+            
+        elif args.step == 'dense':
+            step_dense(args)
+            
         elif args.step == 'rag':
             step_rag(args)
         
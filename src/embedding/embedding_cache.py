@@ -0,0 +1,177 @@
+"""
+디스크 기반 임베딩 캐시
+
+(모델 이름, 용도, 텍스트 해시) → float32 벡터를 SQLite에 저장합니다.
+RAGRetriever와 ChromaDBBuilder가 같은 래퍼를 쓰므로 반복 질의와 반복 평가,
+DB 재구축 시 이미 임베딩한 텍스트는 네트워크 호출 없이 재사용합니다.
+"""
+
+import os
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+_LOOKUP_BATCH_SIZE = 500
+
+
+def _text_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode('utf-8')).digest()
+
+
+class CachedEmbeddings(Embeddings):
+    """SQLite 캐시를 거치는 Embeddings 래퍼"""
+
+    def __init__(self, embeddings: Embeddings, model_name: str, path: str):
+        """
+        Args:
+            embeddings: 실제 임베딩 객체 (OpenAIEmbeddings, LocalEmbeddings 등)
+            model_name: 캐시 키에 들어갈 모델 이름 (모델이 바뀌면 캐시가 분리됨)
+            path: SQLite 파일 경로
+        """
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                text_hash BLOB NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, kind, text_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    # === 캐시 조회 / 저장 ===
+
+    def _lookup(self, kind: str, hashes: List[bytes]) -> dict:
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), _LOOKUP_BATCH_SIZE):
+                batch = hashes[i:i + _LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND kind = ? AND text_hash IN ({placeholders})",
+                    [self.model_name, kind, *batch]
+                ).fetchall()
+                for text_hash, vector in rows:
+                    found[text_hash] = np.frombuffer(vector, dtype=np.float32).tolist()
+        return found
+
+    def _store(self, kind: str, hashes: List[bytes], vectors: List[List[float]]):
+        rows = [
+            (self.model_name, kind, text_hash, np.asarray(vector, dtype=np.float32).tobytes())
+            for text_hash, vector in zip(hashes, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, kind, text_hash, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def _split(self, kind: str, texts: List[str]):
+        """(해시 목록, 캐시된 벡터 dict, 캐시에 없는 텍스트 인덱스 - 중복 제외)"""
+        hashes = [_text_hash(text) for text in texts]
+        cached = self._lookup(kind, list(set(hashes)))
+
+        missing = []
+        seen = set()
+        for i, h in enumerate(hashes):
+            if h not in cached and h not in seen:
+                seen.add(h)
+                missing.append(i)
+
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        return hashes, cached, missing
+
+    def _merge(self, kind, hashes, cached, missing, new_vectors):
+        if missing:
+            # 캐시 히트와 같은 값이 되도록 새 벡터도 float32로 맞춰 반환
+            new_vectors = [np.asarray(vector, dtype=np.float32).tolist() for vector in new_vectors]
+            self._store(kind, [hashes[i] for i in missing], new_vectors)
+            cached.update({hashes[i]: vector for i, vector in zip(missing, new_vectors)})
+        return [cached[h] for h in hashes]
+
+    # === Embeddings 인터페이스 ===
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, cached, missing = self._split("document", texts)
+        new_vectors = self.embeddings.embed_documents([texts[i] for i in missing]) if missing else []
+        return self._merge("document", hashes, cached, missing, new_vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        hashes, cached, missing = self._split("query", [text])
+        new_vectors = [self.embeddings.embed_query(text)] if missing else []
+        return self._merge("query", hashes, cached, missing, new_vectors)[0]
+
+    # 비동기 버전은 SQLite 조회/저장을 스레드에서 실행 (이벤트 루프를 막지 않도록)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes, cached, missing = await asyncio.to_thread(self._split, "document", texts)
+        new_vectors = await self.embeddings.aembed_documents([texts[i] for i in missing]) if missing else []
+        return await asyncio.to_thread(self._merge, "document", hashes, cached, missing, new_vectors)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        hashes, cached, missing = await asyncio.to_thread(self._split, "query", [text])
+        new_vectors = [await self.embeddings.aembed_query(text)] if missing else []
+        return (await asyncio.to_thread(self._merge, "query", hashes, cached, missing, new_vectors))[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        여러 질의를 캐시에 없는 것만 모아 임베딩 (embed_query와 같은 캐시 공간)
+
+        내부 임베딩에 embed_queries가 있으면 배치 요청 한 번, 없으면 embed_query를 반복합니다
+        (embed_documents는 문서 지시어를 붙이는 모델이 있어 사용하지 않음).
+        """
+        hashes, cached, missing = self._split("query", texts)
+        missing_texts = [texts[i] for i in missing]
+        if not missing_texts:
+            new_vectors = []
+        elif hasattr(self.embeddings, 'embed_queries'):
+            new_vectors = self.embeddings.embed_queries(missing_texts)
+        else:
+            new_vectors = [self.embeddings.embed_query(text) for text in missing_texts]
+        return self._merge("query", hashes, cached, missing, new_vectors)
+
+    def stats(self) -> dict:
+        """히트/미스 통계"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'path': self.path,
+        }
+
+
+def with_embedding_cache(embeddings: Embeddings, config, model_name: str = None) -> Embeddings:
+    """config.EMBEDDING_CACHE_PATH가 설정되어 있으면 캐시 래퍼 적용"""
+    if not config.EMBEDDING_CACHE_PATH:
+        return embeddings
+
+    return CachedEmbeddings(
+        embeddings,
+        model_name=model_name or config.EMBEDDING_MODEL_NAME,
+        path=config.EMBEDDING_CACHE_PATH
+    )
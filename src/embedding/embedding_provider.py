@@ -0,0 +1,216 @@
+"""
+임베딩 제공자
+
+- openai: OpenAIEmbeddings (기존 동작, API 키 필요)
+- local: sentence-transformers 모델을 CPU에서 배치 인코딩
+  (multilingual-e5, bge-m3 등, backend="onnx"로 ONNX Runtime 사용 가능)
+
+DB 구축과 검색은 모두 create_embeddings()로 같은 설정의 모델을 만들고,
+사용한 모델은 embedding_signature()로 Chroma 컬렉션 메타데이터에 기록합니다.
+
+EMBEDDING_DIMENSIONS를 지정하면 앞쪽 차원만 남기고 L2 재정규화합니다
+(text-embedding-3처럼 Matryoshka 방식으로 학습된 모델용).
+"""
+
+import os
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.embedding.embedding_cache import with_embedding_cache
+
+
+# 질의/문서 앞에 붙여야 하는 지시어가 있는 모델 (e5 계열)
+_E5_PREFIXES = ("query: ", "passage: ")
+
+
+class LocalEmbeddings(Embeddings):
+    """sentence-transformers 로컬 임베딩 (정규화된 벡터 반환)"""
+
+    def __init__(self, model_name: str, batch_size: int = 32, backend: str = "torch", device: str = "cpu"):
+        """
+        Args:
+            model_name: Hugging Face 모델 이름 (예: intfloat/multilingual-e5-base, BAAI/bge-m3)
+            batch_size: 인코딩 배치 크기
+            backend: "torch" 또는 "onnx" (sentence-transformers backend 인자)
+            device: 실행 장치
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = SentenceTransformer(model_name, device=device, backend=backend)
+
+        if "e5" in model_name.lower():
+            self.query_prefix, self.document_prefix = _E5_PREFIXES
+        else:
+            self.query_prefix, self.document_prefix = "", ""
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return vectors.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode([self.document_prefix + text for text in texts])
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([self.query_prefix + text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """여러 질의를 한 번에 인코딩 (embed_query와 같은 질의 지시어 사용)"""
+        if len(texts) == 0:
+            return []
+        return self._encode([self.query_prefix + text for text in texts])
+
+
+class SymmetricEmbeddings(Embeddings):
+    """
+    질의와 문서를 같은 방식으로 임베딩하는 모델(OpenAI)에 배치 질의 임베딩 추가
+
+    embed_queries를 embed_documents 배치 요청 한 번으로 처리합니다.
+    질의 지시어가 있는 모델(LocalEmbeddings)에는 쓰지 않습니다.
+    """
+
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) == 0:
+            return []
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embeddings.aembed_query(text)
+
+
+def embed_queries(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+    """
+    여러 질의 임베딩 (embed_queries가 있으면 배치, 없으면 embed_query 반복)
+
+    embed_documents로 대신하지 않습니다 (e5 등은 질의/문서 지시어가 다름).
+    """
+    if hasattr(embeddings, 'embed_queries'):
+        return embeddings.embed_queries(list(texts))
+    return [embeddings.embed_query(text) for text in texts]
+
+
+def truncate_embeddings(vectors, dimensions: int) -> np.ndarray:
+    """앞쪽 dimensions개 차원만 남기고 L2 재정규화 (float32)"""
+    truncated = np.asarray(vectors, dtype=np.float32)[..., :dimensions]
+    norms = np.linalg.norm(truncated, axis=-1, keepdims=True)
+    return truncated / np.maximum(norms, 1e-12)
+
+
+class TruncatedEmbeddings(Embeddings):
+    """
+    Matryoshka 차원 축소 래퍼
+
+    캐시 래퍼 바깥에 두므로 디스크 캐시에는 전체 차원 벡터가 저장되고,
+    차원을 바꿔 다시 구축해도 API를 다시 호출하지 않습니다.
+    """
+
+    def __init__(self, embeddings: Embeddings, dimensions: int):
+        self.embeddings = embeddings
+        self.dimensions = dimensions
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) == 0:
+            return []
+        return truncate_embeddings(self.embeddings.embed_documents(texts), self.dimensions).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return truncate_embeddings(self.embeddings.embed_query(text), self.dimensions).tolist()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) == 0:
+            return []
+        return truncate_embeddings(embed_queries(self.embeddings, texts), self.dimensions).tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) == 0:
+            return []
+        return truncate_embeddings(await self.embeddings.aembed_documents(texts), self.dimensions).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return truncate_embeddings(await self.embeddings.aembed_query(text), self.dimensions).tolist()
+
+    def stats(self) -> dict:
+        """내부 캐시 통계 (캐시가 없으면 빈 dict)"""
+        return self.embeddings.stats() if hasattr(self.embeddings, 'stats') else {}
+
+
+def model_signature(config) -> str:
+    """전체 차원 임베딩 모델 식별자 (디스크 캐시 키)"""
+    if config.EMBEDDING_PROVIDER == "openai":
+        return config.EMBEDDING_MODEL_NAME
+    return f"{config.EMBEDDING_PROVIDER}:{config.EMBEDDING_MODEL_NAME}"
+
+
+def embedding_signature(config) -> str:
+    """사용 중인 임베딩 식별자 - 모델 + 축소 차원 (컬렉션/인덱스 메타데이터에 사용)"""
+    signature = model_signature(config)
+    if config.EMBEDDING_DIMENSIONS:
+        return f"{signature}@{config.EMBEDDING_DIMENSIONS}d"
+    return signature
+
+
+def create_embeddings(config) -> Embeddings:
+    """RAGConfig.EMBEDDING_PROVIDER에 맞는 임베딩 객체 생성 (디스크 캐시 적용)"""
+    provider = config.EMBEDDING_PROVIDER
+
+    if provider == "openai":
+        from langchain_openai.embeddings import OpenAIEmbeddings
+
+        os.environ["OPENAI_API_KEY"] = config.OPENAI_API_KEY
+        embeddings = SymmetricEmbeddings(OpenAIEmbeddings(model=config.EMBEDDING_MODEL_NAME))
+    elif provider == "local":
+        embeddings = LocalEmbeddings(
+            config.EMBEDDING_MODEL_NAME,
+            batch_size=config.LOCAL_EMBEDDING_BATCH_SIZE,
+            backend=config.LOCAL_EMBEDDING_BACKEND,
+        )
+    else:
+        raise ValueError(f"Unknown embedding provider: {provider}")
+
+    embeddings = with_embedding_cache(embeddings, config, model_name=model_signature(config))
+
+    if config.EMBEDDING_DIMENSIONS:
+        embeddings = TruncatedEmbeddings(embeddings, config.EMBEDDING_DIMENSIONS)
+    return embeddings
+
+
+def check_collection_embedding(collection_metadata, config):
+    """
+    컬렉션에 기록된 임베딩 모델과 현재 설정 비교
+
+    Returns:
+        기록된 모델 식별자 (기록이 없는 이전 DB면 None)
+
+    Raises:
+        ValueError: 기록된 모델과 현재 설정이 다를 때
+    """
+    recorded = (collection_metadata or {}).get("embedding_model")
+    expected = embedding_signature(config)
+
+    if recorded is not None and recorded != expected:
+        raise ValueError(
+            f"임베딩 모델 불일치: DB는 '{recorded}'로 구축되었지만 현재 설정은 '{expected}'입니다. "
+            f"EMBEDDING_PROVIDER/EMBEDDING_MODEL_NAME/EMBEDDING_DIMENSIONS를 맞추거나 DB를 다시 구축하세요."
+        )
+    return recorded
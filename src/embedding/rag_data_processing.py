@@ -1,11 +1,15 @@
 import pandas as pd
 from langchain_chroma import Chroma
-from langchain_openai.embeddings import OpenAIEmbeddings
-import os
 from tqdm import tqdm
 import time
+import os
 
 from src.utils.config import RAGConfig
+from src.embedding.embedding_provider import create_embeddings, embedding_signature, check_collection_embedding
+from src.retriever.bm25_index import BM25Index, corpus_fingerprint
+from src.retriever.tokenizer import get_tokenizer, tokenize_corpus
+from src.retriever.dense_index import ExactDenseIndex
+from src.retriever.snapshot import RetrieverSnapshot
 
 
 class DataValidator:
@@ -79,12 +83,8 @@ class ChromaDBBuilder:
         self._initialize_embeddings()
 
     def _initialize_embeddings(self):
-        """임베딩 모델 초기화"""
-        os.environ["OPENAI_API_KEY"] = self.config.OPENAI_API_KEY
-
-        self.embeddings = OpenAIEmbeddings(
-            model=self.config.EMBEDDING_MODEL_NAME
-        )
+        """임베딩 모델 초기화 (EMBEDDING_PROVIDER에 따라 OpenAI / 로컬)"""
+        self.embeddings = create_embeddings(self.config)
 
     def build_from_dataframe(self, df: pd.DataFrame):
         """DataFrame으로부터 벡터 DB 구축"""
@@ -121,13 +121,23 @@ class ChromaDBBuilder:
             raise ValueError("데이터 길이 불일치")
 
     def _create_vectorstore(self):
-        """빈 벡터스토어 생성"""
+        """빈 벡터스토어 생성 (사용한 임베딩 모델을 컬렉션 메타데이터에 기록)"""
         self.vectorstore = Chroma(
             embedding_function=self.embeddings,
             persist_directory=self.config.DB_DIRECTORY,
             collection_name=self.config.COLLECTION_NAME
         )
 
+        # 다른 모델로 만든 기존 컬렉션에 문서를 섞어 넣지 않도록 확인
+        collection = self.vectorstore._collection
+        recorded = check_collection_embedding(collection.metadata, self.config)
+
+        if recorded is None and collection.count() == 0:
+            collection.modify(metadata={
+                'embedding_provider': self.config.EMBEDDING_PROVIDER,
+                'embedding_model': embedding_signature(self.config),
+            })
+
     def _add_documents_in_batches(self, documents, ids, metadatas):
         """배치 처리로 문서 추가"""
         batch_size = self.config.BATCH_SIZE
@@ -142,7 +152,8 @@ class ChromaDBBuilder:
             batch_metas = metadatas[i:i + batch_size]
 
             self._add_batch_with_retry(batch_docs, batch_ids, batch_metas)
-            time.sleep(1)
+            if self.config.EMBEDDING_PROVIDER == "openai":
+                time.sleep(1)  # API 속도 제한 대응
 
     def _add_batch_with_retry(self, docs, ids, metas):
         """배치 추가 (실패 시 재시도)"""
@@ -187,6 +198,43 @@ class ChromaDBBuilder:
         return self.vectorstore.similarity_search_with_score(query, k=k)
 
 
+class BM25IndexBuilder:
+    """BM25 인덱스 구축 (ChromaDB와 같은 문서 순서로 저장)"""
+
+    def __init__(self, config: RAGConfig):
+        self.config = config
+        self.tokenizer = get_tokenizer(config)
+
+    def build_from_vectorstore(self, vectorstore) -> BM25Index:
+        """벡터스토어의 전체 문서로 BM25 인덱스 생성 및 저장"""
+        all_docs = vectorstore.get(include=['documents'])
+        return self.build_from_documents(all_docs['ids'], all_docs['documents'])
+
+    def build_from_documents(self, doc_ids, documents) -> BM25Index:
+        """Chroma get() 순서의 문서 목록으로 BM25 인덱스 생성 및 저장"""
+        tokenized_docs = tokenize_corpus(
+            self.tokenizer,
+            doc_ids,
+            documents,
+            cache_dir=self.config.TOKEN_CACHE_DIRECTORY
+        )
+
+        index = BM25Index.build(
+            tokenized_docs,
+            k1=self.config.BM25_K1,
+            b=self.config.BM25_B,
+            epsilon=self.config.BM25_EPSILON,
+            tokenizer=self.tokenizer.signature,
+            extra_meta={
+                'collection_name': self.config.COLLECTION_NAME,
+                'corpus_fingerprint': corpus_fingerprint(doc_ids),
+            }
+        )
+        index.save(self.config.BM25_INDEX_DIRECTORY)
+
+        return index
+
+
 class RAGVectorDBPipeline:
     """전체 RAG Vector DB 구축 파이프라인"""
 
@@ -194,6 +242,7 @@ class RAGVectorDBPipeline:
         self.config = config or RAGConfig()
         self.validator = DataValidator(self.config)
         self.builder = ChromaDBBuilder(self.config)
+        self.bm25_builder = BM25IndexBuilder(self.config)
 
     def build(self):
         """전체 파이프라인 실행"""
@@ -210,11 +259,72 @@ class RAGVectorDBPipeline:
 
         # 결과 확인
         count = self.builder.get_collection_count()
-        print(f"✅ ChromaDB 저장 완료: {count}개 문서")
+        print(f"✅ ChromaDB 저장 완료: {count}개 문서 (임베딩: {embedding_signature(self.config)})")
         print(f"저장 위치: {self.config.DB_DIRECTORY}")
 
+        # BM25 / 임베딩 인덱스 구축
+        self.build_bm25_index()
+        self.build_dense_index()
+
         return vectorstore
 
+    def build_bm25_index(self):
+        """기존 벡터 DB로부터 BM25 인덱스와 검색기 스냅샷 (재)구축"""
+        if self.builder.vectorstore is None:
+            self.builder._create_vectorstore()
+
+        all_docs = self.builder.vectorstore.get()
+        index = self.bm25_builder.build_from_documents(all_docs['ids'], all_docs['documents'])
+
+        print(f"✅ BM25 인덱스 저장 완료: {index.meta['n_docs']}개 문서, "
+              f"{index.meta['n_terms']}개 어휘")
+        print(f"저장 위치: {self.config.BM25_INDEX_DIRECTORY}")
+
+        self.build_snapshot(all_docs, index)
+
+        return index
+
+    def build_snapshot(self, all_docs, bm25_index):
+        """Chroma 덤프와 같은 순서의 BM25 인덱스로 검색기 스냅샷 저장"""
+        snapshot = RetrieverSnapshot.build(
+            all_docs['ids'],
+            all_docs['documents'],
+            all_docs['metadatas'],
+            bm25_index,
+            extra_meta={
+                'collection_name': self.config.COLLECTION_NAME,
+                'embedding_model': embedding_signature(self.config),
+            }
+        )
+        snapshot.save(self.config.RETRIEVER_SNAPSHOT_PATH)
+
+        size_mb = os.path.getsize(self.config.RETRIEVER_SNAPSHOT_PATH) / 2**20
+        print(f"✅ 검색기 스냅샷 저장 완료: {len(snapshot)}개 문서, {size_mb:.1f}MB")
+        print(f"저장 위치: {self.config.RETRIEVER_SNAPSHOT_PATH}")
+
+        return snapshot
+
+    def build_dense_index(self):
+        """기존 벡터 DB의 벡터를 메모리 매핑 임베딩 인덱스로 내보내기 (재임베딩 없음)"""
+        if self.builder.vectorstore is None:
+            self.builder._create_vectorstore()
+
+        index = ExactDenseIndex.from_collection(
+            self.builder.vectorstore._collection,
+            dtype=self.config.DENSE_INDEX_DTYPE,
+            extra_meta={
+                'collection_name': self.config.COLLECTION_NAME,
+                'embedding_model': embedding_signature(self.config),
+            }
+        )
+        index.save(self.config.DENSE_INDEX_DIRECTORY)
+
+        print(f"✅ 임베딩 인덱스 저장 완료: {index.meta['n_docs']}개 문서, "
+              f"{index.meta['dim']}차원 ({index.meta['dtype']})")
+        print(f"저장 위치: {self.config.DENSE_INDEX_DIRECTORY}")
+
+        return index
+
     def test_search(self, query: str = "학사 정보 시스템", k: int = 3):
         """검색 테스트"""
         results = self.builder.search(query, k=k)
@@ -0,0 +1,1239 @@
+"""
+RAG 검색 단계별 마이크로 벤치마크
+
+- 합성 데이터로 검색 내부 단계의 지연 시간 측정
+- 기존 구현과 새 구현의 결과 일치 여부 확인
+
+사용법:
+    python src/evaluation/benchmark_retrieval.py fusion
+    python src/evaluation/benchmark_retrieval.py fusion --sizes 10000 100000 1000000
+    python src/evaluation/benchmark_retrieval.py bm25 --sizes 1000 10000 100000
+    python src/evaluation/benchmark_retrieval.py bm25-topk --k 300
+    python src/evaluation/benchmark_retrieval.py reranker --queries questions.txt
+    python src/evaluation/benchmark_retrieval.py search-many --queries questions.txt --mode hybrid_rerank
+    python src/evaluation/benchmark_retrieval.py rrf --sizes 10000 100000
+    python src/evaluation/benchmark_retrieval.py mmr --queries questions.txt --top-k 5
+    python src/evaluation/benchmark_retrieval.py hybrid-parallel --queries questions.txt
+    python src/evaluation/benchmark_retrieval.py embedding --local-model intfloat/multilingual-e5-base
+    python src/evaluation/benchmark_retrieval.py dense --sizes 10000 100000 --dim 1536
+    python src/evaluation/benchmark_retrieval.py quantized --sizes 100000 --rescore-factors 1 4 10
+    python src/evaluation/benchmark_retrieval.py quantized --index ./chroma_db/dense_index
+    python src/evaluation/benchmark_retrieval.py matryoshka --dims 256 512 1024 1536 --queries questions.txt
+    python src/evaluation/benchmark_retrieval.py startup --warmup lazy --mode embedding
+    python src/evaluation/benchmark_retrieval.py startup --process --entries cli streamlit
+    python src/evaluation/benchmark_retrieval.py metadata --chunks ./data/rag_chunks_final.csv
+    python src/evaluation/benchmark_retrieval.py text-store --chunks ./data/rag_chunks_final.csv
+    python src/evaluation/benchmark_retrieval.py dense-join --queries questions.txt
+    python src/evaluation/benchmark_retrieval.py filter --queries questions.txt --overfetch 10
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+# 프로젝트 경로 추가
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.retriever.bm25_index import BM25Index
+from src.retriever.bm25_sparse import SparseBM25
+from src.retriever.bm25_maxscore import MaxScoreBM25
+from src.retriever.fusion import (
+    min_max_normalize,
+    scatter_dense_scores,
+    fuse_scores,
+    top_k_positions,
+    rrf_fuse,
+)
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_BM25_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_DENSE_SIZES = [10_000, 100_000]
+
+DEFAULT_QUERIES = [
+    "사업 예산은 얼마인가요?",
+    "입찰 참여 마감일이 언제인가요?",
+    "제안서 평가 기준을 알려주세요",
+    "시스템 구축 범위와 주요 기능 요구사항은?",
+    "하자보수 기간과 유지관리 조건은?",
+    "보안 요구사항에는 어떤 것이 있나요?",
+    "사업 수행 기간은 얼마나 되나요?",
+    "발주 기관의 담당 부서는 어디인가요?",
+]
+
+
+# ============================================================
+# 공통 유틸
+# ============================================================
+
+def measure(fn: Callable, repeat: int = 5) -> float:
+    """fn을 repeat번 실행한 중앙값 (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def print_header(title: str):
+    print("\n" + "=" * 80)
+    print(title)
+    print("=" * 80)
+
+
+def synthetic_corpus(n_docs: int, vocab_size: int = 50_000, doc_len: int = 150, seed: int = 42):
+    """Zipf 분포 토큰으로 구성된 합성 코퍼스"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(doc_len // 2, doc_len * 3 // 2, size=n_docs)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    tokens = np.minimum(rng.zipf(1.2, size=offsets[-1]), vocab_size) - 1
+    return [[f"t{t}" for t in tokens[offsets[i]:offsets[i + 1]]] for i in range(n_docs)]
+
+
+def load_queries(path: str = None) -> List[str]:
+    """질의 파일 (한 줄에 하나) 로드, 없으면 기본 질의"""
+    if not path:
+        return DEFAULT_QUERIES
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def synthetic_queries(n_queries: int = 20, seed: int = 7):
+    """흔한 어휘와 드문 어휘가 섞인 질의"""
+    rng = np.random.default_rng(seed)
+    return [[f"t{t}" for t in rng.integers(0, 2_000, size=rng.integers(2, 6))]
+            for _ in range(n_queries)]
+
+
+# ============================================================
+# 1. Score Fusion
+# ============================================================
+
+def legacy_fusion(doc_ids, bm25_scores, dense_hits, alpha, top_k):
+    """기존 dict 기반 결합 (비교용, tests/test_fusion.py의 기준 구현) → [(문서 위치, hybrid 점수)]"""
+    bm25_normalized = min_max_normalize(bm25_scores)
+
+    embedding_scores_raw = {}
+    for doc_id, distance in dense_hits:
+        embedding_scores_raw[doc_id] = 1 / (1 + distance)
+
+    embed_values = np.array(list(embedding_scores_raw.values()))
+    embed_normalized = min_max_normalize(embed_values)
+    embedding_scores = dict(zip(embedding_scores_raw.keys(), embed_normalized))
+
+    hybrid_scores = {}
+    for i, doc_id in enumerate(doc_ids):
+        embed_score = embedding_scores.get(doc_id, 0)
+        hybrid_scores[doc_id] = (1 - alpha) * bm25_normalized[i] + alpha * embed_score
+
+    sorted_ids = sorted(hybrid_scores.keys(),
+                        key=lambda x: hybrid_scores[x],
+                        reverse=True)
+
+    return [(doc_ids.index(doc_id), hybrid_scores[doc_id]) for doc_id in sorted_ids[:top_k]]
+
+
+def vectorized_fusion(n_docs, bm25_scores, positions, distances, alpha, top_k):
+    """위치 배열 기반 결합 (RAGRetriever.hybrid_search와 동일) → [(문서 위치, hybrid 점수)]"""
+    bm25_normalized = min_max_normalize(bm25_scores)
+    embed_scores = scatter_dense_scores(n_docs, positions, 1 / (1 + np.asarray(distances, dtype=float)))
+    hybrid_scores = fuse_scores(bm25_normalized, embed_scores, alpha)
+    return [(int(i), hybrid_scores[i]) for i in top_k_positions(hybrid_scores, top_k)]
+
+
+def bench_fusion(sizes: List[int], top_k: int = 10, alpha: float = 0.5, repeat: int = 5):
+    """문서 수별 결합 단계 지연 시간 비교"""
+    print_header(f"📊 Score Fusion (top_k={top_k}, 임베딩 후보={top_k * 3})")
+    print(f"{'문서 수':>10} | {'기존 (ms)':>12} | {'벡터화 (ms)':>12} | {'속도 향상':>8} | 결과 일치")
+    print("-" * 80)
+
+    rng = np.random.default_rng(42)
+
+    for n_docs in sizes:
+        doc_ids = [f"chunk_{i}" for i in range(n_docs)]
+
+        # BM25 점수는 대부분 0 (질의어가 없는 문서)
+        bm25_scores = np.zeros(n_docs)
+        matched = rng.choice(n_docs, size=max(1, n_docs // 20), replace=False)
+        bm25_scores[matched] = rng.gamma(2.0, 2.0, size=matched.size)
+
+        positions = rng.choice(n_docs, size=top_k * 3, replace=False)
+        distances = rng.uniform(0.6, 1.4, size=positions.size)
+        dense_hits = [(doc_ids[p], d) for p, d in zip(positions, distances)]
+
+        legacy = legacy_fusion(doc_ids, bm25_scores, dense_hits, alpha, top_k)
+        vectorized = vectorized_fusion(n_docs, bm25_scores, positions, distances, alpha, top_k)
+
+        legacy_ms = measure(
+            lambda: legacy_fusion(doc_ids, bm25_scores, dense_hits, alpha, top_k),
+            repeat=repeat
+        )
+        vectorized_ms = measure(
+            lambda: vectorized_fusion(n_docs, bm25_scores, positions, distances, alpha, top_k),
+            repeat=repeat
+        )
+
+        print(f"{n_docs:>10,} | {legacy_ms:>12.2f} | {vectorized_ms:>12.2f} | "
+              f"{legacy_ms / vectorized_ms:>7.1f}x | {'✅' if legacy == vectorized else '❌'}")
+
+
+# ============================================================
+# 2. BM25 Scoring
+# ============================================================
+
+def bench_bm25(sizes: List[int], repeat: int = 3):
+    """rank_bm25 / 포스팅 루프 / CSR 희소 행렬 점수 계산 비교 및 결과 일치 확인"""
+    from rank_bm25 import BM25Okapi
+
+    print_header("📊 BM25 get_scores (질의 20개 평균)")
+    print(f"{'문서 수':>10} | {'rank_bm25 (ms)':>14} | {'포스팅 (ms)':>12} | {'CSR (ms)':>10} | 최대 오차")
+    print("-" * 80)
+
+    queries = synthetic_queries()
+
+    for n_docs in sizes:
+        corpus = synthetic_corpus(n_docs)
+        reference = BM25Okapi(corpus)
+        index = BM25Index.build(corpus)
+        sparse = SparseBM25(index)
+
+        # 결과 일치 확인 (BM25Okapi 기준, 모든 질의 / 질의 묶음 행렬 곱 포함)
+        expected = [reference.get_scores(q) for q in queries]
+        score_matrix = sparse.get_scores_many(queries)
+        max_error = 0.0
+        for q, reference_scores, batch_scores in zip(queries, expected, score_matrix):
+            scores = sparse.get_scores(q)
+            assert np.allclose(reference_scores, scores, rtol=1e-9, atol=1e-9), \
+                f"CSR BM25 점수가 BM25Okapi와 다릅니다: {q}"
+            assert np.allclose(reference_scores, batch_scores, rtol=1e-9, atol=1e-9), \
+                f"get_scores_many 점수가 BM25Okapi와 다릅니다: {q}"
+            max_error = max(max_error, float(np.abs(reference_scores - scores).max()))
+
+        def run(scorer):
+            return lambda: [scorer.get_scores(q) for q in queries]
+
+        reference_ms = measure(run(reference), repeat=repeat) / len(queries)
+        postings_ms = measure(run(index), repeat=repeat) / len(queries)
+        sparse_ms = measure(run(sparse), repeat=repeat) / len(queries)
+
+        print(f"{n_docs:>10,} | {reference_ms:>14.2f} | {postings_ms:>12.2f} | "
+              f"{sparse_ms:>10.2f} | {max_error:.1e}")
+
+
+def bench_bm25_topk(sizes: List[int], k: int = 300, repeat: int = 3):
+    """전체 채점 + argpartition vs MaxScore top-k (질의 포스팅 길이별)"""
+    print_header(f"📊 BM25 top-{k}: 전체 채점(CSR) vs MaxScore")
+    print(f"{'문서 수':>10} | {'질의 유형':>8} | {'포스팅 수':>10} | {'CSR+top-k (ms)':>14} | "
+          f"{'MaxScore (ms)':>13} | 일치")
+    print("-" * 80)
+
+    rng = np.random.default_rng(3)
+    # 흔한 어휘(긴 포스팅) / 드문 어휘(짧은 포스팅) 질의
+    query_groups = {
+        '흔함': [[f"t{t}" for t in rng.integers(0, 50, size=3)] for _ in range(10)],
+        '드묾': [[f"t{t}" for t in rng.integers(500, 5_000, size=3)] for _ in range(10)],
+    }
+
+    for n_docs in sizes:
+        index = BM25Index.build(synthetic_corpus(n_docs))
+        sparse = SparseBM25(index)
+        maxscore = MaxScoreBM25(index)
+
+        for group, queries in query_groups.items():
+            postings = np.mean([
+                sum(int(index.doc_freqs[t]) for t in sparse.query_term_counts(q)[0])
+                for q in queries
+            ])
+
+            matched = True
+            for q in queries:
+                scores = sparse.get_scores(q)
+                expected = top_k_positions(scores, k)
+                expected = expected[scores[expected] > 0]
+                _, topk_scores = maxscore.top_k(q, k)
+                matched &= np.allclose(scores[expected], topk_scores)
+
+            full_ms = measure(
+                lambda: [top_k_positions(sparse.get_scores(q), k) for q in queries], repeat=repeat
+            ) / len(queries)
+            topk_ms = measure(
+                lambda: [maxscore.top_k(q, k) for q in queries], repeat=repeat
+            ) / len(queries)
+
+            print(f"{n_docs:>10,} | {group:>8} | {postings:>10,.0f} | {full_ms:>14.2f} | "
+                  f"{topk_ms:>13.2f} | {'✅' if matched else '❌'}")
+
+
+# ============================================================
+# 3. Re-ranker 백엔드
+# ============================================================
+
+def bench_reranker(chunks_path: str, queries: List[str], model_name: str, onnx_dir: str,
+                   n_candidates: int = 30, top_k: int = 10, repeat: int = 3):
+    """
+    torch(fp32) vs onnx_int8 Re-ranker 지연 시간과 순위 일치도
+
+    실제 청크에서 질의별 BM25 상위 n_candidates개를 후보로 사용합니다
+    (hybrid_search_with_rerank와 같은 후보 수). 검색 품질(Precision/Recall)은
+    run_experiment.py에서 reranker_backend만 바꿔 두 실험을 비교합니다.
+    """
+    import pandas as pd
+    from scipy.stats import spearmanr
+    from sentence_transformers import CrossEncoder
+    from src.retriever.reranker import OnnxCrossEncoder
+
+    texts = pd.read_csv(chunks_path)['chunk_content'].dropna().astype(str).tolist()
+    sparse = SparseBM25(BM25Index.build([text.split() for text in texts]))
+    candidate_pairs = [
+        [[query, texts[i]] for i in top_k_positions(sparse.get_scores(query.split()), n_candidates)]
+        for query in queries
+    ]
+
+    torch_model = CrossEncoder(model_name)
+    onnx_model = OnnxCrossEncoder(model_name, export_dir=onnx_dir)
+
+    print_header(f"📊 Re-ranker: torch(fp32) vs onnx_int8 ({len(queries)}개 질의 × {n_candidates}쌍)")
+    print(f"{'백엔드':>10} | {'질의당 (ms)':>12} | {'속도 향상':>8}")
+    print("-" * 80)
+
+    torch_ms = measure(lambda: [torch_model.predict(p) for p in candidate_pairs], repeat=repeat) / len(queries)
+    onnx_ms = measure(lambda: [onnx_model.predict(p) for p in candidate_pairs], repeat=repeat) / len(queries)
+    print(f"{'torch':>10} | {torch_ms:>12.1f} | {1.0:>7.1f}x")
+    print(f"{'onnx_int8':>10} | {onnx_ms:>12.1f} | {torch_ms / onnx_ms:>7.1f}x")
+
+    correlations, overlaps, max_errors = [], [], []
+    for pairs in candidate_pairs:
+        torch_scores = np.asarray(torch_model.predict(pairs), dtype=float)
+        onnx_scores = np.asarray(onnx_model.predict(pairs), dtype=float)
+        correlations.append(spearmanr(torch_scores, onnx_scores).correlation)
+        overlaps.append(len(
+            set(top_k_positions(torch_scores, top_k)) & set(top_k_positions(onnx_scores, top_k))
+        ) / min(top_k, len(pairs)))
+        max_errors.append(np.abs(torch_scores - onnx_scores).max())
+
+    print("-" * 80)
+    print(f"순위 상관 (Spearman 평균): {np.nanmean(correlations):.4f}")
+    print(f"상위 {top_k}개 일치율 평균: {np.mean(overlaps):.1%}")
+    print(f"점수 최대 오차: {np.max(max_errors):.4f}")
+
+
+# ============================================================
+# 4. 일괄 검색 (search_many)
+# ============================================================
+
+def bench_search_many(queries: List[str], mode: str = "hybrid_rerank", top_k: int = 10):
+    """
+    search_with_mode 반복 호출 vs search_many 처리량과 결과 일치 확인
+
+    실제 ChromaDB와 OpenAI API를 사용합니다. 두 방식이 같은 조건에서 비교되도록
+    임베딩 디스크 캐시는 끄고, 실행 사이에 결과/Re-rank 캐시를 비웁니다.
+    """
+    from src.utils.config import RAGConfig
+    from src.retriever.retriever import RAGRetriever
+
+    config = RAGConfig()
+    config.EMBEDDING_CACHE_PATH = ""
+    retriever = RAGRetriever(config=config)
+
+    def clear_caches():
+        retriever.query_cache.clear()
+        retriever.rerank_cache.clear()
+
+    clear_caches()
+    start = time.perf_counter()
+    loop_results = [retriever.search_with_mode(q, top_k=top_k, mode=mode) for q in queries]
+    loop_s = time.perf_counter() - start
+
+    clear_caches()
+    start = time.perf_counter()
+    batch_results = retriever.search_many(queries, top_k=top_k, mode=mode)
+    batch_s = time.perf_counter() - start
+
+    same_ids = all(
+        [doc['content'] for doc in a] == [doc['content'] for doc in b]
+        for a, b in zip(loop_results, batch_results)
+    )
+    score_key = 'rerank_score' if mode.endswith('_rerank') else (
+        'distance' if mode == 'embedding' else 'hybrid_score')
+    max_error = max(
+        (abs(x[score_key] - y[score_key]) for a, b in zip(loop_results, batch_results) for x, y in zip(a, b)),
+        default=0.0
+    )
+
+    print_header(f"📊 일괄 검색: {len(queries)}개 질의 (mode={mode}, top_k={top_k})")
+    print(f"{'방식':>14} | {'전체 (초)':>10} | {'질의/초':>8}")
+    print("-" * 80)
+    print(f"{'질의별 반복':>14} | {loop_s:>10.2f} | {len(queries) / loop_s:>8.1f}")
+    print(f"{'search_many':>14} | {batch_s:>10.2f} | {len(queries) / batch_s:>8.1f}")
+    print("-" * 80)
+    print(f"결과 순서 일치: {'✅' if same_ids else '❌'} (점수 최대 오차 {max_error:.1e})")
+
+
+# ============================================================
+# 5. Hybrid 단계 병렬 실행
+# ============================================================
+
+def bench_hybrid_parallel(queries: List[str], top_k: int = 30):
+    """
+    hybrid_search의 BM25/임베딩 단계 순차 vs 병렬 실행 (실제 DB/API 사용)
+
+    결과에 기록된 단계별 시간(timings)의 중앙값을 비교합니다.
+    질의 임베딩은 디스크 캐시를 끄고 매번 API를 호출합니다.
+    """
+    from src.utils.config import RAGConfig
+    from src.retriever.retriever import RAGRetriever
+
+    config = RAGConfig()
+    config.EMBEDDING_CACHE_PATH = ""
+    retriever = RAGRetriever(config=config)
+
+    print_header(f"📊 Hybrid 검색 단계 실행 방식 ({len(queries)}개 질의, top_k={top_k})")
+    print(f"{'방식':>6} | {'BM25 (ms)':>10} | {'임베딩 (ms)':>11} | {'결합 (ms)':>10} | {'전체 (ms)':>10}")
+    print("-" * 80)
+
+    for parallel in (False, True):
+        retriever.config.HYBRID_PARALLEL = parallel
+        timings = [retriever.hybrid_search(q, top_k=top_k)[0]['timings'] for q in queries]
+        median = {stage: np.median([t[stage] for t in timings]) * 1000
+                  for stage in ('bm25', 'dense', 'fusion', 'total')}
+        print(f"{'병렬' if parallel else '순차':>6} | {median['bm25']:>10.1f} | {median['dense']:>11.1f} | "
+              f"{median['fusion']:>10.1f} | {median['total']:>10.1f}")
+
+
+# ============================================================
+# 6. 임베딩 제공자
+# ============================================================
+
+def bench_embedding(queries: List[str], chunks_path: str, local_model: str,
+                    n_docs: int = 200, repeat: int = 3):
+    """
+    OpenAI vs 로컬 임베딩 지연 시간 (질의 1개 / 문서 배치)
+
+    디스크 캐시 없이 측정합니다. 검색 품질(Recall)은 로컬 모델로 별도 컬렉션을 만든 뒤
+    run_experiment.py에서 embedding_provider/collection_name만 바꿔 비교합니다:
+        EMBEDDING_PROVIDER=local COLLECTION_NAME=rag_documents_e5 python main.py --step embed
+    """
+    import pandas as pd
+    from src.utils.config import RAGConfig
+    from src.embedding.embedding_provider import create_embeddings
+
+    texts = pd.read_csv(chunks_path)['chunk_content'].dropna().astype(str).tolist()[:n_docs]
+
+    print_header(f"📊 임베딩 제공자 ({len(queries)}개 질의, 문서 {len(texts)}개 배치)")
+    print(f"{'제공자':>8} | {'모델':>32} | {'질의당 (ms)':>11} | {'문서 배치 (초)':>13}")
+    print("-" * 80)
+
+    for provider, model in (("openai", None), ("local", local_model)):
+        config = RAGConfig()
+        config.EMBEDDING_PROVIDER = provider
+        config.EMBEDDING_CACHE_PATH = ""
+        if model:
+            config.EMBEDDING_MODEL_NAME = model
+
+        embeddings = create_embeddings(config)
+        embeddings.embed_query(queries[0])  # 모델 로드/연결 워밍업
+
+        query_ms = np.median([measure(lambda: embeddings.embed_query(q), repeat=1) for q in queries])
+        docs_s = measure(lambda: embeddings.embed_documents(texts), repeat=repeat) / 1000
+
+        print(f"{provider:>8} | {config.EMBEDDING_MODEL_NAME:>32} | {query_ms:>11.1f} | {docs_s:>13.2f}")
+
+
+# ============================================================
+# 7. 임베딩 인덱스 (정확 검색 vs HNSW)
+# ============================================================
+
+def synthetic_embeddings(n_docs: int, dim: int, seed: int = 42, cluster_size: int = None):
+    """
+    정규화된 합성 임베딩 (OpenAI 임베딩처럼 단위 벡터)
+
+    cluster_size를 주면 평균 cluster_size개씩 같은 중심 주변에 모인 벡터를 만듭니다
+    (같은 RFP의 청크처럼 가까운 이웃이 있는 분포).
+    """
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n_docs, dim)).astype(np.float32)
+    if cluster_size:
+        centers = rng.standard_normal((max(n_docs // cluster_size, 1), dim)).astype(np.float32)
+        vectors += centers[rng.integers(0, len(centers), n_docs)]
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(found, truth) -> float:
+    """질의별 정답 상위 k개 중 찾은 비율의 평균"""
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)]))
+
+
+def bench_dense(sizes: List[int], dim: int = 1536, k: int = 30, n_queries: int = 20, repeat: int = 3):
+    """
+    ExactDenseIndex(float32/float16, mmap) vs Chroma HNSW 지연 시간과 Recall@k
+
+    정답은 float64 전수 검색 결과입니다. chromadb가 설치되어 있으면 같은 벡터로
+    임시 컬렉션을 만들어 HNSW도 함께 측정합니다.
+    """
+    import tempfile
+    from src.retriever.dense_index import ExactDenseIndex
+
+    try:
+        import chromadb
+    except ImportError:
+        chromadb = None
+
+    print_header(f"📊 임베딩 인덱스 ({dim}차원, top-{k}, {n_queries}개 질의)")
+    print(f"{'문서 수':>10} | {'방식':>14} | {'질의당 (ms)':>11} | {f'Recall@{k}':>10}")
+    print("-" * 56)
+
+    for n_docs in sizes:
+        vectors = synthetic_embeddings(n_docs, dim)
+        queries = synthetic_embeddings(n_queries, dim, seed=7)
+        ids = [f"doc_{i}" for i in range(n_docs)]
+
+        exact = (vectors.astype(np.float64) @ queries.astype(np.float64).T).T
+        truth = [np.argsort(-row, kind="stable")[:k] for row in exact]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for dtype in ("float32", "float16"):
+                directory = f"{tmp}/{dtype}"
+                ExactDenseIndex.build(ids, vectors, dtype=dtype).save(directory)
+                index = ExactDenseIndex.load(directory, mmap=True)
+
+                found = [index.search(q, k)[0] for q in queries]
+                elapsed = measure(lambda: [index.search(q, k) for q in queries], repeat=repeat) / n_queries
+                print(f"{n_docs:>10,} | {'exact ' + dtype:>14} | {elapsed:>11.2f} | {recall_at_k(found, truth):>10.3f}")
+
+            if chromadb is not None:
+                client = chromadb.PersistentClient(path=f"{tmp}/chroma")
+                collection = client.create_collection("bench")
+                for start in range(0, n_docs, 5000):
+                    collection.add(ids=ids[start:start + 5000], embeddings=vectors[start:start + 5000])
+
+                def hnsw_search():
+                    return collection.query(query_embeddings=queries, n_results=k, include=[])
+
+                found = [[int(i.split("_")[1]) for i in row] for row in hnsw_search()['ids']]
+                elapsed = measure(hnsw_search, repeat=repeat) / n_queries
+                print(f"{n_docs:>10,} | {'chroma hnsw':>14} | {elapsed:>11.2f} | {recall_at_k(found, truth):>10.3f}")
+
+        print("-" * 56)
+
+
+# ============================================================
+# 8. 양자화 임베딩 인덱스 (int8 / binary + float 재채점)
+# ============================================================
+
+def noisy_queries(vectors, n_queries: int, noise: float = 0.5, seed: int = 7):
+    """문서 벡터에 (노름 대비 noise 비율의) 잡음을 더한 정규화 질의"""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    queries = np.asarray(vectors[rows], dtype=np.float32)
+    jitter = rng.standard_normal(queries.shape).astype(np.float32)
+    jitter *= noise * np.linalg.norm(queries, axis=1, keepdims=True) / np.linalg.norm(jitter, axis=1, keepdims=True)
+    queries += jitter
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def bench_quantized(sizes: List[int], dim: int = 1536, k: int = 30, n_queries: int = 20,
+                    rescore_factors: List[int] = (1, 4, 10), index_dir: str = None, repeat: int = 3):
+    """
+    양자화 인덱스의 메모리 / 질의당 지연 시간 / Recall@k (정답: float32 전수 검색)
+
+    --index를 주면 저장된 실제 임베딩 인덱스를, 없으면 군집 합성 임베딩을 사용합니다.
+    질의는 문서 벡터에 잡음을 더해 만들어 가까운 이웃이 있는 분포로 측정합니다
+    (완전 무작위 벡터는 모든 문서와의 유사도가 비슷해 binary recall이 실제보다 크게 낮게 나옴).
+    재채점 배수 1은 1차 검색 상위 k개를 그대로 쓰는 것과 같습니다.
+    """
+    import tempfile
+    from src.retriever.dense_index import ExactDenseIndex, QuantizedDenseIndex, QUANTIZATION_METHODS
+
+    def run(exact, queries):
+        truth = [exact.search(q, k)[0] for q in queries]
+        elapsed = measure(lambda: [exact.search(q, k) for q in queries], repeat=repeat) / len(queries)
+        print(f"{len(exact):>10,} | {'float32 exact':>16} | {exact.nbytes / 2**20:>10.1f} | "
+              f"{elapsed:>11.2f} | {1.0:>10.3f}")
+
+        for method in QUANTIZATION_METHODS:
+            quantized = QuantizedDenseIndex.build(exact, method)
+            for factor in rescore_factors:
+                quantized.rescore_factor = factor
+                found = [quantized.search(q, k)[0] for q in queries]
+                elapsed = measure(lambda: [quantized.search(q, k) for q in queries], repeat=repeat) / len(queries)
+                print(f"{len(exact):>10,} | {f'{method} x{factor}':>16} | {quantized.nbytes / 2**20:>10.1f} | "
+                      f"{elapsed:>11.2f} | {recall_at_k(found, truth):>10.3f}")
+        print("-" * 72)
+
+    print_header(f"📊 양자화 임베딩 인덱스 (top-{k}, {n_queries}개 질의, 메모리 = 상주 크기)")
+    print(f"{'문서 수':>10} | {'방식 (재채점)':>16} | {'메모리 (MB)':>10} | {'질의당 (ms)':>11} | {f'Recall@{k}':>10}")
+    print("-" * 72)
+
+    if index_dir:
+        exact = ExactDenseIndex.load(index_dir, mmap=True)
+        run(exact, noisy_queries(exact.vectors, n_queries))
+        return
+
+    for n_docs in sizes:
+        vectors = synthetic_embeddings(n_docs, dim, cluster_size=50)
+        ids = [f"doc_{i}" for i in range(n_docs)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            ExactDenseIndex.build(ids, vectors).save(tmp)
+            exact = ExactDenseIndex.load(tmp, mmap=True)
+            run(exact, noisy_queries(exact.vectors, n_queries))
+
+
+# ============================================================
+# 9. Matryoshka 차원 축소 스윕
+# ============================================================
+
+def bench_matryoshka(dims: List[int], queries: List[str], chunks_path: str, n_docs: int = 5000,
+                     k: int = 10, index_dir: str = None, repeat: int = 3):
+    """
+    임베딩 차원별 Recall@k (정답: 전체 차원 검색) / 질의당 지연 시간 / 인덱스 크기
+
+    청크 CSV의 앞쪽 n_docs개와 질의를 전체 차원으로 한 번 임베딩하고 (디스크 캐시 사용),
+    차원마다 잘라 재정규화한 뒤 ExactDenseIndex로 검색합니다.
+    --index를 주면 저장된 전체 차원 임베딩 인덱스와 잡음 질의를 사용합니다 (API 호출 없음).
+
+    고른 차원의 실제 검색 품질은 EMBEDDING_DIMENSIONS와 COLLECTION_NAME을 지정해 DB를 구축한 뒤
+    run_experiment.py의 embedding_dimensions/collection_name 설정으로 평가 세트에서 비교합니다.
+    """
+    from src.embedding.embedding_provider import truncate_embeddings
+    from src.retriever.dense_index import ExactDenseIndex
+
+    if index_dir:
+        full_index = ExactDenseIndex.load(index_dir, mmap=True)
+        doc_vectors = np.asarray(full_index.vectors, dtype=np.float32)
+        query_vectors = noisy_queries(doc_vectors, len(queries) if queries else 20)
+    else:
+        import pandas as pd
+        from src.utils.config import RAGConfig
+        from src.embedding.embedding_provider import create_embeddings
+
+        config = RAGConfig()
+        config.EMBEDDING_DIMENSIONS = None
+        embeddings = create_embeddings(config)
+        texts = pd.read_csv(chunks_path)['chunk_content'].dropna().astype(str).tolist()[:n_docs]
+        doc_vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+        query_vectors = np.asarray([embeddings.embed_query(q) for q in queries], dtype=np.float32)
+
+    full_dim = doc_vectors.shape[1]
+    ids = [str(i) for i in range(len(doc_vectors))]
+    full = ExactDenseIndex.build(ids, truncate_embeddings(doc_vectors, full_dim))
+    truth = [full.search(q, k)[0] for q in truncate_embeddings(query_vectors, full_dim)]
+
+    print_header(f"📊 Matryoshka 차원 스윕 (문서 {len(ids):,}개, {len(query_vectors)}개 질의, 전체 {full_dim}차원)")
+    print(f"{'차원':>6} | {'인덱스 (MB)':>11} | {'질의당 (ms)':>11} | {f'Recall@{k}':>10}")
+    print("-" * 50)
+
+    for dim in sorted(d for d in dims if d <= full_dim):
+        index = ExactDenseIndex.build(ids, truncate_embeddings(doc_vectors, dim))
+        truncated_queries = truncate_embeddings(query_vectors, dim)
+
+        found = [index.search(q, k)[0] for q in truncated_queries]
+        elapsed = measure(lambda: [index.search(q, k) for q in truncated_queries], repeat=repeat) / len(truncated_queries)
+        print(f"{dim:>6} | {index.nbytes / 2**20:>11.1f} | {elapsed:>11.2f} | {recall_at_k(found, truth):>10.3f}")
+
+
+# ============================================================
+# 10. RRF vs alpha 결합
+# ============================================================
+
+def bench_rrf(sizes: List[int], top_k: int = 10, alpha: float = 0.5, rrf_k: int = 60, repeat: int = 3):
+    """
+    BM25 단계 + 결합 단계 지연 시간: alpha(전체 채점 + 정규화) vs RRF(상위 후보 순위만)
+
+    겹침은 두 방식 상위 top_k의 공통 비율입니다 (품질 비교가 아닌 차이 정도).
+    검색 품질은 run_experiment.py의 search_mode를 hybrid_rerank / hybrid_rrf_rerank로
+    바꿔 평가 세트에서 비교합니다.
+    """
+    n_candidates = top_k * 3
+
+    print_header(f"📊 RRF vs alpha 결합 (top_k={top_k}, 후보={n_candidates}, 질의 20개 평균)")
+    print(f"{'문서 수':>10} | {'alpha (ms)':>10} | {'RRF+CSR (ms)':>12} | {'RRF+MaxScore (ms)':>17} | {'겹침':>6}")
+    print("-" * 72)
+
+    rng = np.random.default_rng(11)
+    queries = synthetic_queries()
+
+    for n_docs in sizes:
+        index = BM25Index.build(synthetic_corpus(n_docs))
+        sparse = SparseBM25(index)
+        maxscore = MaxScoreBM25(index)
+
+        # 임베딩 검색 결과 (거리 오름차순 후보)
+        dense_hits = []
+        for _ in queries:
+            positions = rng.choice(n_docs, size=n_candidates, replace=False)
+            distances = np.sort(rng.uniform(0.6, 1.4, size=n_candidates))
+            dense_hits.append((positions, distances))
+
+        def alpha_fusion(q, hits):
+            bm25_normalized = min_max_normalize(sparse.get_scores(q))
+            embed_scores = scatter_dense_scores(n_docs, hits[0], 1 / (1 + hits[1]))
+            return top_k_positions(fuse_scores(bm25_normalized, embed_scores, alpha), top_k)
+
+        def rrf(bm25_positions, hits):
+            positions, scores = rrf_fuse([bm25_positions, hits[0]], weights=[1 - alpha, alpha], k=rrf_k)
+            return positions[top_k_positions(scores, top_k)]
+
+        def rrf_sparse(q, hits):
+            scores = sparse.get_scores(q)
+            top = top_k_positions(scores, n_candidates)
+            return rrf(top[scores[top] > 0], hits)
+
+        def rrf_maxscore(q, hits):
+            return rrf(maxscore.top_k(q, n_candidates)[0], hits)
+
+        def run(fusion):
+            return lambda: [fusion(q, hits) for q, hits in zip(queries, dense_hits)]
+
+        overlap = np.mean([
+            len(set(alpha_fusion(q, hits)) & set(rrf_maxscore(q, hits))) / top_k
+            for q, hits in zip(queries, dense_hits)
+        ])
+        alpha_ms = measure(run(alpha_fusion), repeat=repeat) / len(queries)
+        sparse_ms = measure(run(rrf_sparse), repeat=repeat) / len(queries)
+        maxscore_ms = measure(run(rrf_maxscore), repeat=repeat) / len(queries)
+
+        print(f"{n_docs:>10,} | {alpha_ms:>10.2f} | {sparse_ms:>12.2f} | {maxscore_ms:>17.2f} | {overlap:>6.2f}")
+
+
+# ============================================================
+# 11. MMR 다양성 선택
+# ============================================================
+
+def bench_mmr(queries: List[str], top_k: int = 5, lambdas: List[float] = (0.5, 0.7, 0.9)):
+    """
+    hybrid_rerank에서 MMR 사용 여부별 Re-rank 쌍 수 / 지연 시간 / 결과 다양성 (실제 DB 사용)
+
+    다양성은 top_k 결과 중 서로 다른 파일 수의 평균입니다.
+    """
+    from src.utils.config import RAGConfig
+    from src.retriever.retriever import RAGRetriever
+
+    config = RAGConfig()
+    config.QUERY_CACHE_SIZE = 0
+    config.RERANK_CACHE_SIZE = 0
+    retriever = RAGRetriever(config=config)
+
+    print_header(f"📊 MMR 다양성 선택 ({len(queries)}개 질의, top_k={top_k})")
+    print(f"{'설정':>12} | {'Re-rank 쌍':>10} | {'질의당 (ms)':>11} | {'서로 다른 파일':>14}")
+    print("-" * 60)
+
+    settings = [("MMR 끔", False, None)] + [(f"MMR λ={lam}", True, lam) for lam in lambdas]
+    for label, enabled, lam in settings:
+        retriever.config.MMR_ENABLED = enabled
+        if lam is not None:
+            retriever.config.MMR_LAMBDA = lam
+
+        start = time.perf_counter()
+        results = [retriever.hybrid_search_with_rerank(q, top_k=top_k) for q in queries]
+        elapsed = (time.perf_counter() - start) * 1000 / len(queries)
+
+        n_pairs = top_k * (config.MMR_CANDIDATE_MULTIPLIER if enabled else 3)
+        distinct = np.mean([len({doc['filename'] for doc in docs}) for docs in results])
+        print(f"{label:>12} | {n_pairs:>10} | {elapsed:>11.1f} | {distinct:>14.2f}")
+
+
+# ============================================================
+# 12. 검색기 시작 시간 (지연 초기화)
+# ============================================================
+
+def bench_startup(query: str, warmup: str = "lazy", mode: str = "hybrid_rerank", top_k: int = 10):
+    """
+    RAGRetriever 생성 시간 / 첫 검색 시간 / 구성 요소별 초기화 시간 (실제 DB 사용)
+
+    모듈 import와 모델 로드는 프로세스당 한 번이므로 warmup 방식마다 새 프로세스에서 실행합니다:
+        for w in eager background lazy; do python src/evaluation/benchmark_retrieval.py startup --warmup $w; done
+    """
+    from src.utils.config import RAGConfig
+    from src.retriever.retriever import RAGRetriever
+
+    config = RAGConfig()
+    config.RETRIEVER_WARMUP = warmup
+    config.QUERY_CACHE_SIZE = 0
+
+    start = time.perf_counter()
+    retriever = RAGRetriever(config=config)
+    construct_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    retriever.search_with_mode(query, top_k=top_k, mode=mode)
+    first_query_s = time.perf_counter() - start
+
+    print_header(f"📊 검색기 시작 시간 (warmup={warmup}, mode={mode})")
+    print(f"생성: {construct_s:.2f}초 | 첫 검색: {first_query_s:.2f}초 | 합계: {construct_s + first_query_s:.2f}초")
+    print("-" * 80)
+    for component, seconds in retriever.init_timings.items():
+        print(f"{component:>12} | {seconds:>8.2f}초")
+    pending = [name for name in ('embeddings', 'vectorstore', 'bm25', 'dense_index', 'reranker')
+               if not retriever.is_ready(name)]
+    if pending:
+        print(f"초기화하지 않은 구성 요소: {', '.join(pending)}")
+
+
+# 진입점별 시작 시간 측정용 자식 프로세스 (argv: 부모 시작 시각, 진입점, 모드, top_k, 질의)
+_STARTUP_CHILD = """
+import sys, time, json
+start, entry, mode, top_k, query = float(sys.argv[1]), sys.argv[2], sys.argv[3], int(sys.argv[4]), sys.argv[5]
+sys.path.insert(0, '.')
+if entry == 'streamlit':
+    import streamlit
+from src.generator.generator import RAGPipeline
+imported = time.time() - start
+rag = RAGPipeline()
+ready = time.time() - start
+rag.retriever.search_with_mode(query, top_k=top_k, mode=mode)
+answered = time.time() - start
+print(json.dumps({'import': imported, 'ready': ready, 'answered': answered}))
+"""
+
+
+def bench_startup_process(query: str, entries: List[str], warmups: List[str],
+                          mode: str = "hybrid_rerank", top_k: int = 10):
+    """
+    프로세스 시작 → 첫 검색 결과까지 시간 (CLI / Streamlit 진입점, 실제 DB/API 사용)
+
+    진입점마다 새 Python 프로세스에서 RAGPipeline을 만들고 첫 검색을 실행합니다.
+    'streamlit'은 앱(src/visualization/chatbot_app.py)을 실행하지 않고, streamlit import 후
+    앱의 initialize_rag와 같은 RAGPipeline 생성만 재현합니다. 앱 스크립트 실행, 서버 기동,
+    첫 화면 렌더링 시간은 포함하지 않으므로 실제 앱 시작 시간의 하한입니다.
+    LLM 답변 생성 시간은 시작 경로와 무관하므로 제외합니다.
+    검색기 스냅샷 사용/미사용(RETRIEVER_SNAPSHOT_PATH="")을 함께 비교합니다.
+    """
+    import os
+    import json
+    import subprocess
+
+    print_header(f"📊 진입점별 시작 시간 (mode={mode}, 프로세스 시작 기준 초)")
+    if 'streamlit' in entries:
+        print("   streamlit = streamlit import + RAGPipeline 생성 (앱 실행/화면 렌더링 제외)")
+    print(f"{'진입점':>10} | {'warmup':>10} | {'스냅샷':>6} | {'import':>7} | {'ready':>7} | {'첫 검색':>7}")
+    print("-" * 80)
+
+    for entry in entries:
+        for warmup in warmups:
+            for use_snapshot in (False, True):
+                env = dict(os.environ, RETRIEVER_WARMUP=warmup)
+                if not use_snapshot:
+                    env['RETRIEVER_SNAPSHOT_PATH'] = ""
+
+                completed = subprocess.run(
+                    [sys.executable, '-c', _STARTUP_CHILD, str(time.time()), entry, mode, str(top_k), query],
+                    cwd=project_root, env=env, capture_output=True, text=True
+                )
+                if completed.returncode != 0:
+                    print(f"❌ {entry} ({warmup}) 실패:\n{completed.stderr[-2000:]}")
+                    continue
+
+                t = json.loads(completed.stdout.strip().splitlines()[-1])
+                print(f"{entry:>10} | {warmup:>10} | {'사용' if use_snapshot else '없음':>6} | "
+                      f"{t['import']:>7.2f} | {t['ready']:>7.2f} | {t['answered']:>7.2f}")
+
+
+# ============================================================
+# 13. 컬럼형 메타데이터
+# ============================================================
+
+def deep_sizeof(obj, seen=None) -> int:
+    """list/dict/문자열 객체 그래프 메모리 (같은 객체는 한 번만)"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def bench_metadata(chunks_path: str, top_k: int = 10, repeat: int = 5):
+    """
+    청크별 dict 목록 vs 사전 인코딩 컬럼 (메모리 / top-k dict 생성 / 필터)
+
+    dict는 임베딩 단계(ChromaDBBuilder._prepare_data)와 같은 방식으로 만듭니다
+    (빈 값 제외, 문자열). Chroma get()도 행마다 새 문자열을 만들므로 같은 조건입니다.
+    """
+    import pandas as pd
+    from src.retriever.metadata_store import MetadataStore
+
+    df = pd.read_csv(chunks_path).fillna('')
+    metadata_cols = [col for col in df.columns if col not in ['chunk_content', 'chunk_id']]
+    rows = df[metadata_cols].astype(str).to_dict('records')
+    metadatas = [{k: v for k, v in row.items() if v and v != 'nan'} for row in rows]
+
+    store = MetadataStore.from_dicts(metadatas)
+    assert store.to_dicts() == metadatas
+
+    dict_bytes = deep_sizeof(metadatas)
+    store_bytes = store.nbytes()
+
+    print_header(f"📊 메타데이터 저장 방식 ({len(metadatas)}개 청크, {len(store.fields)}개 필드)")
+    print(f"{'방식':>10} | {'메모리 (MB)':>11}")
+    print("-" * 80)
+    print(f"{'dict 목록':>10} | {dict_bytes / 2**20:>11.2f}")
+    print(f"{'컬럼':>10} | {store_bytes / 2**20:>11.2f}  ({dict_bytes / max(store_bytes, 1):.1f}배 절감)")
+    print("-" * 80)
+    for field in store.fields:
+        print(f"  {field}: 고유 값 {len(store.values(field))}개")
+
+    positions = np.arange(min(top_k, len(store)))
+    field = '발주 기관' if '발주 기관' in store.fields else store.fields[0]
+    value = store.values(field)[0]
+    list_filter_ms = measure(lambda: [i for i, m in enumerate(metadatas) if m.get(field) == value], repeat)
+    mask_ms = measure(lambda: store.mask(field, value), repeat)
+    materialize_ms = measure(lambda: [store[i] for i in positions], repeat)
+
+    print("-" * 80)
+    print(f"top-{len(positions)} dict 생성: {materialize_ms:.3f} ms")
+    print(f"'{field}' 필터: dict 순회 {list_filter_ms:.2f} ms / 코드 비교 {mask_ms:.2f} ms")
+
+
+# ============================================================
+# 14. 청크 본문 저장소
+# ============================================================
+
+def bench_text_store(chunks_path: str, top_k: int = 30, repeat: int = 5):
+    """
+    본문 list + content_to_id dict (이전 방식) vs 오프셋 인덱스 UTF-8 저장소 (메모리 / 후보 본문 조회)
+
+    TextStore는 스냅샷에서 로드하면 mmap이므로 실제 상주 메모리는 읽은 페이지만큼입니다.
+    """
+    import pandas as pd
+    from src.retriever.text_store import TextStore
+
+    df = pd.read_csv(chunks_path)
+    texts = df['chunk_content'].dropna().astype(str).tolist()
+    ids = [f"chunk_{i}" for i in range(len(texts))]
+    content_to_id = {text: doc_id for text, doc_id in zip(texts, ids)}
+
+    store = TextStore.from_strings(texts)
+    assert store.tolist() == texts
+
+    seen = set()
+    list_bytes = deep_sizeof(texts, seen)
+    dict_bytes = deep_sizeof(content_to_id, seen)
+
+    positions = np.random.default_rng(0).choice(len(texts), size=min(top_k, len(texts)), replace=False)
+    list_ms = measure(lambda: [texts[i] for i in positions], repeat)
+    store_ms = measure(lambda: store.take(positions), repeat)
+
+    print_header(f"📊 청크 본문 저장 방식 ({len(texts)}개 청크)")
+    print(f"{'방식':>22} | {'메모리 (MB)':>11} | {f'후보 {len(positions)}개 조회 (ms)':>20}")
+    print("-" * 80)
+    print(f"{'list + content_to_id':>22} | {(list_bytes + dict_bytes) / 2**20:>11.2f} | {list_ms:>20.3f}")
+    print(f"{'TextStore':>22} | {store.nbytes / 2**20:>11.2f} | {store_ms:>20.3f}")
+
+
+# ============================================================
+# 15. 임베딩 검색 결과 결합 (ID 기준)
+# ============================================================
+
+def bench_dense_join(queries: List[str], k: int = 30, max_groups: int = 50, repeat: int = 5):
+    """
+    Chroma 검색 결과 → 문서 위치 변환: 본문 기준 (이전) vs ID 기준 (실제 DB 사용)
+
+    1) 회귀 확인: 본문이 같은 청크 묶음마다 첫 청크의 저장된 벡터로 검색해
+       묶음의 모든 청크가 서로 다른 위치로 반환되는지 확인합니다
+       (본문 기준 변환은 같은 ID 하나로 합쳐졌음).
+    2) 질의당 지연 시간과 최대 할당 메모리 (tracemalloc)
+    """
+    import tracemalloc
+    from collections import defaultdict
+    from src.utils.config import RAGConfig
+    from src.retriever.retriever import RAGRetriever
+
+    config = RAGConfig()
+    config.DENSE_BACKEND = "chroma"
+    config.RETRIEVER_WARMUP = "lazy"
+    retriever = RAGRetriever(config=config)
+    collection = retriever.vectorstore._collection
+
+    groups = defaultdict(list)
+    for position, text in enumerate(retriever.doc_texts):
+        groups[text].append(position)
+    duplicate_groups = [positions for positions in groups.values() if len(positions) > 1]
+
+    print_header(f"📊 임베딩 검색 결과 결합 ({len(retriever.doc_ids)}개 청크, 본문 중복 묶음 {len(duplicate_groups)}개)")
+
+    failures = 0
+    checked = duplicate_groups[:max_groups]
+    for positions in checked:
+        ids = [retriever.doc_ids[p] for p in positions]
+        stored = collection.get(ids=ids[:1], include=['embeddings'])
+        found, _ = retriever._chroma_dense_search(np.asarray(stored['embeddings'][0]).tolist(),
+                                                  len(positions) + 5)
+        if len(set(found.tolist())) != len(found) or not set(positions) <= set(found.tolist()):
+            failures += 1
+    if checked:
+        print(f"본문 중복 청크 구분: {'✅' if failures == 0 else '❌'} ({len(checked) - failures}/{len(checked)}개 묶음)")
+    else:
+        print("본문이 같은 청크가 없어 회귀 확인을 건너뜁니다")
+
+    content_to_id = {text: doc_id for text, doc_id in zip(retriever.doc_texts, retriever.doc_ids)}
+
+    def content_join(vector):
+        results = retriever.vectorstore.similarity_search_by_vector_with_relevance_scores(vector, k=k)
+        return [retriever.id_to_position[content_to_id[doc.page_content]] for doc, _ in results]
+
+    vectors = retriever._embed_queries(queries)
+    print("-" * 80)
+    print(f"{'방식':>10} | {'질의당 (ms)':>11} | {'최대 할당 (KB)':>14}")
+    for label, join in (("본문 기준", content_join), ("ID 기준", lambda v: retriever._chroma_dense_search(v, k))):
+        elapsed = measure(lambda: [join(v) for v in vectors], repeat) / len(vectors)
+        tracemalloc.start()
+        for v in vectors:
+            join(v)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:>10} | {elapsed:>11.2f} | {peak / 1024:>14.1f}")
+
+
+# ============================================================
+# 16. 메타데이터 사전 필터
+# ============================================================
+
+def default_filters(retriever, date_fields: List[str]) -> dict:
+    """가장 많은 발주 기관 / 첫 날짜 필드의 중앙값 이후 조건 (실제 DB 값 기준)"""
+    store = retriever.doc_metadatas
+    filters = {}
+    if '발주 기관' in store.fields:
+        codes = store.codes('발주 기관')
+        value = store.values('발주 기관')[int(np.bincount(codes[codes >= 0]).argmax())]
+        filters[f"발주 기관={value}"] = {'발주 기관': value}
+    date_field = next((field for field in date_fields if field in store.fields), None)
+    if date_field:
+        values = sorted(store.values(date_field))
+        start = values[len(values) // 2]
+        filters[f"{date_field}>={start}"] = {date_field: {'$gte': start}}
+    return filters
+
+
+def bench_filter(queries: List[str], top_k: int = 10, overfetch: int = 10, repeat: int = 3):
+    """
+    메타데이터 사전 필터 vs 사후 필터 (실제 DB 사용)
+
+    사후 필터: top_k * overfetch개를 검색한 뒤 조건에 맞는 결과만 남김 (결과가 모자랄 수 있음)
+    사전 필터: 필드별 역색인으로 허용 문서를 구한 뒤 그 문서만 채점 (filter= 인자)
+    사전 필터 결과가 모두 조건을 만족하는지도 확인합니다.
+    """
+    import io
+    import contextlib
+    from src.utils.config import RAGConfig
+    from src.retriever.retriever import RAGRetriever
+
+    config = RAGConfig()
+    config.RETRIEVER_WARMUP = "lazy"
+    retriever = RAGRetriever(config=config)
+    with contextlib.redirect_stdout(io.StringIO()):
+        retriever.warmup(['bm25', 'dense_index'])
+        retriever._embed_queries(queries)  # 임베딩 캐시 채우기
+
+    date_fields = [field for field in config.METADATA_FILTER_FIELDS if field not in ('발주 기관', '파일명')]
+    filters = default_filters(retriever, date_fields)
+    searches = {
+        'embedding': lambda q, k, f=None: retriever.search(q, k, filter_metadata=f),
+        'hybrid': lambda q, k, f=None: retriever.hybrid_search(q, k, filter=f),
+        'hybrid_rrf': lambda q, k, f=None: retriever.hybrid_search(q, k, fusion="rrf", filter=f),
+    }
+
+    print_header(f"📊 메타데이터 사전 필터 ({len(retriever.doc_ids)}개 청크, 질의 {len(queries)}개, "
+                 f"top-{top_k}, 사후 필터 {top_k * overfetch}개 검색)")
+    for label, conditions in filters.items():
+        prepare_ms = measure(lambda: retriever.doc_metadatas.prepare_filter(conditions), repeat)
+        metadata_filter = retriever._resolve_filter(conditions)
+        allowed = set(metadata_filter.positions.tolist())
+        print("-" * 80)
+        print(f"{label}: 허용 문서 {len(allowed)}개, 필터 준비 {prepare_ms:.3f} ms")
+        print(f"{'모드':>12} | {'사전 (ms)':>9} | {'평균 결과':>8} | {'사후 (ms)':>9} | {'평균 결과':>8} | 조건 충족")
+
+        for mode, search in searches.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                pre = [search(q, top_k, conditions) for q in queries]
+                post = [
+                    [d for d in search(q, top_k * overfetch)
+                     if retriever.id_to_position[d['id']] in allowed][:top_k]
+                    for q in queries
+                ]
+                pre_ms = measure(lambda: [search(q, top_k, conditions) for q in queries], repeat)
+                post_ms = measure(lambda: [search(q, top_k * overfetch) for q in queries], repeat)
+
+            valid = all(retriever.id_to_position[d['id']] in allowed for results in pre for d in results)
+            print(f"{mode:>12} | {pre_ms / len(queries):>9.2f} | {np.mean([len(r) for r in pre]):>8.1f} | "
+                  f"{post_ms / len(queries):>9.2f} | {np.mean([len(r) for r in post]):>8.1f} | "
+                  f"{'✅' if valid else '❌'}")
+
+
+# ============================================================
+# 메인 실행
+# ============================================================
+
+def main():
+    """메인 실행"""
+    parser = argparse.ArgumentParser(description='RAG 검색 마이크로 벤치마크')
+    subparsers = parser.add_subparsers(dest='bench', required=True)
+
+    fusion_parser = subparsers.add_parser('fusion', help='Hybrid 점수 결합 단계')
+    fusion_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    fusion_parser.add_argument('--top-k', type=int, default=10)
+    fusion_parser.add_argument('--repeat', type=int, default=5)
+
+    bm25_parser = subparsers.add_parser('bm25', help='BM25 점수 계산 (BM25Okapi와 결과 일치 확인 포함)')
+    bm25_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_BM25_SIZES)
+    bm25_parser.add_argument('--repeat', type=int, default=3)
+
+    topk_parser = subparsers.add_parser('bm25-topk', help='MaxScore top-k BM25')
+    topk_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_BM25_SIZES)
+    topk_parser.add_argument('--k', type=int, default=300)
+    topk_parser.add_argument('--repeat', type=int, default=3)
+
+    rerank_parser = subparsers.add_parser('reranker', help='Re-ranker 백엔드 (torch vs onnx_int8)')
+    rerank_parser.add_argument('--chunks', default='./data/rag_chunks_final.csv')
+    rerank_parser.add_argument('--queries', default=None, help='질의 파일 (한 줄에 하나, 없으면 기본 질의)')
+    rerank_parser.add_argument('--model', default='BAAI/bge-reranker-base')
+    rerank_parser.add_argument('--onnx-dir', default='.cache/reranker_onnx')
+    rerank_parser.add_argument('--candidates', type=int, default=30)
+    rerank_parser.add_argument('--repeat', type=int, default=3)
+
+    many_parser = subparsers.add_parser('search-many', help='search_many 일괄 검색 (실제 DB/API 사용)')
+    many_parser.add_argument('--queries', default=None, help='질의 파일 (한 줄에 하나, 없으면 기본 질의)')
+    many_parser.add_argument('--mode', default='hybrid_rerank',
+                             choices=['embedding', 'bm25', 'hybrid', 'hybrid_rerank',
+                                      'hybrid_rrf', 'hybrid_rrf_rerank'])
+    many_parser.add_argument('--top-k', type=int, default=10)
+
+    parallel_parser = subparsers.add_parser('hybrid-parallel', help='Hybrid 단계 순차/병렬 실행 (실제 DB/API 사용)')
+    parallel_parser.add_argument('--queries', default=None, help='질의 파일 (한 줄에 하나, 없으면 기본 질의)')
+    parallel_parser.add_argument('--top-k', type=int, default=30)
+
+    embedding_parser = subparsers.add_parser('embedding', help='OpenAI vs 로컬 임베딩 지연 시간')
+    embedding_parser.add_argument('--queries', default=None, help='질의 파일 (한 줄에 하나, 없으면 기본 질의)')
+    embedding_parser.add_argument('--chunks', default='./data/rag_chunks_final.csv')
+    embedding_parser.add_argument('--local-model', default='intfloat/multilingual-e5-base')
+    embedding_parser.add_argument('--docs', type=int, default=200)
+    embedding_parser.add_argument('--repeat', type=int, default=3)
+
+    dense_parser = subparsers.add_parser('dense', help='임베딩 인덱스 (정확 검색 float32/float16 vs Chroma HNSW)')
+    dense_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_DENSE_SIZES)
+    dense_parser.add_argument('--dim', type=int, default=1536)
+    dense_parser.add_argument('--k', type=int, default=30)
+    dense_parser.add_argument('--queries', type=int, default=20, help='합성 질의 수')
+    dense_parser.add_argument('--repeat', type=int, default=3)
+
+    quantized_parser = subparsers.add_parser('quantized', help='양자화 임베딩 인덱스 (int8/binary + float 재채점)')
+    quantized_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_DENSE_SIZES)
+    quantized_parser.add_argument('--dim', type=int, default=1536)
+    quantized_parser.add_argument('--k', type=int, default=30)
+    quantized_parser.add_argument('--queries', type=int, default=20, help='질의 수')
+    quantized_parser.add_argument('--rescore-factors', type=int, nargs='+', default=[1, 4, 10])
+    quantized_parser.add_argument('--index', default=None, help='저장된 임베딩 인덱스 디렉토리 (없으면 합성 데이터)')
+    quantized_parser.add_argument('--repeat', type=int, default=3)
+
+    matryoshka_parser = subparsers.add_parser('matryoshka', help='임베딩 차원 축소 스윕 (Recall/지연 시간/크기)')
+    matryoshka_parser.add_argument('--dims', type=int, nargs='+', default=[256, 512, 1024, 1536])
+    matryoshka_parser.add_argument('--queries', default=None, help='질의 파일 (한 줄에 하나, 없으면 기본 질의)')
+    matryoshka_parser.add_argument('--chunks', default='./data/rag_chunks_final.csv')
+    matryoshka_parser.add_argument('--docs', type=int, default=5000)
+    matryoshka_parser.add_argument('--k', type=int, default=10)
+    matryoshka_parser.add_argument('--index', default=None, help='저장된 전체 차원 임베딩 인덱스 (API 호출 없이 측정)')
+    matryoshka_parser.add_argument('--repeat', type=int, default=3)
+
+    rrf_parser = subparsers.add_parser('rrf', help='RRF vs alpha 결합 (BM25 + 결합 단계)')
+    rrf_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_BM25_SIZES)
+    rrf_parser.add_argument('--top-k', type=int, default=10)
+    rrf_parser.add_argument('--rrf-k', type=int, default=60)
+    rrf_parser.add_argument('--repeat', type=int, default=3)
+
+    mmr_parser = subparsers.add_parser('mmr', help='Re-rank 전 MMR 다양성 선택 (실제 DB 사용)')
+    mmr_parser.add_argument('--queries', default=None, help='질의 파일 (한 줄에 하나, 없으면 기본 질의)')
+    mmr_parser.add_argument('--top-k', type=int, default=5)
+    mmr_parser.add_argument('--lambdas', type=float, nargs='+', default=[0.5, 0.7, 0.9])
+
+    startup_parser = subparsers.add_parser('startup', help='검색기 생성/첫 검색 시간 (실제 DB 사용)')
+    startup_parser.add_argument('--warmup', choices=['eager', 'background', 'lazy'], default='lazy')
+    startup_parser.add_argument('--mode', default='hybrid_rerank',
+                                choices=['embedding', 'bm25', 'hybrid', 'hybrid_rerank',
+                                         'hybrid_rrf', 'hybrid_rrf_rerank'])
+    startup_parser.add_argument('--query', default=DEFAULT_QUERIES[0])
+    startup_parser.add_argument('--top-k', type=int, default=10)
+    startup_parser.add_argument('--process', action='store_true',
+                                help='진입점(CLI/Streamlit)별 새 프로세스에서 시작부터 첫 검색까지 측정')
+    startup_parser.add_argument('--entries', nargs='+', choices=['cli', 'streamlit'], default=['cli', 'streamlit'],
+                                help='streamlit은 streamlit import + RAGPipeline 생성만 재현 (앱 실행 제외)')
+    startup_parser.add_argument('--warmups', nargs='+', choices=['eager', 'background', 'lazy'],
+                                default=['eager', 'background'])
+
+    metadata_parser = subparsers.add_parser('metadata', help='dict 목록 vs 컬럼형 메타데이터 (메모리/필터)')
+    metadata_parser.add_argument('--chunks', default='./data/rag_chunks_final.csv')
+    metadata_parser.add_argument('--top-k', type=int, default=10)
+    metadata_parser.add_argument('--repeat', type=int, default=5)
+
+    text_parser = subparsers.add_parser('text-store', help='본문 list/dict vs 오프셋 인덱스 저장소 (메모리/조회)')
+    text_parser.add_argument('--chunks', default='./data/rag_chunks_final.csv')
+    text_parser.add_argument('--top-k', type=int, default=30)
+    text_parser.add_argument('--repeat', type=int, default=5)
+
+    join_parser = subparsers.add_parser('dense-join', help='Chroma 결과 ID 기준 결합 (본문 중복 회귀 확인, 실제 DB 사용)')
+    join_parser.add_argument('--queries', default=None, help='질의 파일 (한 줄에 하나, 없으면 기본 질의)')
+    join_parser.add_argument('--k', type=int, default=30)
+    join_parser.add_argument('--max-groups', type=int, default=50)
+    join_parser.add_argument('--repeat', type=int, default=5)
+
+    filter_parser = subparsers.add_parser('filter', help='메타데이터 사전 필터 vs 사후 필터 (실제 DB 사용)')
+    filter_parser.add_argument('--queries', default=None, help='질의 파일 (한 줄에 하나, 없으면 기본 질의)')
+    filter_parser.add_argument('--top-k', type=int, default=10)
+    filter_parser.add_argument('--overfetch', type=int, default=10)
+    filter_parser.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args()
+
+    if args.bench == 'fusion':
+        bench_fusion(args.sizes, top_k=args.top_k, repeat=args.repeat)
+    elif args.bench == 'bm25':
+        bench_bm25(args.sizes, repeat=args.repeat)
+    elif args.bench == 'bm25-topk':
+        bench_bm25_topk(args.sizes, k=args.k, repeat=args.repeat)
+    elif args.bench == 'reranker':
+        bench_reranker(args.chunks, load_queries(args.queries), args.model, args.onnx_dir,
+                       n_candidates=args.candidates, repeat=args.repeat)
+    elif args.bench == 'search-many':
+        bench_search_many(load_queries(args.queries), mode=args.mode, top_k=args.top_k)
+    elif args.bench == 'hybrid-parallel':
+        bench_hybrid_parallel(load_queries(args.queries), top_k=args.top_k)
+    elif args.bench == 'embedding':
+        bench_embedding(load_queries(args.queries), args.chunks, args.local_model,
+                        n_docs=args.docs, repeat=args.repeat)
+    elif args.bench == 'dense':
+        bench_dense(args.sizes, dim=args.dim, k=args.k, n_queries=args.queries, repeat=args.repeat)
+    elif args.bench == 'quantized':
+        bench_quantized(args.sizes, dim=args.dim, k=args.k, n_queries=args.queries,
+                        rescore_factors=args.rescore_factors, index_dir=args.index, repeat=args.repeat)
+    elif args.bench == 'rrf':
+        bench_rrf(args.sizes, top_k=args.top_k, rrf_k=args.rrf_k, repeat=args.repeat)
+    elif args.bench == 'mmr':
+        bench_mmr(load_queries(args.queries), top_k=args.top_k, lambdas=args.lambdas)
+    elif args.bench == 'matryoshka':
+        bench_matryoshka(args.dims, load_queries(args.queries), args.chunks, n_docs=args.docs,
+                         k=args.k, index_dir=args.index, repeat=args.repeat)
+    elif args.bench == 'filter':
+        bench_filter(load_queries(args.queries), top_k=args.top_k, overfetch=args.overfetch, repeat=args.repeat)
+    elif args.bench == 'dense-join':
+        bench_dense_join(load_queries(args.queries), k=args.k, max_groups=args.max_groups, repeat=args.repeat)
+    elif args.bench == 'text-store':
+        bench_text_store(args.chunks, top_k=args.top_k, repeat=args.repeat)
+    elif args.bench == 'metadata':
+        bench_metadata(args.chunks, top_k=args.top_k, repeat=args.repeat)
+    elif args.bench == 'startup' and args.process:
+        bench_startup_process(args.query, args.entries, args.warmups, mode=args.mode, top_k=args.top_k)
+    elif args.bench == 'startup':
+        bench_startup(args.query, warmup=args.warmup, mode=args.mode, top_k=args.top_k)
+
+
+if __name__ == "__main__":
+    main()
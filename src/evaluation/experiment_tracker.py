@@ -129,6 +129,11 @@ class ExperimentTracker:
                 "날짜": log['timestamp'][:10],
                 "임베딩": log['config'].get('embedding_model', 'N/A'),
                 "Top-K": log['config'].get('top_k', 'N/A'),
+                "검색 모드": log['config'].get('search_mode', 'hybrid_rerank'),
+                "임베딩 검색": log['config'].get('dense_backend', 'chroma'),
+                "후보 배수": log['config'].get('candidate_multiplier', 3),
+                "Union": log['config'].get('union_scoring', False),
+                "Re-ranker": log['config'].get('reranker_backend', 'torch'),
                 "Precision": log['metrics'].get('precision', 0),
                 "Recall": log['metrics'].get('recall', 0),
                 "F1": self._calculate_f1(
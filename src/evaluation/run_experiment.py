@@ -36,6 +36,7 @@ os.environ["LANGCHAIN_TRACING_V2"] = "true"
 
 # === 전역 변수 ===
 retriever = None
+search_mode = "hybrid_rerank"
 
 
 # ============================================================
@@ -222,11 +223,11 @@ def retriever_target(inputs: dict) -> dict:
     if not question:
         return {"output": []}
     
-    # 하이브리드 검색 + Re-ranker 실행
+    # 검색 실행 (기본: 하이브리드 검색 + Re-ranker)
     results = retriever.search_with_mode(
         query=question, 
         top_k=None, 
-        mode="hybrid_rerank", 
+        mode=search_mode, 
         alpha=0.5
     )
     
@@ -255,7 +256,7 @@ def run_experiment(
     Returns:
         실험 결과
     """
-    global retriever
+    global retriever, search_mode
     
     print("\n" + "="*80)
     print(f"🚀 실험 시작: {experiment_name}")
@@ -266,16 +267,45 @@ def run_experiment(
     rag_config = RAGConfig()
     
     # Config 적용
+    if 'embedding_provider' in config:
+        rag_config.EMBEDDING_PROVIDER = config['embedding_provider']
+    if 'collection_name' in config:
+        rag_config.COLLECTION_NAME = config['collection_name']
     if 'embedding_model' in config:
         rag_config.EMBEDDING_MODEL_NAME = config['embedding_model']
+    if 'embedding_dimensions' in config:
+        rag_config.EMBEDDING_DIMENSIONS = config['embedding_dimensions'] or None
     if 'top_k' in config:
         rag_config.DEFAULT_TOP_K = config['top_k']
+    if 'dense_backend' in config:
+        rag_config.DENSE_BACKEND = config['dense_backend']
+    if 'candidate_multiplier' in config:
+        rag_config.HYBRID_CANDIDATE_MULTIPLIER = config['candidate_multiplier']
+    if 'union_scoring' in config:
+        rag_config.HYBRID_UNION_SCORING = config['union_scoring']
+    if 'mmr' in config:
+        rag_config.MMR_ENABLED = config['mmr']
+    if 'lexical_backend' in config:
+        rag_config.LEXICAL_BACKEND = config['lexical_backend']
+    if 'bm25_tokenizer' in config:
+        rag_config.BM25_TOKENIZER = config['bm25_tokenizer']
+    if 'reranker_backend' in config:
+        rag_config.RERANKER_BACKEND = config['reranker_backend']
     
     retriever = RAGRetriever(config=rag_config)
+    search_mode = config.get('search_mode', "hybrid_rerank")
     
     print(f"✅ 설정 완료:")
-    print(f"   임베딩 모델: {rag_config.EMBEDDING_MODEL_NAME}")
+    print(f"   임베딩 모델: {rag_config.EMBEDDING_MODEL_NAME} ({rag_config.EMBEDDING_PROVIDER}, "
+          f"{rag_config.EMBEDDING_DIMENSIONS or '전체'}차원, 컬렉션: {rag_config.COLLECTION_NAME})")
     print(f"   Top-K: {rag_config.DEFAULT_TOP_K}")
+    print(f"   검색 모드: {search_mode}")
+    print(f"   임베딩 검색: {rag_config.DENSE_BACKEND}")
+    print(f"   Hybrid 후보: top_k x {rag_config.HYBRID_CANDIDATE_MULTIPLIER} "
+          f"(union 점수: {'사용' if rag_config.HYBRID_UNION_SCORING else '미사용'})")
+    print(f"   BM25: {rag_config.LEXICAL_BACKEND} / {rag_config.BM25_TOKENIZER}")
+    print(f"   Re-ranker: {rag_config.RERANKER_MODEL_NAME} ({rag_config.RERANKER_BACKEND}, "
+          f"MMR: {'사용' if rag_config.MMR_ENABLED else '미사용'})")
     
     # 2. Evaluators 설정
     evaluators_list = [
@@ -307,6 +337,7 @@ def run_experiment(
             "precision": df["feedback.context_precision"].mean(),
             "recall": df["feedback.context_recall"].mean(),
             "avg_time": df["execution_time"].mean(),
+            "rerank_cache_hit_rate": retriever.cache_stats()['rerank']['hit_rate'],
         }
         
         # 6. 자동 추적 저장
@@ -334,6 +365,7 @@ def run_experiment(
             f1 = 2 * metrics['precision'] * metrics['recall'] / (metrics['precision'] + metrics['recall'])
         print(f"F1: {f1:.4f}")
         print(f"평균 검색 시간: {metrics['avg_time']:.3f}초")
+        print(f"Re-rank 캐시 재사용 비율: {metrics['rerank_cache_hit_rate']:.1%}")
         print("="*80)
         
         return results
@@ -362,19 +394,64 @@ def interactive_run():
     if not experiment_name:
         experiment_name = "experiment"
     
-    embedding_model = input("임베딩 모델 (엔터: text-embedding-3-small): ").strip()
+    embedding_provider = input("임베딩 제공자 (openai/local, 엔터: openai): ").strip()
+    if not embedding_provider:
+        embedding_provider = "openai"
+    
+    default_model = "text-embedding-3-small" if embedding_provider == "openai" else "intfloat/multilingual-e5-base"
+    embedding_model = input(f"임베딩 모델 (엔터: {default_model}): ").strip()
     if not embedding_model:
-        embedding_model = "text-embedding-3-small"
+        embedding_model = default_model
+    
+    dimensions_input = input("임베딩 차원 (예: 256, 512, 엔터: 전체 차원): ").strip()
+    embedding_dimensions = int(dimensions_input) if dimensions_input else None
+    
+    collection_name = input("ChromaDB 컬렉션 (엔터: rag_documents): ").strip()
+    if not collection_name:
+        collection_name = "rag_documents"
     
     top_k_input = input("Top-K (엔터: 10): ").strip()
     top_k = int(top_k_input) if top_k_input else 10
     
+    search_mode_input = input("검색 모드 (hybrid_rerank/hybrid_rrf_rerank/hybrid/hybrid_rrf, 엔터: hybrid_rerank): ").strip()
+    if not search_mode_input:
+        search_mode_input = "hybrid_rerank"
+    
+    dense_backend = input("임베딩 검색 백엔드 (chroma/exact/int8/binary, 엔터: chroma): ").strip()
+    if not dense_backend:
+        dense_backend = "chroma"
+    
+    multiplier_input = input("Hybrid 후보 배수 (엔터: 3): ").strip()
+    candidate_multiplier = int(multiplier_input) if multiplier_input else 3
+    
+    union_scoring = input("BM25 후보도 임베딩 점수 계산 - union (y/n, 엔터: n): ").strip().lower() == 'y'
+    
+    bm25_tokenizer = input("BM25 토크나이저 (whitespace/char_ngram/josa, 엔터: whitespace): ").strip()
+    if not bm25_tokenizer:
+        bm25_tokenizer = "whitespace"
+    
+    reranker_backend = input("Re-ranker 백엔드 (torch/onnx_int8, 엔터: torch): ").strip()
+    if not reranker_backend:
+        reranker_backend = "torch"
+    
+    mmr = input("Re-rank 전 MMR 다양성 선택 (y/n, 엔터: n): ").strip().lower() == 'y'
+    
     notes = input("메모 (선택사항): ").strip()
     
     # 설정 구성
     config = {
+        "embedding_provider": embedding_provider,
         "embedding_model": embedding_model,
+        "embedding_dimensions": embedding_dimensions,
+        "collection_name": collection_name,
         "top_k": top_k,
+        "search_mode": search_mode_input,
+        "dense_backend": dense_backend,
+        "candidate_multiplier": candidate_multiplier,
+        "union_scoring": union_scoring,
+        "bm25_tokenizer": bm25_tokenizer,
+        "reranker_backend": reranker_backend,
+        "mmr": mmr,
     }
     
     # 확인
@@ -382,8 +459,14 @@ def interactive_run():
     print("📋 실험 정보 확인")
     print("="*80)
     print(f"실험 이름: {experiment_name}")
-    print(f"임베딩 모델: {embedding_model}")
+    print(f"임베딩 모델: {embedding_model} ({embedding_provider}, "
+          f"{embedding_dimensions or '전체'}차원, 컬렉션: {collection_name})")
     print(f"Top-K: {top_k}")
+    print(f"검색 모드: {search_mode_input}")
+    print(f"임베딩 검색 백엔드: {dense_backend}")
+    print(f"Hybrid 후보: top_k x {candidate_multiplier} (union 점수: {'사용' if union_scoring else '미사용'})")
+    print(f"BM25 토크나이저: {bm25_tokenizer}")
+    print(f"Re-ranker 백엔드: {reranker_backend} (MMR: {'사용' if mmr else '미사용'})")
     if notes:
         print(f"메모: {notes}")
     print("="*80)
@@ -117,6 +117,12 @@ class RAGPipeline:
             docs = self.retriever.hybrid_search_with_rerank(
                 query, top_k=self.top_k, alpha=self.alpha
             )
+        elif self.search_mode == "hybrid_rrf":
+            docs = self.retriever.hybrid_search(query, top_k=self.top_k, alpha=self.alpha, fusion="rrf")
+        elif self.search_mode == "hybrid_rrf_rerank":
+            docs = self.retriever.hybrid_search_with_rerank(
+                query, top_k=self.top_k, alpha=self.alpha, fusion="rrf"
+            )
         else:
             docs = self.retriever.search(query, top_k=self.top_k)
         
@@ -181,7 +187,7 @@ class RAGPipeline:
         Args:
             query: 질문
             top_k: 검색할 문서 수
-            search_mode: 검색 모드 ("embedding", "hybrid", "hybrid_rerank")
+            search_mode: 검색 모드 ("embedding", "hybrid", "hybrid_rerank", "hybrid_rrf", "hybrid_rrf_rerank")
             alpha: 임베딩 가중치 (0~1)
         
         Returns:
@@ -349,8 +355,11 @@ def interactive_mode():
             print("1. embedding - 임베딩 검색")
             print("2. hybrid - BM25 + 임베딩")
             print("3. hybrid_rerank - Hybrid + Re-ranker (권장)")
-            choice = input("선택 (1/2/3): ").strip()
-            modes = {'1': 'embedding', '2': 'hybrid', '3': 'hybrid_rerank'}
+            print("4. hybrid_rrf - BM25 + 임베딩 순위 결합 (RRF)")
+            print("5. hybrid_rrf_rerank - RRF + Re-ranker")
+            choice = input("선택 (1/2/3/4/5): ").strip()
+            modes = {'1': 'embedding', '2': 'hybrid', '3': 'hybrid_rerank',
+                     '4': 'hybrid_rrf', '5': 'hybrid_rrf_rerank'}
             if choice in modes:
                 pipeline.set_search_config(search_mode=modes[choice])
             continue
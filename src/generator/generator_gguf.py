@@ -398,6 +398,14 @@ class GGUFRAGPipeline:
             docs = self.retriever.hybrid_search_with_rerank(
                 query, top_k=self.top_k, alpha=self.alpha
             )
+        elif self.search_mode == "hybrid_rrf":
+            docs = self.retriever.hybrid_search(
+                query, top_k=self.top_k, alpha=self.alpha, fusion="rrf"
+            )
+        elif self.search_mode == "hybrid_rrf_rerank":
+            docs = self.retriever.hybrid_search_with_rerank(
+                query, top_k=self.top_k, alpha=self.alpha, fusion="rrf"
+            )
         else:
             docs = self.retriever.search(query, top_k=self.top_k)
         
@@ -0,0 +1,284 @@
+"""
+영속 BM25 인덱스
+
+임베딩 단계에서 한 번 만든 BM25 통계(어휘, 문서 빈도, 문서 길이, 포스팅)를
+chroma_db 옆에 버전이 있는 아티팩트로 저장하고, 검색기 시작 시
+np.load(mmap_mode='r')로 매핑합니다. 여러 프로세스가 같은 페이지를 공유하며
+재토큰화/재구축이 필요 없습니다.
+
+점수 계산은 rank_bm25.BM25Okapi와 동일한 공식을 따릅니다.
+"""
+
+import os
+import json
+import uuid
+import shutil
+import bisect
+import hashlib
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+
+BM25_INDEX_FORMAT_VERSION = 3
+
+_ARRAY_FILES = [
+    "terms_blob", "terms_offsets", "doc_freqs", "idf",
+    "doc_lens", "postings_indptr", "postings_docs", "postings_tfs",
+    "postings_weights", "term_max_weights",
+]
+
+
+def corpus_fingerprint(doc_ids):
+    """문서 ID 순서 기반 지문 (Chroma 컬렉션과 인덱스 정렬 확인용)"""
+    digest = hashlib.sha1()
+    for doc_id in doc_ids:
+        digest.update(str(doc_id).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class _TermTable:
+    """
+    UTF-8 바이트 순으로 정렬된 어휘 테이블
+
+    단일 바이트 배열 + 오프셋 배열로 저장해 mmap 상태 그대로
+    이진 탐색합니다 (Python dict를 만들지 않음).
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def lookup(self, term):
+        """term의 ID 반환 (없으면 None)"""
+        key = term.encode('utf-8')
+        i = bisect.bisect_left(self, key)
+        if i < len(self) and self[i] == key:
+            return i
+        return None
+
+    @classmethod
+    def from_terms(cls, sorted_terms):
+        encoded = [t.encode('utf-8') for t in sorted_terms]
+        lengths = np.fromiter((len(t) for t in encoded), dtype=np.int64, count=len(encoded))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(blob, offsets)
+
+
+class BM25Index:
+    """BM25Okapi 호환 역색인 (CSR 포스팅)"""
+
+    def __init__(self, terms, doc_freqs, idf, doc_lens, postings_indptr,
+                 postings_docs, postings_tfs, postings_weights, term_max_weights, meta):
+        self.terms = terms
+        self.doc_freqs = doc_freqs
+        self.idf = idf
+        self.doc_lens = doc_lens
+        self.postings_indptr = postings_indptr
+        self.postings_docs = postings_docs
+        self.postings_tfs = postings_tfs
+        self.postings_weights = postings_weights
+        self.term_max_weights = term_max_weights
+        self.meta = meta
+
+        self.k1 = meta['k1']
+        self.b = meta['b']
+        self.avgdl = meta['avgdl']
+        self.corpus_size = meta['n_docs']
+
+        # 문서 길이 정규화 항 (BM25Okapi와 같은 식)
+        self._length_norm = self.k1 * (1 - self.b + self.b * np.asarray(doc_lens) / self.avgdl)
+
+    @property
+    def version(self):
+        """인덱스 빌드 식별자 (재구축 시 바뀜)"""
+        return self.meta['build_id']
+
+    # === 구축 ===
+
+    @classmethod
+    def build(cls, tokenized_docs, k1=1.5, b=0.75, epsilon=0.25, tokenizer="whitespace", extra_meta=None):
+        """토큰화된 문서 리스트로 인덱스 생성"""
+        n_docs = len(tokenized_docs)
+        doc_counts = [Counter(tokens) for tokens in tokenized_docs]
+        doc_lens = np.array([len(tokens) for tokens in tokenized_docs], dtype=np.int32)
+
+        sorted_terms = sorted(
+            {term for counts in doc_counts for term in counts},
+            key=lambda t: t.encode('utf-8')
+        )
+        term_ids = {term: i for i, term in enumerate(sorted_terms)}
+        n_terms = len(sorted_terms)
+
+        # (term, doc, tf) 삼중항 → term 기준 CSR
+        rows, cols, tfs = [], [], []
+        for doc_idx, counts in enumerate(doc_counts):
+            for term, tf in counts.items():
+                rows.append(term_ids[term])
+                cols.append(doc_idx)
+                tfs.append(tf)
+
+        # scipy.sparse가 복사 없이 쓸 수 있도록 indptr/indices dtype을 맞춤
+        index_dtype = np.int32 if len(rows) < np.iinfo(np.int32).max else np.int64
+
+        rows = np.array(rows, dtype=np.int64)
+        order = np.lexsort((np.array(cols, dtype=np.int64), rows))
+        postings_docs = np.array(cols, dtype=index_dtype)[order]
+        postings_tfs = np.array(tfs, dtype=np.float32)[order]
+
+        doc_freqs = np.bincount(rows, minlength=n_terms).astype(np.int32)
+        postings_indptr = np.zeros(n_terms + 1, dtype=index_dtype)
+        np.cumsum(doc_freqs, out=postings_indptr[1:])
+
+        # BM25Okapi IDF: 음수 IDF는 epsilon * 평균 IDF로 대체
+        idf = np.log(n_docs - doc_freqs + 0.5) - np.log(doc_freqs + 0.5)
+        if n_terms > 0:
+            average_idf = idf.sum() / n_terms
+            idf[idf < 0] = epsilon * average_idf
+
+        avgdl = float(doc_lens.sum()) / n_docs if n_docs else 0.0
+
+        # 포스팅별 BM25 가중치 (희소 행렬 점수 계산용)
+        posting_terms = np.repeat(np.arange(n_terms), doc_freqs)
+        q_freq = postings_tfs.astype(float)
+        length_norm = k1 * (1 - b + b * doc_lens[postings_docs] / avgdl)
+        postings_weights = idf[posting_terms] * (q_freq * (k1 + 1) / (q_freq + length_norm))
+
+        # 용어별 점수 상한 (MaxScore 가지치기용)
+        term_max_weights = np.zeros(n_terms)
+        np.maximum.at(term_max_weights, posting_terms, postings_weights)
+
+        meta = {
+            'format_version': BM25_INDEX_FORMAT_VERSION,
+            'build_id': uuid.uuid4().hex,
+            'created_at': datetime.now().isoformat(),
+            'tokenizer': tokenizer,
+            'k1': k1,
+            'b': b,
+            'epsilon': epsilon,
+            'n_docs': n_docs,
+            'n_terms': n_terms,
+            'avgdl': avgdl,
+        }
+        meta.update(extra_meta or {})
+
+        return cls(
+            terms=_TermTable.from_terms(sorted_terms),
+            doc_freqs=doc_freqs,
+            idf=idf,
+            doc_lens=doc_lens,
+            postings_indptr=postings_indptr,
+            postings_docs=postings_docs,
+            postings_tfs=postings_tfs,
+            postings_weights=postings_weights,
+            term_max_weights=term_max_weights,
+            meta=meta,
+        )
+
+    # === 저장 / 로드 ===
+
+    def arrays(self):
+        """저장할 배열 {이름: 배열} (검색기 스냅샷에도 같은 이름으로 저장)"""
+        return {
+            'terms_blob': self.terms.blob,
+            'terms_offsets': self.terms.offsets,
+            'doc_freqs': self.doc_freqs,
+            'idf': self.idf,
+            'doc_lens': self.doc_lens,
+            'postings_indptr': self.postings_indptr,
+            'postings_docs': self.postings_docs,
+            'postings_tfs': self.postings_tfs,
+            'postings_weights': self.postings_weights,
+            'term_max_weights': self.term_max_weights,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """arrays()와 같은 이름의 배열(mmap 가능)과 메타데이터로 인덱스 복원"""
+        return cls(
+            terms=_TermTable(arrays['terms_blob'], arrays['terms_offsets']),
+            doc_freqs=arrays['doc_freqs'],
+            idf=arrays['idf'],
+            doc_lens=arrays['doc_lens'],
+            postings_indptr=arrays['postings_indptr'],
+            postings_docs=arrays['postings_docs'],
+            postings_tfs=arrays['postings_tfs'],
+            postings_weights=arrays['postings_weights'],
+            term_max_weights=arrays['term_max_weights'],
+            meta=meta,
+        )
+
+    def save(self, directory):
+        """디렉토리에 저장 (임시 디렉토리에 쓴 뒤 교체)"""
+        tmp_dir = f"{directory}.tmp-{uuid.uuid4().hex[:8]}"
+        os.makedirs(tmp_dir)
+
+        for name, array in self.arrays().items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(array))
+
+        with open(os.path.join(tmp_dir, "meta.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.replace(tmp_dir, directory)
+
+    @staticmethod
+    def read_meta(directory):
+        """메타데이터만 읽기 (없으면 None)"""
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """저장된 인덱스 로드 (기본: 메모리 매핑)"""
+        meta = cls.read_meta(directory)
+        if meta is None:
+            raise FileNotFoundError(f"BM25 인덱스를 찾을 수 없습니다: {directory}")
+
+        if meta.get('format_version') != BM25_INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f"BM25 인덱스 버전 불일치: {meta.get('format_version')} "
+                f"(필요: {BM25_INDEX_FORMAT_VERSION})"
+            )
+
+        mmap_mode = 'r' if mmap else None
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in _ARRAY_FILES
+        }
+        return cls.from_arrays(arrays, meta)
+
+    # === 검색 ===
+
+    def get_scores(self, query_tokens):
+        """모든 문서의 BM25 점수 (BM25Okapi.get_scores 호환)"""
+        scores = np.zeros(self.corpus_size)
+
+        for token in query_tokens:
+            term_id = self.terms.lookup(token)
+            if term_id is None:
+                continue
+
+            start, end = self.postings_indptr[term_id], self.postings_indptr[term_id + 1]
+            docs = self.postings_docs[start:end]
+            q_freq = self.postings_tfs[start:end].astype(float)
+
+            scores[docs] += self.idf[term_id] * (
+                q_freq * (self.k1 + 1) / (q_freq + self._length_norm[docs])
+            )
+
+        return scores
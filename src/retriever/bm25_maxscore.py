@@ -0,0 +1,131 @@
+"""
+MaxScore 동적 가지치기 기반 Top-k BM25
+
+hybrid_search는 BM25 상위 수백 개 후보만 필요하므로 모든 문서를 채점하지 않습니다.
+용어별 점수 상한(term_max_weights)으로 질의어를 필수/비필수로 나누고,
+비필수 용어만 가진 문서는 top-k에 들 수 없으므로 후보에서 제외합니다.
+
+1. 임계값 θ: 질의어 하나의 포스팅 안에서 k번째로 큰 가중치
+   (그 문서들은 최소 θ점이므로 k번째 점수 ≥ θ)
+2. 상한 오름차순으로 상한 합이 θ 미만인 용어들 → 비필수
+3. 필수 용어 포스팅의 합집합만 후보로 채점, 부분 점수 + 비필수 상한 합이
+   θ 미만인 후보는 비필수 용어 조회 전에 제거
+
+모든 단계가 질의어 포스팅 위의 NumPy 연산이므로 지연 시간은 코퍼스 크기가 아니라
+포스팅 길이에 비례합니다. 결과는 전체 채점 후 0점 이하 문서를 뺀 상위 k개와 동일합니다.
+
+idf가 0 이하인 용어(df ≥ N/2, 평균 idf가 음수일 때의 epsilon 하한)는 가중치가 0 이하라
+상한 기반 가지치기가 성립하지 않습니다. 이런 용어는 후보를 만들지 않고, 후보 점수에만
+더하며 (0점 이하 문서는 어차피 제외), 이때는 임계값 가지치기를 하지 않습니다.
+"""
+
+import numpy as np
+
+from src.retriever.bm25_index import BM25Index
+from src.retriever.fusion import top_k_positions
+
+
+class MaxScoreBM25:
+    """BM25Index 위의 MaxScore top-k 검색기"""
+
+    def __init__(self, index: BM25Index):
+        self.index = index
+        self.corpus_size = index.corpus_size
+
+    @property
+    def version(self):
+        return self.index.version
+
+    def _query_terms(self, query_tokens, allowed=None):
+        """
+        질의어별 (상한, 포스팅 문서, 포스팅 가중치) - 상한 오름차순
+
+        allowed(문서 수 길이 bool 배열)를 주면 허용 문서의 포스팅만 남기고
+        상한도 남은 포스팅 기준으로 다시 계산합니다.
+        """
+        counts = {}
+        for token in query_tokens:
+            term_id = self.index.terms.lookup(token)
+            if term_id is not None:
+                counts[term_id] = counts.get(term_id, 0) + 1
+
+        indptr = self.index.postings_indptr
+        terms = []
+        for term_id, count in counts.items():
+            start, end = indptr[term_id], indptr[term_id + 1]
+            if start == end:
+                continue
+            docs = self.index.postings_docs[start:end]
+            weights = self.index.postings_weights[start:end]
+            if allowed is None:
+                bound = float(self.index.term_max_weights[term_id])
+            else:
+                keep = allowed[docs]
+                docs, weights = docs[keep], weights[keep]
+                if docs.size == 0:
+                    continue
+                bound = float(weights.max())
+            terms.append((bound * count, docs, weights * count))
+
+        terms.sort(key=lambda term: term[0])
+        return terms
+
+    @staticmethod
+    def _gather_weights(docs, weights, candidates):
+        """정렬된 포스팅에서 후보 문서들의 가중치 조회 (없으면 0)"""
+        pos = np.minimum(np.searchsorted(docs, candidates), docs.size - 1)
+        hit = docs[pos] == candidates
+        return np.where(hit, weights[pos], 0.0)
+
+    def top_k(self, query_tokens, k, allowed=None):
+        """
+        BM25 상위 k개 문서 (allowed: 허용 문서 bool 배열, None이면 전체)
+
+        Returns:
+            (문서 위치 배열, 점수 배열) - 점수 내림차순, 동점은 앞쪽 위치 우선.
+            점수가 0보다 큰 문서가 k개보다 적으면 그만큼만 반환합니다 (sparse 백엔드와 같음).
+        """
+        terms = self._query_terms(query_tokens, allowed)
+        non_positive = [term for term in terms if term[0] <= 0]
+        terms = [term for term in terms if term[0] > 0]
+        if not terms or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=float)
+
+        # 1. 임계값 하한 (0 이하 가중치 용어가 있으면 단일 용어 가중치가 하한이 아니므로 생략)
+        threshold = 0.0
+        if not non_positive:
+            for _, docs, weights in terms:
+                if docs.size >= k:
+                    kth = np.partition(weights, docs.size - k)[docs.size - k]
+                    threshold = max(threshold, float(kth))
+
+        # 2. 필수/비필수 분리 (비필수 상한 합 < θ)
+        first_essential = 0
+        non_essential_bound = 0.0
+        while (first_essential < len(terms)
+               and non_essential_bound + terms[first_essential][0] < threshold):
+            non_essential_bound += terms[first_essential][0]
+            first_essential += 1
+
+        essential = terms[first_essential:]
+        non_essential = terms[:first_essential]
+
+        # 3. 필수 용어 포스팅 합집합 채점
+        candidates = np.unique(np.concatenate([docs for _, docs, _ in essential]))
+        scores = np.zeros(candidates.size)
+        for _, docs, weights in essential:
+            scores += self._gather_weights(docs, weights, candidates)
+
+        if non_essential:
+            survivors = scores + non_essential_bound >= threshold
+            candidates, scores = candidates[survivors], scores[survivors]
+            for _, docs, weights in non_essential:
+                scores += self._gather_weights(docs, weights, candidates)
+
+        for _, docs, weights in non_positive:
+            scores += self._gather_weights(docs, weights, candidates)
+        positive = scores > 0
+        candidates, scores = candidates[positive], scores[positive]
+
+        order = top_k_positions(scores, k)
+        return candidates[order].astype(np.int64), scores[order]
@@ -0,0 +1,82 @@
+"""
+희소 행렬 기반 BM25 점수 계산
+
+BM25Index의 포스팅 가중치(idf * tf 포화항)를 어휘 x 문서 CSR 행렬로 감싸
+질의 하나를 행 gather + 합 한 번으로 계산합니다. 질의어마다
+Python 루프를 도는 BM25Okapi.get_scores를 대체합니다.
+여러 질의는 (질의 x 어휘) 횟수 행렬과의 희소 행렬 곱 한 번으로 계산합니다.
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from src.retriever.bm25_index import BM25Index
+
+
+class SparseBM25:
+    """CSR 가중치 행렬 BM25 스코어러 (BM25Okapi.get_scores 호환)"""
+
+    def __init__(self, index: BM25Index):
+        self.index = index
+        self.corpus_size = index.corpus_size
+
+        # mmap 배열을 그대로 사용 (indptr/indices dtype이 같으면 복사하지 않음)
+        self.weight_matrix = csr_matrix(
+            (index.postings_weights, index.postings_docs, index.postings_indptr),
+            shape=(len(index.terms), index.corpus_size),
+            copy=False
+        )
+
+    @property
+    def version(self):
+        return self.index.version
+
+    def query_term_counts(self, query_tokens):
+        """질의 토큰 → (어휘 ID 배열, 등장 횟수 배열). 사전에 없는 토큰은 무시"""
+        term_ids = [self.index.terms.lookup(token) for token in query_tokens]
+        term_ids = [t for t in term_ids if t is not None]
+
+        if not term_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=float)
+
+        unique_ids, counts = np.unique(term_ids, return_counts=True)
+        return unique_ids, counts.astype(float)
+
+    def get_scores(self, query_tokens, positions=None):
+        """
+        모든 문서의 BM25 점수
+
+        positions를 주면 그 문서들의 점수만 (positions 순서) 계산합니다 (메타데이터 사전 필터).
+        """
+        term_ids, counts = self.query_term_counts(query_tokens)
+        n_scores = self.corpus_size if positions is None else len(positions)
+
+        if term_ids.size == 0:
+            return np.zeros(n_scores)
+
+        # 질의어 행만 모아 (중복 횟수만큼) 합산
+        rows = self.weight_matrix[term_ids]
+        if positions is not None:
+            rows = rows[:, positions]
+        return rows.T.dot(counts)
+
+    def get_scores_many(self, token_lists):
+        """
+        여러 질의의 BM25 점수 행렬 (질의 수 x 문서 수)
+
+        행마다 get_scores와 같은 순서(어휘 ID 오름차순)로 합산하므로 결과가 같습니다.
+        """
+        indptr = [0]
+        indices = []
+        data = []
+        for query_tokens in token_lists:
+            term_ids, counts = self.query_term_counts(query_tokens)
+            indices.extend(term_ids.tolist())
+            data.extend(counts.tolist())
+            indptr.append(len(indices))
+
+        query_matrix = csr_matrix(
+            (np.array(data, dtype=float), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(token_lists), len(self.index.terms))
+        )
+        return (query_matrix @ self.weight_matrix).toarray()
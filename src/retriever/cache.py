@@ -0,0 +1,83 @@
+"""
+검색 결과 캐시
+
+크기 제한(LRU 제거)과 TTL이 있는 스레드 안전 인메모리 캐시.
+히트/미스 횟수를 집계합니다.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 질의 정규화 (앞뒤/연속 공백만 정리, 검색 결과가 바뀌는 변환은 하지 않음)"""
+    return ' '.join(query.split())
+
+
+class LRUCache:
+    """LRU + TTL 캐시"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = None):
+        """
+        Args:
+            maxsize: 최대 항목 수 (0이면 캐시 비활성화)
+            ttl: 항목 유효 시간(초), None이면 만료 없음
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """조회 (히트 시 최근 사용으로 갱신)"""
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """저장 (가득 차면 가장 오래 쓰지 않은 항목 제거)"""
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """전체 삭제 (통계는 유지)"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """히트/미스 통계"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+        }
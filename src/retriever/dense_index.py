@@ -0,0 +1,363 @@
+"""
+프로세스 내 정확(brute-force) 임베딩 인덱스
+
+Chroma 컬렉션의 전체 청크 벡터를 한 번 .npy 행렬(float16/float32)과
+ID 목록으로 내보내고, 검색기는 np.load(mmap_mode='r')로 매핑합니다.
+질의는 행렬-벡터 곱(BLAS) 한 번과 argpartition으로 상위 k개를 찾습니다.
+
+거리는 Chroma와 같은 정의를 사용하므로 (l2: 제곱 거리, cosine/ip: 1 - 유사도)
+기존 1 / (1 + distance) 점수 변환을 그대로 쓸 수 있습니다.
+
+QuantizedDenseIndex는 같은 인덱스 위에 int8(차원별 스칼라) 또는 1비트(binary)
+코드만 메모리에 두고 1차 검색한 뒤, 상위 후보만 원본 float 행렬(mmap)로
+다시 채점합니다.
+"""
+
+import os
+import json
+import uuid
+import shutil
+from datetime import datetime
+
+import numpy as np
+
+from src.retriever.bm25_index import corpus_fingerprint
+from src.retriever.fusion import top_k_positions
+
+
+DENSE_INDEX_FORMAT_VERSION = 1
+
+# float16 / int8 행렬은 이 행 수 단위로 float32로 바꿔 BLAS 곱 (임시 블록이 캐시에 남는 크기)
+_BLOCK_ROWS = 4096
+_EXPORT_PAGE_SIZE = 5000
+
+QUANTIZATION_METHODS = ("int8", "binary")
+
+# numpy < 2.0에는 np.bitwise_count가 없으므로 바이트별 비트 수 표 사용
+_POPCOUNT_TABLE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def _popcount(bytes_array):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bytes_array)
+    return _POPCOUNT_TABLE[bytes_array]
+
+
+def _distances_from_dots(dots, sq_norms, query, space):
+    """내적과 문서 벡터 노름으로 Chroma 정의의 거리 계산"""
+    query_sq_norm = float(query @ query)
+
+    if space == 'l2':
+        return np.maximum(sq_norms + query_sq_norm - 2 * dots, 0)
+    elif space == 'cosine':
+        norms = np.sqrt(sq_norms) * np.sqrt(query_sq_norm)
+        return 1 - dots / np.maximum(norms, 1e-12)
+    elif space == 'ip':
+        return 1 - dots
+    else:
+        raise ValueError(f"Unknown distance space: {space}")
+
+
+class ExactDenseIndex:
+    """메모리 매핑 행렬 기반 전수 검색 인덱스"""
+
+    def __init__(self, vectors, sq_norms, ids, meta):
+        self.vectors = vectors
+        self.sq_norms = sq_norms
+        self.ids = ids
+        self.meta = meta
+        self.space = meta.get('space', 'l2')
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def version(self):
+        """인덱스 빌드 식별자 (재구축 시 바뀜)"""
+        return self.meta['build_id']
+
+    # === 구축 ===
+
+    @classmethod
+    def build(cls, ids, embeddings, dtype="float32", space="l2", extra_meta=None):
+        """ID 목록과 임베딩 행렬로 인덱스 생성"""
+        vectors = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32).astype(dtype))
+
+        # 저장 정밀도로 반올림된 벡터 기준으로 노름 계산 (거리 계산과 일관되게)
+        sq_norms = np.einsum('ij,ij->i', vectors.astype(np.float32), vectors.astype(np.float32))
+
+        meta = {
+            'format_version': DENSE_INDEX_FORMAT_VERSION,
+            'build_id': uuid.uuid4().hex,
+            'created_at': datetime.now().isoformat(),
+            'dtype': str(vectors.dtype),
+            'space': space,
+            'n_docs': len(ids),
+            'dim': int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+            'corpus_fingerprint': corpus_fingerprint(ids),
+        }
+        meta.update(extra_meta or {})
+
+        return cls(vectors=vectors, sq_norms=sq_norms, ids=list(ids), meta=meta)
+
+    @classmethod
+    def from_collection(cls, collection, dtype="float32", extra_meta=None):
+        """Chroma 컬렉션의 저장된 벡터를 페이지 단위로 읽어 인덱스 생성 (재임베딩 없음)"""
+        ids, embeddings = [], []
+        offset = 0
+        while True:
+            page = collection.get(include=['embeddings'], limit=_EXPORT_PAGE_SIZE, offset=offset)
+            if len(page['ids']) == 0:
+                break
+            ids.extend(page['ids'])
+            embeddings.append(np.asarray(page['embeddings'], dtype=np.float32))
+            offset += len(page['ids'])
+
+        space = (collection.metadata or {}).get('hnsw:space', 'l2')
+        matrix = np.concatenate(embeddings) if embeddings else np.empty((0, 0), dtype=np.float32)
+        return cls.build(ids, matrix, dtype=dtype, space=space, extra_meta=extra_meta)
+
+    # === 저장 / 로드 ===
+
+    def save(self, directory):
+        """디렉토리에 저장 (임시 디렉토리에 쓴 뒤 교체)"""
+        tmp_dir = f"{directory}.tmp-{uuid.uuid4().hex[:8]}"
+        os.makedirs(tmp_dir)
+
+        np.save(os.path.join(tmp_dir, "vectors.npy"), self.vectors)
+        np.save(os.path.join(tmp_dir, "sq_norms.npy"), self.sq_norms)
+
+        # 청크 ID에는 줄바꿈이 없으므로 한 줄에 하나씩 저장
+        with open(os.path.join(tmp_dir, "ids.txt"), 'w', encoding='utf-8') as f:
+            f.write("\n".join(self.ids))
+
+        with open(os.path.join(tmp_dir, "meta.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.replace(tmp_dir, directory)
+
+    @staticmethod
+    def read_meta(directory):
+        """메타데이터만 읽기 (없으면 None)"""
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """저장된 인덱스 로드 (기본: 메모리 매핑)"""
+        meta = cls.read_meta(directory)
+        if meta is None:
+            raise FileNotFoundError(f"임베딩 인덱스를 찾을 수 없습니다: {directory}")
+
+        if meta.get('format_version') != DENSE_INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f"임베딩 인덱스 버전 불일치: {meta.get('format_version')} "
+                f"(필요: {DENSE_INDEX_FORMAT_VERSION})"
+            )
+
+        mmap_mode = 'r' if mmap else None
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode=mmap_mode)
+        sq_norms = np.load(os.path.join(directory, "sq_norms.npy"), mmap_mode=mmap_mode)
+
+        with open(os.path.join(directory, "ids.txt"), encoding='utf-8') as f:
+            content = f.read()
+        ids = content.split("\n") if content else []
+
+        return cls(vectors=vectors, sq_norms=sq_norms, ids=ids, meta=meta)
+
+    # === 검색 ===
+
+    def _dot(self, query):
+        """모든 행과 질의 벡터의 내적 (float32 BLAS)"""
+        if self.vectors.dtype == np.float32:
+            return self.vectors @ query
+
+        dots = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(self.ids), _BLOCK_ROWS):
+            block = self.vectors[start:start + _BLOCK_ROWS].astype(np.float32)
+            dots[start:start + _BLOCK_ROWS] = block @ query
+        return dots
+
+    def distances(self, query_vector):
+        """모든 행까지의 거리 (Chroma 거리 정의와 동일)"""
+        query = np.asarray(query_vector, dtype=np.float32)
+        return _distances_from_dots(self._dot(query), self.sq_norms, query, self.space)
+
+    def row_distances(self, rows, query_vector):
+        """지정한 행까지의 거리 (mmap 행렬에서 해당 행만 읽음)"""
+        query = np.asarray(query_vector, dtype=np.float32)
+        dots = self.vectors[rows].astype(np.float32) @ query
+        return _distances_from_dots(dots, self.sq_norms[rows], query, self.space)
+
+    def row_vectors(self, rows):
+        """지정한 행의 벡터 (float32)"""
+        return np.asarray(self.vectors[rows], dtype=np.float32)
+
+    @property
+    def nbytes(self):
+        """벡터 행렬 + 노름 크기 (바이트)"""
+        return int(self.vectors.nbytes + self.sq_norms.nbytes)
+
+    def search(self, query_vector, k):
+        """
+        거리가 가까운 상위 k개
+
+        Returns:
+            (행 번호 배열, 거리 배열) - 거리 오름차순, 동점은 앞쪽 행 우선
+        """
+        distances = self.distances(query_vector)
+        rows = top_k_positions(-distances, k)
+        return rows.astype(np.int64), distances[rows].astype(float)
+
+
+class QuantizedDenseIndex:
+    """
+    양자화 코드 1차 검색 + 원본 float 재채점 인덱스
+
+    - int8: 차원별 최소/최대로 보정한 스칼라 양자화 (벡터당 dim 바이트)
+    - binary: 차원별 평균 기준 부호 비트 (벡터당 dim/8 바이트, 해밍 거리)
+
+    1차 검색으로 k * rescore_factor개 후보를 고른 뒤 base(ExactDenseIndex)의
+    float 벡터로 정확한 거리를 다시 계산하므로 반환 거리는 exact와 같은 정밀도입니다.
+    """
+
+    def __init__(self, base, method, codes, params, rescore_factor=10):
+        self.base = base
+        self.method = method
+        self.codes = codes
+        self.params = params
+        self.rescore_factor = rescore_factor
+        self.ids = base.ids
+        self.meta = base.meta
+        self.space = base.space
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def version(self):
+        return self.base.version
+
+    @property
+    def nbytes(self):
+        """메모리에 상주하는 코드 + 보정값 + 노름 크기 (바이트, float 행렬은 mmap)"""
+        return int(self.codes.nbytes + sum(p.nbytes for p in self.params.values()) + self.base.sq_norms.nbytes)
+
+    # === 구축 ===
+
+    @classmethod
+    def build(cls, base, method, rescore_factor=10):
+        """ExactDenseIndex의 벡터를 블록 단위로 읽어 양자화 코드 생성"""
+        if method not in QUANTIZATION_METHODS:
+            raise ValueError(f"Unknown quantization method: {method}")
+
+        vectors = base.vectors
+        n_docs, dim = vectors.shape
+
+        def blocks():
+            for start in range(0, n_docs, _BLOCK_ROWS):
+                yield start, vectors[start:start + _BLOCK_ROWS].astype(np.float32)
+
+        if method == "int8":
+            low = np.full(dim, np.inf, dtype=np.float32)
+            high = np.full(dim, -np.inf, dtype=np.float32)
+            for _, block in blocks():
+                low = np.minimum(low, block.min(axis=0))
+                high = np.maximum(high, block.max(axis=0))
+            scale = np.maximum(high - low, 1e-12) / 255
+
+            codes = np.empty((n_docs, dim), dtype=np.int8)
+            for start, block in blocks():
+                levels = np.rint((block - low) / scale) - 128
+                codes[start:start + len(block)] = np.clip(levels, -128, 127)
+            params = {'scale': scale, 'offset': low}
+        else:
+            total = np.zeros(dim, dtype=np.float64)
+            for _, block in blocks():
+                total += block.sum(axis=0)
+            threshold = (total / max(n_docs, 1)).astype(np.float32)
+
+            codes = np.empty((n_docs, (dim + 7) // 8), dtype=np.uint8)
+            for start, block in blocks():
+                codes[start:start + len(block)] = np.packbits(block > threshold, axis=1)
+            params = {'threshold': threshold}
+
+        return cls(base, method, codes, params, rescore_factor=rescore_factor)
+
+    # === 저장 / 로드 ===
+
+    def save(self, directory):
+        """base 인덱스 디렉토리에 코드 저장 (base build_id 기록)"""
+        np.save(os.path.join(directory, f"{self.method}_codes.npy"), self.codes)
+        np.savez(os.path.join(directory, f"{self.method}_params.npz"), **self.params)
+        with open(os.path.join(directory, f"{self.method}_meta.json"), 'w', encoding='utf-8') as f:
+            json.dump({'build_id': self.base.version, 'method': self.method}, f)
+
+    @classmethod
+    def load_or_build(cls, base, directory, method, rescore_factor=10):
+        """저장된 코드가 base와 같은 빌드면 로드, 아니면 생성 후 저장"""
+        meta_path = os.path.join(directory, f"{method}_meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('build_id') == base.version:
+                codes = np.load(os.path.join(directory, f"{method}_codes.npy"))
+                with np.load(os.path.join(directory, f"{method}_params.npz")) as params:
+                    params = {name: params[name] for name in params.files}
+                return cls(base, method, codes, params, rescore_factor=rescore_factor)
+
+        index = cls.build(base, method, rescore_factor=rescore_factor)
+        index.save(directory)
+        return index
+
+    # === 검색 ===
+
+    def row_distances(self, rows, query_vector):
+        """지정한 행까지의 정확한 거리 (float 벡터 사용)"""
+        return self.base.row_distances(rows, query_vector)
+
+    def row_vectors(self, rows):
+        """지정한 행의 float 벡터"""
+        return self.base.row_vectors(rows)
+
+    def approximate_scores(self, query_vector):
+        """
+        모든 행의 1차 점수 (클수록 가까움)
+
+        int8은 복원 벡터와의 거리(노름은 원본 값 사용), binary는 해밍 거리의 음수입니다.
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+
+        if self.method == "int8":
+            # q·v ≈ (q * scale)·codes + q·(128 * scale + offset)
+            scaled_query = query * self.params['scale']
+            constant = float(query @ (128 * self.params['scale'] + self.params['offset']))
+            dots = np.empty(len(self.ids), dtype=np.float32)
+            for start in range(0, len(self.ids), _BLOCK_ROWS):
+                block = self.codes[start:start + _BLOCK_ROWS].astype(np.float32)
+                dots[start:start + _BLOCK_ROWS] = block @ scaled_query
+            dots += constant
+            return -_distances_from_dots(dots, self.base.sq_norms, query, self.space)
+
+        query_bits = np.packbits(query > self.params['threshold'])
+        hamming = _popcount(self.codes ^ query_bits).sum(axis=1, dtype=np.int32)
+        return -hamming
+
+    def search(self, query_vector, k):
+        """
+        1차 검색 후보를 float 벡터로 재채점한 상위 k개
+
+        Returns:
+            (행 번호 배열, 거리 배열) - ExactDenseIndex.search와 같은 형식
+        """
+        shortlist = top_k_positions(self.approximate_scores(query_vector), k * self.rescore_factor)
+        # 재채점은 행 번호 순서로 읽어 동점 순서를 exact와 맞춤
+        shortlist = np.sort(shortlist)
+        distances = self.base.row_distances(shortlist, query_vector)
+        order = top_k_positions(-distances, k)
+        return shortlist[order].astype(np.int64), distances[order].astype(float)
@@ -0,0 +1,180 @@
+"""
+Hybrid 검색 점수 결합
+
+모든 점수는 문서 위치(self.doc_ids의 인덱스)를 기준으로 한
+NumPy 배열로 다룹니다. 문서 ID dict, 전체 정렬, list.index() 없이
+벡터 연산 몇 번으로 결합과 상위 k개 선택을 끝냅니다.
+"""
+
+import numpy as np
+
+
+def min_max_normalize(scores):
+    """0~1 범위로 정규화"""
+    scores = np.asarray(scores, dtype=float)
+    if scores.size == 0:
+        return scores
+
+    min_score = scores.min()
+    max_score = scores.max()
+
+    if max_score == min_score:
+        return np.full_like(scores, 0.5, dtype=float)
+
+    return (scores - min_score) / (max_score - min_score)
+
+
+def scatter_topk_bm25_scores(n_docs, positions, scores):
+    """
+    BM25 상위 후보 점수만 있을 때의 전체 문서 정규화 점수
+
+    후보 밖 문서는 0점으로 간주합니다. BM25 점수는 0 이상이고 질의어가 없는
+    문서가 하나라도 있으면 전체 최솟값이 0이므로, 전체 문서 min-max 정규화와
+    같은 결과가 됩니다. 겹치는 문서가 없으면 기존과 같이 모두 0.5입니다.
+    """
+    if len(positions) == 0:
+        return np.full(n_docs, 0.5, dtype=float)
+
+    bm25_normalized = np.zeros(n_docs, dtype=float)
+    max_score = scores.max()
+    if max_score > 0:
+        bm25_normalized[positions] = scores / max_score
+    return bm25_normalized
+
+
+def scatter_dense_scores(n_docs, positions, raw_scores):
+    """
+    임베딩 검색 결과를 전체 문서 길이의 배열로 펼치기
+
+    Args:
+        n_docs: 전체 문서 수
+        positions: 임베딩 검색으로 찾은 문서 위치 배열
+        raw_scores: 위치별 원본 유사도 (1 / (1 + distance))
+
+    Returns:
+        정규화된 임베딩 점수 배열 (검색되지 않은 문서는 0)
+    """
+    embed_scores = np.zeros(n_docs, dtype=float)
+    positions = np.asarray(positions, dtype=np.int64)
+
+    if positions.size == 0:
+        return embed_scores
+
+    # 같은 위치가 여러 번 나오면 마지막 값이 남음 (기존 dict 동작과 동일)
+    embed_scores[positions] = raw_scores
+    unique_positions = np.unique(positions)
+    embed_scores[unique_positions] = min_max_normalize(embed_scores[unique_positions])
+
+    return embed_scores
+
+
+def fuse_scores(bm25_normalized, embed_scores, alpha):
+    """BM25/임베딩 점수 가중합 (alpha: 임베딩 가중치)"""
+    return (1 - alpha) * bm25_normalized + alpha * embed_scores
+
+
+def top_k_positions(scores, k):
+    """
+    argpartition으로 상위 k개 위치 선택
+
+    동점은 앞쪽 위치가 먼저 오도록 정렬해 기존 sorted(..., reverse=True)
+    결과와 같은 순서를 유지합니다.
+    """
+    scores = np.asarray(scores)
+    n = scores.size
+    k = min(k, n)
+
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        kth_score = scores[candidates].min()
+
+        # 경계 점수의 동점은 위치 순서대로 채움
+        above = np.flatnonzero(scores > kth_score)
+        tied = np.flatnonzero(scores == kth_score)[:k - above.size]
+        candidates = np.concatenate([above, tied])
+    else:
+        candidates = np.arange(n)
+
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+def rrf_fuse(rankings, weights=None, k=60):
+    """
+    Reciprocal Rank Fusion
+
+    각 검색기의 순위만 사용하므로 전체 문서 정규화가 필요 없고,
+    후보 수 크기의 배열만 다룹니다.
+
+    Args:
+        rankings: 검색기별 순위순 문서 위치 배열 리스트
+        weights: 검색기별 가중치 (None이면 모두 1)
+        k: RRF 상수 (점수 = sum(weight / (k + rank)), rank는 1부터)
+
+    Returns:
+        (문서 위치 배열 - 오름차순, RRF 점수 배열)
+    """
+    if weights is None:
+        weights = [1.0] * len(rankings)
+
+    positions, contributions = [], []
+    for ranking, weight in zip(rankings, weights):
+        ranking = np.asarray(ranking, dtype=np.int64)
+        # 같은 위치가 여러 번 나오면 가장 높은 순위만 사용
+        _, first = np.unique(ranking, return_index=True)
+        ranking = ranking[np.sort(first)]
+        positions.append(ranking)
+        contributions.append(weight / (k + np.arange(1, ranking.size + 1)))
+
+    if not positions:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=float)
+
+    unique, inverse = np.unique(np.concatenate(positions), return_inverse=True)
+    scores = np.bincount(inverse, weights=np.concatenate(contributions), minlength=unique.size)
+    return unique, scores
+
+
+def mmr_select(relevance, embeddings, k, lambda_mult=0.7):
+    """
+    Maximal Marginal Relevance 후보 선택
+
+    후보 간 코사인 유사도 행렬을 한 번 계산한 뒤, 매 단계 이미 고른 후보와의
+    최대 유사도 배열만 갱신합니다 (단계마다 후보 수 크기의 벡터 연산).
+
+    Args:
+        relevance: 후보별 관련도 (클수록 관련)
+        embeddings: 후보별 임베딩 벡터 (n x dim)
+        k: 선택할 후보 수
+        lambda_mult: 관련도 가중치 (1이면 관련도 순, 0이면 다양성만)
+
+    Returns:
+        선택된 후보 인덱스 배열 (선택 순서, 동점은 앞쪽 후보 우선)
+    """
+    relevance = np.asarray(relevance, dtype=float)
+    n = relevance.size
+    k = min(k, n)
+
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    similarity = vectors @ vectors.T
+
+    selected = np.empty(k, dtype=np.int64)
+    selected[0] = np.argmax(relevance)
+    max_similarity = similarity[:, selected[0]].astype(float)
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+
+    for i in range(1, k):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        selected[i] = np.argmax(scores)
+        available[selected[i]] = False
+        max_similarity = np.maximum(max_similarity, similarity[:, selected[i]])
+
+    return selected
@@ -0,0 +1,293 @@
+"""
+컬럼형 메타데이터 저장소
+
+청크마다 dict를 두면 같은 발주 기관/파일명/날짜 문자열이 청크 수만큼 반복됩니다.
+필드별로 정수 코드 배열(int32, 없는 필드는 -1)과 고유 값 테이블 하나만 두고,
+dict는 최종 결과(top-k)를 만들 때만 생성합니다.
+
+코드 배열은 그대로 벡터화 필터(mask)에 사용하고, 필드별 값 → 문서 위치 배열
+(코드 순 정렬 + 오프셋) 역색인은 검색 전 필터(prepare_filter)에 사용합니다.
+역색인은 검색기 시작 시 METADATA_FILTER_FIELDS 필드만 미리 만들고,
+나머지 필드는 처음 필터할 때 만듭니다.
+
+고유 값은 (타입, 값)으로 구분합니다 (1, 1.0, True가 같은 코드를 쓰지 않음).
+"""
+
+import sys
+import json
+
+import numpy as np
+
+
+MISSING_CODE = -1
+
+# 필터 조건 연산자 (값 테이블의 고유 값마다 평가, 날짜는 ISO 문자열 비교)
+# 필터 전체에는 Chroma where와 같은 {"$and": [...]} / {"$or": [...]} 조합도 쓸 수 있습니다.
+_OPERATORS = {
+    '$eq': lambda value, operand: value == operand,
+    '$ne': lambda value, operand: value != operand,
+    '$in': lambda value, operand: value in operand,
+    '$nin': lambda value, operand: value not in operand,
+    '$gt': lambda value, operand: value > operand,
+    '$gte': lambda value, operand: value >= operand,
+    '$lt': lambda value, operand: value < operand,
+    '$lte': lambda value, operand: value <= operand,
+}
+
+
+def filter_key(conditions):
+    """필터 조건의 정규화 문자열 (결과 캐시 키용)"""
+    return json.dumps(conditions, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class MetadataFilter:
+    """
+    준비된 메타데이터 필터
+    
+    positions: 조건을 모두 만족하는 문서 위치 (오름차순 int64)
+    where: 같은 조건의 Chroma where (필드 조건은 만족하는 고유 값 $in으로 변환)
+    key: 결과 캐시 키에 넣을 정규화 문자열
+    """
+
+    def __init__(self, conditions, positions, where, n_docs):
+        self.conditions = conditions
+        self.positions = positions
+        self.where = where
+        self.n_docs = n_docs
+        self.key = filter_key(conditions)
+        self._mask = None
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def mask(self):
+        """허용 문서 bool 배열 (문서 수 길이, 처음 사용할 때 생성)"""
+        if self._mask is None:
+            mask = np.zeros(self.n_docs, dtype=bool)
+            mask[self.positions] = True
+            self._mask = mask
+        return self._mask
+
+    def chroma_where(self):
+        """같은 조건의 Chroma where (필드별 허용 값 $in, $and / $or 구조는 그대로)"""
+        return self.where
+
+
+class MetadataStore:
+    """사전 인코딩 메타데이터 컬럼 (위치 i → dict는 store[i])"""
+
+    def __init__(self, columns, n_docs):
+        """
+        Args:
+            columns: {필드: (코드 배열, 고유 값 목록)} (필드 순서 = dict 키 순서)
+            n_docs: 문서 수
+        """
+        self.columns = columns
+        self.n_docs = n_docs
+        self._value_codes = {}
+        self._field_postings = {}
+
+    def __len__(self):
+        return self.n_docs
+
+    @property
+    def fields(self):
+        return list(self.columns)
+
+    def __getitem__(self, i):
+        """위치 i의 메타데이터 dict (호출할 때마다 새로 생성)"""
+        metadata = {}
+        for field, (codes, values) in self.columns.items():
+            code = codes[i]
+            if code != MISSING_CODE:
+                metadata[field] = values[code]
+        return metadata
+
+    def get(self, i, field, default=None):
+        """위치 i의 한 필드 값 (dict 생성 없음)"""
+        column = self.columns.get(field)
+        if column is None:
+            return default
+        codes, values = column
+        code = codes[i]
+        return default if code == MISSING_CODE else values[code]
+
+    def to_dicts(self):
+        """전체 dict 목록 (이전 list 형식이 필요할 때)"""
+        return [self[i] for i in range(self.n_docs)]
+
+    # === 벡터화 필터 ===
+
+    def codes(self, field):
+        """필드의 코드 배열 (필드가 없으면 전부 MISSING_CODE)"""
+        column = self.columns.get(field)
+        if column is None:
+            return np.full(self.n_docs, MISSING_CODE, dtype=np.int32)
+        return column[0]
+
+    def values(self, field):
+        """필드의 고유 값 목록 (코드 순서)"""
+        column = self.columns.get(field)
+        return [] if column is None else column[1]
+
+    def code_of(self, field, value):
+        """값의 코드 (없는 값이면 None, 타입이 다르면 같은 값으로 보지 않음)"""
+        if field not in self._value_codes:
+            self._value_codes[field] = {
+                (type(v), v): code for code, v in enumerate(self.values(field))
+            }
+        return self._value_codes[field].get((type(value), value))
+
+    def mask(self, field, values):
+        """field 값이 values 중 하나인 문서의 bool 배열"""
+        if isinstance(values, (str, int, float)):
+            values = [values]
+        codes = [self.code_of(field, value) for value in values]
+        codes = [code for code in codes if code is not None]
+        if not codes:
+            return np.zeros(self.n_docs, dtype=bool)
+        return np.isin(self.codes(field), codes)
+
+    def _postings(self, field):
+        """필드의 (코드 순으로 정렬한 문서 위치, 코드별 시작 오프셋) - 처음 호출 시 생성"""
+        if field not in self._field_postings:
+            codes = self.codes(field)
+            order = np.argsort(codes, kind='stable')
+            indptr = np.zeros(len(self.values(field)) + 2, dtype=np.int64)
+            np.cumsum(np.bincount(codes.astype(np.int64) + 1, minlength=len(indptr) - 1), out=indptr[1:])
+            self._field_postings[field] = (order, indptr)
+        return self._field_postings[field]
+
+    def positions_of(self, field, codes):
+        """코드 중 하나를 가진 문서 위치 (오름차순)"""
+        order, indptr = self._postings(field)
+        parts = [order[indptr[code + 1]:indptr[code + 2]] for code in codes]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts)).astype(np.int64)
+
+    def matching_codes(self, field, condition):
+        """
+        조건을 만족하는 고유 값 코드
+        
+        condition: 값 / 값 목록 / {"$gte": ..., "$lte": ..., "$in": [...], ...} (모두 만족)
+        """
+        if isinstance(condition, dict):
+            unknown = [op for op in condition if op not in _OPERATORS]
+            if unknown:
+                raise ValueError(f"Unknown filter operator: {unknown}")
+            predicates = [(_OPERATORS[op], operand) for op, operand in condition.items()]
+        elif isinstance(condition, (list, tuple, set)):
+            predicates = [(_OPERATORS['$in'], list(condition))]
+        else:
+            predicates = [(_OPERATORS['$eq'], condition)]
+
+        def matches(value):
+            try:
+                return all(predicate(value, operand) for predicate, operand in predicates)
+            except TypeError:
+                return False
+
+        return [code for code, value in enumerate(self.values(field)) if matches(value)]
+
+    def prepare_filter(self, conditions):
+        """
+        필터 조건 → MetadataFilter
+        
+        conditions: {필드: 조건, ...} (모든 필드 AND), 또는 Chroma where와 같은
+        {"$and": [조건, ...]} / {"$or": [조건, ...]} (중첩 가능)
+        
+        조건은 고유 값 테이블에서만 평가하고, 허용 위치는 값별 위치 배열을 합쳐 구합니다
+        (문서 수만큼 순회하지 않음).
+        """
+        positions, where = self._evaluate(conditions)
+        if positions is None:
+            positions = np.arange(self.n_docs, dtype=np.int64)
+        return MetadataFilter(conditions, positions, where, self.n_docs)
+
+    def _evaluate(self, conditions):
+        """조건 → (허용 위치 또는 None(제한 없음), Chroma where 또는 None)"""
+        positions = None
+        clauses = []
+        for field, condition in conditions.items():
+            if field in ('$and', '$or'):
+                if not isinstance(condition, (list, tuple)) or not condition:
+                    raise ValueError(f"{field} filter needs a non-empty list of conditions")
+                field_positions, clause = self._combine(field, condition)
+            elif field.startswith('$'):
+                raise ValueError(f"Unsupported filter operator: {field} (지원: $and, $or)")
+            else:
+                codes = self.matching_codes(field, condition)
+                values = self.values(field)
+                field_positions = self.positions_of(field, codes)
+                clause = {field: {'$in': [values[code] for code in codes]}}
+            
+            if clause is not None:
+                clauses.append(clause)
+            if field_positions is not None:
+                positions = field_positions if positions is None else np.intersect1d(
+                    positions, field_positions, assume_unique=True
+                )
+        return positions, self._join_where('$and', clauses)
+
+    def _combine(self, operator, conditions):
+        """$and / $or 하위 조건 결합 → (허용 위치 또는 None, Chroma where 또는 None)"""
+        results = [self._evaluate(condition) for condition in conditions]
+        if operator == '$or':
+            if any(positions is None for positions, _ in results):
+                return None, None
+            positions = results[0][0]
+            for other, _ in results[1:]:
+                positions = np.union1d(positions, other)
+            # 만족하는 문서가 없는 분기는 Chroma where에서 제외 (빈 $in은 Chroma가 거부)
+            clauses = [where for other, where in results if len(other) > 0]
+            return positions, self._join_where('$or', clauses)
+        
+        positions = None
+        for other, _ in results:
+            if other is not None:
+                positions = other if positions is None else np.intersect1d(
+                    positions, other, assume_unique=True
+                )
+        return positions, self._join_where('$and', [where for _, where in results if where is not None])
+
+    @staticmethod
+    def _join_where(operator, clauses):
+        """Chroma where 절 목록 결합 (Chroma의 $and / $or는 두 개 이상일 때만 사용)"""
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {operator: clauses}
+
+    def build_filter_index(self, fields):
+        """필드별 값 → 위치 배열 역색인 미리 생성 (없는 필드는 건너뜀). 생성한 필드 목록 반환"""
+        built = [field for field in fields if field in self.columns]
+        for field in built:
+            self._postings(field)
+        return built
+
+    # === 생성 / 크기 ===
+
+    @classmethod
+    def from_dicts(cls, metadatas):
+        """dict 목록 → 컬럼 (고유 값은 처음 나온 순서)"""
+        metadatas = [metadata or {} for metadata in metadatas]
+        fields = list(dict.fromkeys(key for metadata in metadatas for key in metadata))
+        columns = {}
+        for field in fields:
+            value_codes = {}
+            codes = np.full(len(metadatas), MISSING_CODE, dtype=np.int32)
+            for i, metadata in enumerate(metadatas):
+                if field in metadata:
+                    value = metadata[field]
+                    codes[i] = value_codes.setdefault((type(value), value), len(value_codes))
+            columns[field] = (codes, [value for _, value in value_codes])
+        return cls(columns, len(metadatas))
+
+    def nbytes(self):
+        """코드 배열 + 고유 값 테이블 메모리 (바이트, 대략)"""
+        total = 0
+        for field, (codes, values) in self.columns.items():
+            total += codes.nbytes + sys.getsizeof(field) + sys.getsizeof(values)
+            total += sum(sys.getsizeof(value) for value in values)
+        return total
@@ -0,0 +1,171 @@
+"""
+Re-ranker 백엔드
+
+- torch: sentence-transformers CrossEncoder (fp32 PyTorch, 기존 동작)
+- onnx_int8: 같은 모델을 한 번 ONNX로 내보내고 동적 int8 양자화한 뒤
+  onnxruntime CPU 세션으로 실행 (내보낸 모델은 모델 이름별 하위 폴더에 저장)
+
+두 백엔드 모두 predict(pairs) → 쌍별 점수 배열 인터페이스를 가지므로
+RAGRetriever._rerank는 백엔드를 구분하지 않습니다.
+"""
+
+import os
+import re
+import json
+
+import numpy as np
+
+
+_INT8_MODEL_FILE = "model_int8.onnx"
+_FP32_MODEL_FILE = "model_fp32.onnx"
+_EXPORT_META_FILE = "export_meta.json"
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class OnnxCrossEncoder:
+    """동적 int8 양자화 ONNX Cross-Encoder (CPU)"""
+
+    def __init__(self, model_name: str, export_dir: str, max_length: int = 512, batch_size: int = 32):
+        """
+        Args:
+            model_name: Hugging Face 모델 이름 (예: BAAI/bge-reranker-base)
+            export_dir: ONNX 모델/토크나이저 저장 상위 위치 (모델별 하위 폴더, 없으면 최초 1회 내보내기)
+            max_length: 쌍 최대 토큰 길이
+            batch_size: 추론 배치 크기
+        """
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.export_dir = export_dir = onnx_export_path(export_dir, model_name)
+        self.max_length = max_length
+        self.batch_size = batch_size
+
+        # 다른 모델을 내보낸 폴더이거나 내보내기가 중간에 끝났으면 다시 내보내기
+        model_path = os.path.join(export_dir, _INT8_MODEL_FILE)
+        if _read_export_model(export_dir) != model_name or not os.path.exists(model_path):
+            self._export(model_name, export_dir, max_length)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    @staticmethod
+    def _export(model_name, export_dir, max_length):
+        """PyTorch 모델을 ONNX로 내보내고 가중치를 int8로 동적 양자화"""
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        print(f"⏳ Re-ranker ONNX 내보내기: {model_name} → {export_dir}")
+        os.makedirs(export_dir, exist_ok=True)
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+
+        dummy = tokenizer(
+            ["질의"], ["문서"], padding=True, truncation=True,
+            max_length=max_length, return_tensors="pt"
+        )
+        input_names = list(dummy.keys())
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+
+        fp32_path = os.path.join(export_dir, _FP32_MODEL_FILE)
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(dummy[name] for name in input_names),
+                fp32_path,
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+            )
+
+        tmp_path = os.path.join(export_dir, f"{_INT8_MODEL_FILE}.tmp")
+        quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, os.path.join(export_dir, _INT8_MODEL_FILE))
+        os.remove(fp32_path)
+
+        tokenizer.save_pretrained(export_dir)
+
+        # 모든 파일을 쓴 뒤 마지막에 기록 (이 파일이 있어야 완성된 내보내기로 인정)
+        with open(os.path.join(export_dir, _EXPORT_META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"model_name": model_name}, f, ensure_ascii=False)
+        print("✅ Re-ranker ONNX int8 변환 완료")
+
+    def predict(self, pairs, batch_size=None):
+        """
+        (query, document) 쌍 점수 계산
+
+        CrossEncoder(num_labels=1)와 같이 logit에 sigmoid를 적용합니다.
+        패딩을 줄이기 위해 길이순으로 묶어 추론한 뒤 원래 순서로 되돌립니다.
+        """
+        if len(pairs) == 0:
+            return np.empty(0, dtype=np.float32)
+
+        batch_size = batch_size or self.batch_size
+        order = np.argsort([len(query) + len(doc) for query, doc in pairs], kind="stable")
+        scores = np.empty(len(pairs), dtype=np.float32)
+
+        for start in range(0, len(pairs), batch_size):
+            batch = order[start:start + batch_size]
+            features = self.tokenizer(
+                [pairs[i][0] for i in batch],
+                [pairs[i][1] for i in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            feed = {name: features[name].astype(np.int64) for name in self.input_names}
+            logits = self.session.run(None, feed)[0]
+            scores[batch] = _sigmoid(logits[:, 0])
+
+        return scores
+
+
+def onnx_export_path(export_dir, model_name):
+    """모델별 ONNX 저장 폴더 (예: .cache/reranker_onnx/BAAI_bge-reranker-base)"""
+    return os.path.join(export_dir, re.sub(r"[^A-Za-z0-9._-]+", "_", model_name))
+
+
+def _read_export_model(export_dir):
+    """내보낸 모델 이름 (기록이 없으면 None)"""
+    try:
+        with open(os.path.join(export_dir, _EXPORT_META_FILE), encoding="utf-8") as f:
+            return json.load(f).get("model_name")
+    except (OSError, ValueError):
+        return None
+
+
+def create_reranker(config):
+    """RAGConfig.RERANKER_BACKEND에 맞는 Re-ranker 생성"""
+    backend = config.RERANKER_BACKEND
+
+    if backend == "torch":
+        from sentence_transformers import CrossEncoder
+        return CrossEncoder(config.RERANKER_MODEL_NAME)
+    elif backend == "onnx_int8":
+        return OnnxCrossEncoder(
+            config.RERANKER_MODEL_NAME,
+            export_dir=config.RERANKER_ONNX_DIRECTORY,
+            max_length=config.RERANKER_MAX_LENGTH,
+        )
+    else:
+        raise ValueError(f"Unknown reranker backend: {backend}")
+
+
+def reranker_signature(config):
+    """점수 캐시 키용 (모델, 백엔드) 식별자 - int8 점수는 fp32와 다르므로 분리"""
+    return f"{config.RERANKER_MODEL_NAME}:{config.RERANKER_BACKEND}"
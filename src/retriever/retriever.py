@@ -1,79 +1,901 @@
 from langchain_chroma import Chroma
-from langchain_openai.embeddings import OpenAIEmbeddings
 from langsmith import traceable
 import time
 import os
-from rank_bm25 import BM25Okapi
+import asyncio
+import copy
+import hashlib
+import functools
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from sentence_transformers import CrossEncoder
 
 from src.utils.config import RAGConfig
+from src.embedding.embedding_provider import (
+    create_embeddings,
+    check_collection_embedding,
+    embedding_signature,
+    embed_queries,
+)
+from src.retriever.bm25_index import BM25Index, corpus_fingerprint
+from src.retriever.bm25_sparse import SparseBM25
+from src.retriever.bm25_maxscore import MaxScoreBM25
+from src.retriever.snapshot import RetrieverSnapshot
+from src.retriever.metadata_store import MetadataStore, MetadataFilter, filter_key
+from src.retriever.text_store import TextStore
+from src.retriever.dense_index import ExactDenseIndex, QuantizedDenseIndex, QUANTIZATION_METHODS
+from src.retriever.tokenizer import get_tokenizer, tokenize_corpus, QueryTokenizer
+from src.retriever.cache import LRUCache, normalize_query
+from src.retriever.reranker import create_reranker, reranker_signature
+from src.retriever.fusion import (
+    min_max_normalize,
+    scatter_topk_bm25_scores,
+    scatter_dense_scores,
+    fuse_scores,
+    top_k_positions,
+    rrf_fuse,
+    mmr_select,
+)
+
+
+# ===== 지연 초기화 구성 요소 =====
+# 구성 요소 → (초기화 메서드, 먼저 초기화해야 하는 구성 요소)
+_COMPONENTS = {
+    'embeddings': ('_initialize_embeddings', ()),
+    'vectorstore': ('_create_vectorstore', ('embeddings',)),
+    'bm25': ('_initialize_bm25', ('vectorstore',)),
+    'dense_index': ('_initialize_dense_index', ('bm25',)),
+    'reranker': ('_initialize_reranker', ()),
+}
+
+# 속성 → 그 속성을 만드는 구성 요소 (처음 접근할 때 초기화)
+# 문서 상태(BM25 / 임베딩 인덱스)는 _CorpusState로 묶어 아래 프로퍼티로 노출합니다.
+_LAZY_ATTRIBUTES = {
+    'embeddings': 'embeddings',
+    'vectorstore': 'vectorstore',
+    'reranker': 'reranker',
+}
+
+
+class _DenseState:
+    """임베딩 인덱스와 인덱스 행 ↔ 문서 위치 변환 (index가 None이면 Chroma만 사용)"""
+
+    def __init__(self, index=None, row_positions=None, position_rows=None):
+        self.index = index
+        self.row_positions = row_positions
+        self.position_rows = position_rows
+
+
+class _CorpusState:
+    """
+    BM25 구성 요소의 문서 상태 (한 번에 만들어 통째로 교체)
+    
+    검색 한 번은 처음 읽은 상태 객체만 사용하므로, 인덱스 재로드 중에도 문서 목록과
+    BM25 / 임베딩 인덱스가 서로 다른 버전으로 섞이지 않습니다.
+    dense는 이 상태에 맞춘 임베딩 인덱스로, 처음 필요할 때 한 번만 채웁니다.
+    """
+
+    def __init__(self, tokenizer, index_files_mtime, doc_ids, doc_texts, doc_metadatas, bm25_index):
+        self.tokenizer = tokenizer
+        self.tokenize_query = QueryTokenizer(tokenizer)
+        self.index_files_mtime = index_files_mtime
+        self.doc_ids = doc_ids
+        self.doc_texts = doc_texts
+        self.doc_metadatas = doc_metadatas
+        self.id_to_position = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        self.bm25_index = bm25_index
+        self.bm25 = SparseBM25(bm25_index)
+        self.bm25_topk = MaxScoreBM25(bm25_index)
+        self.dense = None
+
+
+def _corpus_property(name):
+    return property(lambda self: getattr(self._corpus_state(), name))
+
+
+def _dense_property(name):
+    return property(lambda self: getattr(self._dense_state(), name))
+
+
+def _pinned_state(method):
+    """
+    검색 진입점 데코레이터: 호출 하나(작업 스레드 포함)가 같은 _CorpusState만 보도록 고정
+    
+    상태는 처음 읽을 때 고정하므로 BM25가 필요 없는 검색은 BM25를 초기화하지 않습니다.
+    """
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            token = self._pin.set([None]) if self._pin.get() is None else None
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                if token is not None:
+                    self._pin.reset(token)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        token = self._pin.set([None]) if self._pin.get() is None else None
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            if token is not None:
+                self._pin.reset(token)
+    return wrapper
 
 
 class RAGRetriever:
-    """RAG 검색 시스템 (Hybrid Search + Re-ranker)"""
+    """
+    RAG 검색 시스템 (Hybrid Search + Re-ranker)
+    
+    임베딩 클라이언트 / ChromaDB / BM25 / 임베딩 인덱스 / Re-ranker는 처음 사용할 때
+    초기화합니다 (구성 요소별 잠금으로 스레드 안전). RETRIEVER_WARMUP에 따라
+    생성 직후 백그라운드로 미리 초기화하거나, warmup()으로 직접 초기화할 수 있습니다.
+    
+    문서 목록 / BM25 / 임베딩 인덱스는 _CorpusState 하나로 만들어 교체하고,
+    검색 진입점(@_pinned_state)은 호출 동안 한 상태만 사용합니다.
+    """
+
+    # ===== 문서 상태 (현재 검색에 고정된 _CorpusState) =====
+    tokenizer = _corpus_property('tokenizer')
+    tokenize_query = _corpus_property('tokenize_query')
+    doc_ids = _corpus_property('doc_ids')
+    doc_texts = _corpus_property('doc_texts')
+    doc_metadatas = _corpus_property('doc_metadatas')
+    id_to_position = _corpus_property('id_to_position')
+    bm25_index = _corpus_property('bm25_index')
+    bm25 = _corpus_property('bm25')
+    bm25_topk = _corpus_property('bm25_topk')
+    dense_index = _dense_property('index')
+    dense_row_positions = _dense_property('row_positions')
+    dense_position_rows = _dense_property('position_rows')
 
     def __init__(self, config: RAGConfig = None):
         self.config = config or RAGConfig()
-        self.vectorstore = None
-        self.embeddings = None
+        self._ready = set()
+        self._component_locks = {name: threading.RLock() for name in _COMPONENTS}
+        self.init_timings = {}
+        self.reranker_id = reranker_signature(self.config)
+        self._index_lock = threading.Lock()
+        self._corpus = None
+        self._pin = contextvars.ContextVar(f"retriever_state_{id(self)}", default=None)
+        self.query_cache = LRUCache(
+            maxsize=self.config.QUERY_CACHE_SIZE,
+            ttl=self.config.QUERY_CACHE_TTL
+        )
+        self.rerank_cache = LRUCache(maxsize=self.config.RERANK_CACHE_SIZE)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.RETRIEVER_WORKERS,
+            thread_name_prefix="retriever"
+        )
 
-        self._initialize_embeddings()
-        self._create_vectorstore()
-        self._initialize_bm25()
-        self._initialize_reranker()
+        warmup = self.config.RETRIEVER_WARMUP
+        if warmup == "eager":
+            self.warmup()
+        elif warmup == "background":
+            self.warmup(background=True)
+        elif warmup != "lazy":
+            raise ValueError(f"Unknown retriever warmup: {warmup}")
 
-    def _initialize_embeddings(self):
-        """임베딩 모델 초기화"""
-        os.environ["OPENAI_API_KEY"] = self.config.OPENAI_API_KEY
+    def __getattr__(self, name):
+        """아직 초기화하지 않은 구성 요소의 속성에 처음 접근하면 그 구성 요소를 초기화"""
+        component = _LAZY_ATTRIBUTES.get(name)
+        if component is None or component in self.__dict__.get('_ready', ()):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self._ensure_component(component)
+        return object.__getattribute__(self, name)
 
-        self.embeddings = OpenAIEmbeddings(
-            model=self.config.EMBEDDING_MODEL_NAME
-        )
+    def _ensure_component(self, component):
+        """구성 요소를 한 번만 초기화 (의존하는 구성 요소 먼저, 동시 호출은 잠금으로 대기)"""
+        if component in self._ready:
+            return
+        
+        with self._component_locks[component]:
+            if component in self._ready:
+                return
+            method, requires = _COMPONENTS[component]
+            for dependency in requires:
+                self._ensure_component(dependency)
+            
+            start = time.perf_counter()
+            getattr(self, method)()
+            self.init_timings[component] = time.perf_counter() - start
+            self._ready.add(component)
+
+    def warmup(self, components=None, background=False):
+        """
+        구성 요소 미리 초기화
+        
+        Args:
+            components: 초기화할 구성 요소 이름 목록 (None이면 전체)
+            background: True면 검색기 스레드 풀에서 실행하고 Future 반환
+        
+        Returns:
+            {구성 요소: 초기화 시간(초)} (background=True면 그 값을 담은 Future)
+        """
+        components = list(components or _COMPONENTS)
+        unknown = [name for name in components if name not in _COMPONENTS]
+        if unknown:
+            raise ValueError(f"Unknown retriever components: {unknown}")
+        
+        if background:
+            future = self._executor.submit(self.warmup, components)
+            future.add_done_callback(self._report_warmup_error)
+            return future
+        
+        for component in components:
+            self._ensure_component(component)
+        return {name: self.init_timings[name] for name in components if name in self.init_timings}
+
+    @staticmethod
+    def _report_warmup_error(future):
+        """백그라운드 초기화 실패 알림 (같은 오류는 실제 사용 시점에 다시 발생)"""
+        error = future.exception()
+        if error is not None:
+            print(f"⚠️ 검색기 백그라운드 초기화 실패: {error}")
+
+    def is_ready(self, component):
+        """구성 요소가 이미 초기화되었는지 여부"""
+        return component in self._ready
+
+    def _corpus_state(self):
+        """현재 검색에 고정된 문서 상태 (아직 고정 전이면 최신 상태를 고정, 필요하면 BM25 초기화)"""
+        pin = self._pin.get()
+        if pin is not None and pin[0] is not None:
+            return pin[0]
+        self._ensure_component('bm25')
+        corpus = self._corpus
+        if pin is not None:
+            pin[0] = corpus
+        return corpus
+
+    def _dense_state(self):
+        """고정된 문서 상태의 임베딩 인덱스 (처음 사용할 때 초기화)"""
+        corpus = self._corpus_state()
+        if corpus.dense is None:
+            self._ensure_component('dense_index')
+        if corpus.dense is None:
+            # 검색 도중 재로드되어 고정된 이전 상태에는 아직 인덱스가 없음
+            with self._component_locks['dense_index']:
+                if corpus.dense is None:
+                    self._initialize_dense_index(corpus)
+        return corpus.dense
+
+    def _submit(self, fn, *args):
+        """검색기 스레드 풀에서 실행 (고정된 문서 상태를 작업 스레드에도 전달)"""
+        return self._executor.submit(contextvars.copy_context().run, fn, *args)
+
+    def _initialize_embeddings(self):
+        """임베딩 모델 초기화 (EMBEDDING_PROVIDER에 따라 OpenAI / 로컬)"""
+        self.embeddings = create_embeddings(self.config)
 
     def _create_vectorstore(self):
         """기존 벡터스토어 로드"""
-        self.vectorstore = Chroma(
+        vectorstore = Chroma(
             embedding_function=self.embeddings,
             persist_directory=self.config.DB_DIRECTORY,
             collection_name=self.config.COLLECTION_NAME
         )
+        
+        # DB 구축에 쓴 임베딩 모델과 같은지 확인
+        recorded = check_collection_embedding(vectorstore._collection.metadata, self.config)
+        if recorded is None:
+            print("⚠️ 컬렉션에 임베딩 모델 기록이 없습니다 (이전 버전 DB) - 현재 설정을 그대로 사용합니다")
+        self.vectorstore = vectorstore
 
     def _initialize_bm25(self):
-        """BM25 인덱스 생성"""
-        all_docs = self.vectorstore.get()
+        """문서 상태 초기화 (다른 스레드는 완성된 상태만 보도록 마지막에 한 번 교체)"""
+        self._corpus = self._build_corpus_state()
+
+    def _build_corpus_state(self):
+        """문서 목록과 BM25 인덱스 준비 (검색기 스냅샷이 있으면 mmap 로드, 없으면 ChromaDB 덤프)"""
+        tokenizer = get_tokenizer(self.config)
+        index_files_mtime = self._index_files_stat()
+        
+        snapshot = self._load_snapshot(tokenizer)
+        if snapshot is not None:
+            doc_ids = snapshot.ids.tolist()
+            doc_texts = snapshot.texts
+            doc_metadatas = snapshot.metadata
+            index = snapshot.bm25_index
+        else:
+            all_docs = self.vectorstore.get()
+            doc_texts = TextStore.from_strings(all_docs['documents'])
+            doc_ids = all_docs['ids']
+            doc_metadatas = MetadataStore.from_dicts(all_docs['metadatas'])
+            index = self._load_bm25_index(doc_ids, tokenizer)
+        
+        doc_metadatas.build_filter_index(self.config.METADATA_FILTER_FIELDS)
+        
+        if index is None:
+            tokenized_docs = tokenize_corpus(
+                tokenizer,
+                doc_ids,
+                doc_texts,
+                cache_dir=self.config.TOKEN_CACHE_DIRECTORY
+            )
+            index = BM25Index.build(
+                tokenized_docs,
+                k1=self.config.BM25_K1,
+                b=self.config.BM25_B,
+                epsilon=self.config.BM25_EPSILON,
+                tokenizer=tokenizer.signature
+            )
+            print(f"✅ BM25 인덱스 생성 완료: {len(doc_texts)}개 문서")
+            print("   (python main.py --step bm25 로 인덱스를 저장하면 다음 시작부터 재사용합니다)")
+        
+        return _CorpusState(tokenizer, index_files_mtime, doc_ids, doc_texts, doc_metadatas, index)
+
+    def _index_files_stat(self):
+        """저장된 검색기 스냅샷 / BM25 인덱스 meta.json 수정 시각 (없으면 None)"""
+        paths = (
+            self.config.RETRIEVER_SNAPSHOT_PATH,
+            os.path.join(self.config.BM25_INDEX_DIRECTORY, "meta.json"),
+        )
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _load_snapshot(self, tokenizer):
+        """저장된 검색기 스냅샷 로드 (없거나 컬렉션/설정과 맞지 않으면 None)"""
+        path = self.config.RETRIEVER_SNAPSHOT_PATH
+        
+        if not os.path.exists(path):
+            print(f"⚠️ 저장된 검색기 스냅샷이 없습니다: {path}")
+            return None
+        
+        try:
+            snapshot = RetrieverSnapshot.load(path, mmap=True)
+        except ValueError as e:
+            print(f"⚠️ 검색기 스냅샷 로드 실패: {e}")
+            return None
+        
+        meta = snapshot.meta
+        if meta.get('collection_name') != self.config.COLLECTION_NAME:
+            print(f"⚠️ 검색기 스냅샷 컬렉션 불일치: {meta.get('collection_name')}")
+            return None
+        
+        if meta.get('embedding_model') != embedding_signature(self.config):
+            print(f"⚠️ 검색기 스냅샷 임베딩 모델 불일치: {meta.get('embedding_model')}")
+            return None
+        
+        if snapshot.bm25_index.meta.get('tokenizer') != tokenizer.signature:
+            print(f"⚠️ 검색기 스냅샷 토크나이저 불일치: {snapshot.bm25_index.meta.get('tokenizer')} "
+                  f"(설정: {tokenizer.signature})")
+            return None
+        
+        # 본문/메타데이터 없이 ID만 받아 지문 비교 (문서 수가 같아도 구성이 바뀌면 다시 덤프)
+        collection_ids = self.vectorstore._collection.get(include=[])['ids']
+        if meta.get('corpus_fingerprint') != corpus_fingerprint(collection_ids):
+            print("⚠️ 검색기 스냅샷이 현재 ChromaDB 컬렉션과 일치하지 않습니다")
+            return None
+        
+        print(f"✅ 검색기 스냅샷 로드 완료 (mmap): {len(snapshot)}개 문서")
+        return snapshot
+
+    @property
+    def index_version(self):
+        """현재 로드된 인덱스 버전 (재구축 시 바뀜, BM25를 아직 로드하지 않았으면 디스크 인덱스 수정 시각)"""
+        pin = self._pin.get()
+        if (pin is None or pin[0] is None) and not self.is_ready('bm25'):
+            return ('mtime', self._index_files_stat())
+        return self.bm25_index.version
+
+    def _refresh_if_index_rebuilt(self):
+        """
+        디스크 인덱스가 재구축되었으면 다시 로드하고 결과 캐시 초기화 (로드 전이면 할 일 없음)
+        
+        새 문서 상태(임베딩 인덱스를 쓰고 있었으면 그것까지)를 다 만든 뒤 한 번에 교체하므로
+        진행 중인 검색은 이전 상태로 끝까지 실행됩니다.
+        """
+        if not self.is_ready('bm25') or self._index_files_stat() == self._corpus.index_files_mtime:
+            return
+        
+        with self._index_lock:
+            if self._index_files_stat() == self._corpus.index_files_mtime:
+                return
+            print("🔄 인덱스 재구축 감지: 다시 로드합니다")
+            corpus = self._build_corpus_state()
+            if self.is_ready('dense_index'):
+                self._initialize_dense_index(corpus)
+            self._corpus = corpus
+            self.query_cache.clear()
+            self.rerank_cache.clear()
+
+    def _settings_key(self):
+        """결과 캐시 키에 넣을 검색 설정 (실행 중 바꿔도 이전 설정의 결과를 돌려주지 않도록)"""
+        config = self.config
+        return (
+            config.LEXICAL_BACKEND,
+            config.LEXICAL_TOP_K,
+            config.BM25_TOKENIZER,
+            config.BM25_NGRAM_SIZE,
+            config.DENSE_BACKEND,
+            config.DENSE_INDEX_DTYPE,
+            config.DENSE_RESCORE_FACTOR,
+            config.HYBRID_UNION_SCORING,
+            config.HYBRID_CANDIDATE_MULTIPLIER,
+            config.RRF_K,
+            config.MMR_ENABLED,
+            config.MMR_LAMBDA,
+            config.MMR_CANDIDATE_MULTIPLIER,
+        )
+
+    def _get_cached_results(self, key):
+        """
+        결과 캐시 조회 (key에 인덱스 버전과 검색 설정 포함)
+        
+        호출자가 metadata 등을 수정해도 캐시가 바뀌지 않도록 깊은 복사본을 반환하고,
+        timings는 검색 당시 값 대신 캐시 조회 시간으로 바꿉니다.
+        """
+        start = time.perf_counter()
+        self._refresh_if_index_rebuilt()
+        results = self.query_cache.get(key + (self.index_version, self._settings_key()))
+        if results is None:
+            return None
+        
+        results = copy.deepcopy(results)
+        timings = {'cached': True, 'total': time.perf_counter() - start}
+        for doc in results:
+            if 'timings' in doc:
+                doc['timings'] = dict(timings)
+        print(f"⚡ 캐시 히트: {key[0]} ({len(results)}개)")
+        return results
+
+    def _put_cached_results(self, key, results):
+        """결과 캐시 저장 (호출자에게 돌려준 결과와 공유하지 않도록 깊은 복사)"""
+        self.query_cache.put(key + (self.index_version, self._settings_key()), copy.deepcopy(results))
+
+    def cache_stats(self):
+        """결과/Re-rank 점수/임베딩 캐시 히트/미스 통계 (rerank hit_rate = 캐시에서 나온 쌍 비율)"""
+        stats = {
+            'query': self.query_cache.stats(),
+            'rerank': self.rerank_cache.stats(),
+        }
+        if self.is_ready('embeddings') and hasattr(self.embeddings, 'stats'):
+            stats['embedding'] = self.embeddings.stats()
+        return stats
+
+    def _load_bm25_index(self, doc_ids, tokenizer):
+        """저장된 BM25 인덱스 로드 (없거나 컬렉션과 맞지 않으면 None)"""
+        index_dir = self.config.BM25_INDEX_DIRECTORY
+        
+        if BM25Index.read_meta(index_dir) is None:
+            print(f"⚠️ 저장된 BM25 인덱스가 없습니다: {index_dir}")
+            return None
+        
+        try:
+            index = BM25Index.load(index_dir, mmap=True)
+        except ValueError as e:
+            print(f"⚠️ BM25 인덱스 로드 실패: {e}")
+            return None
+        
+        if index.meta.get('corpus_fingerprint') != corpus_fingerprint(doc_ids):
+            print("⚠️ BM25 인덱스가 현재 ChromaDB 컬렉션과 일치하지 않습니다")
+            return None
+        
+        if index.meta.get('tokenizer') != tokenizer.signature:
+            print(f"⚠️ BM25 인덱스 토크나이저 불일치: {index.meta.get('tokenizer')} "
+                  f"(설정: {tokenizer.signature})")
+            return None
+        
+        print(f"✅ BM25 인덱스 로드 완료 (mmap): {index.corpus_size}개 문서")
+        return index
+
+    def _initialize_dense_index(self, corpus=None):
+        """
+        문서 상태(기본: 현재 상태)에 맞춘 메모리 매핑 임베딩 인덱스 준비 (없으면 한 번 내보내기)
+        
+        DENSE_BACKEND가 chroma가 아니거나, union 점수 계산에 저장된 벡터가 필요할 때 로드합니다.
+        다른 스레드가 준비 중인 인덱스를 보지 않도록 완성된 _DenseState를 마지막에 설정합니다.
+        """
+        corpus = corpus or self._corpus
+        if self.config.DENSE_BACKEND == "chroma" and not self.config.HYBRID_UNION_SCORING:
+            corpus.dense = _DenseState()
+            return
         
-        self.doc_texts = all_docs['documents']
-        self.doc_ids = all_docs['ids']
-        self.doc_metadatas = all_docs['metadatas']
+        index = self._load_dense_index(corpus)
+        if index is None:
+            print("⏳ ChromaDB 벡터를 임베딩 인덱스로 내보내는 중...")
+            index = ExactDenseIndex.from_collection(
+                self.vectorstore._collection,
+                dtype=self.config.DENSE_INDEX_DTYPE,
+                extra_meta={
+                    'collection_name': self.config.COLLECTION_NAME,
+                    'embedding_model': embedding_signature(self.config),
+                }
+            )
+            index.save(self.config.DENSE_INDEX_DIRECTORY)
+            index = ExactDenseIndex.load(self.config.DENSE_INDEX_DIRECTORY, mmap=True)
+            print(f"✅ 임베딩 인덱스 저장 완료: {self.config.DENSE_INDEX_DIRECTORY}")
         
-        self.content_to_id = {text: doc_id for text, doc_id in zip(self.doc_texts, self.doc_ids)}
+        if self.config.DENSE_BACKEND in QUANTIZATION_METHODS:
+            index = QuantizedDenseIndex.load_or_build(
+                index,
+                self.config.DENSE_INDEX_DIRECTORY,
+                self.config.DENSE_BACKEND,
+                rescore_factor=self.config.DENSE_RESCORE_FACTOR
+            )
+            print(f"✅ {index.method} 양자화 인덱스 준비 완료: "
+                  f"{index.nbytes / 2**20:.1f}MB (float {index.base.nbytes / 2**20:.1f}MB는 mmap)")
         
-        tokenized_docs = [doc.split() for doc in self.doc_texts]
-        self.bm25 = BM25Okapi(tokenized_docs)
+        # 인덱스 행 번호 ↔ 검색기 문서 위치 (순서가 같으면 변환 생략)
+        row_positions = position_rows = None
+        if index.ids != corpus.doc_ids:
+            row_positions = np.array(
+                [corpus.id_to_position[doc_id] for doc_id in index.ids], dtype=np.int64
+            )
+            position_rows = np.argsort(row_positions)
         
-        print(f"✅ BM25 인덱스 생성 완료: {len(self.doc_texts)}개 문서")
+        corpus.dense = _DenseState(index, row_positions, position_rows)
+
+    def _load_dense_index(self, corpus):
+        """저장된 임베딩 인덱스 로드 (없거나 문서 상태/모델과 맞지 않으면 None)"""
+        index_dir = self.config.DENSE_INDEX_DIRECTORY
+        
+        if ExactDenseIndex.read_meta(index_dir) is None:
+            print(f"⚠️ 저장된 임베딩 인덱스가 없습니다: {index_dir}")
+            return None
+        
+        try:
+            index = ExactDenseIndex.load(index_dir, mmap=True)
+        except ValueError as e:
+            print(f"⚠️ 임베딩 인덱스 로드 실패: {e}")
+            return None
+        
+        if index.meta.get('embedding_model') != embedding_signature(self.config):
+            print(f"⚠️ 임베딩 인덱스 모델 불일치: {index.meta.get('embedding_model')}")
+            return None
+        
+        if len(index.ids) != len(corpus.doc_ids) or not all(i in corpus.id_to_position for i in index.ids):
+            print("⚠️ 임베딩 인덱스가 현재 ChromaDB 컬렉션과 일치하지 않습니다")
+            return None
+        
+        print(f"✅ 임베딩 인덱스 로드 완료 (mmap, {index.meta.get('dtype')}): {len(index)}개 문서")
+        return index
 
     def _initialize_reranker(self):
         """Re-ranker 초기화"""
-        self.reranker = CrossEncoder('BAAI/bge-reranker-base')
-        print("✅ Re-ranker 초기화 완료 (bge-reranker-base)")
+        self.reranker = create_reranker(self.config)
+        print(f"✅ Re-ranker 초기화 완료 ({self.reranker_id})")
+
+    def _bm25_normalized_scores(self, tokenized_query, metadata_filter=None):
+        """
+        LEXICAL_BACKEND에 따라 전체 문서의 정규화된 BM25 점수 계산
+        
+        metadata_filter가 있으면 허용 문서만 채점/정규화하고 나머지 문서는 0점입니다.
+        """
+        backend = self.config.LEXICAL_BACKEND
+        
+        if backend == "sparse":
+            if metadata_filter is None:
+                return min_max_normalize(self.bm25.get_scores(tokenized_query))
+            scores = np.zeros(len(self.doc_ids))
+            scores[metadata_filter.positions] = min_max_normalize(
+                self.bm25.get_scores(tokenized_query, metadata_filter.positions)
+            )
+            return scores
+        elif backend == "maxscore":
+            allowed = None if metadata_filter is None else metadata_filter.mask
+            positions, scores = self.bm25_topk.top_k(tokenized_query, self.config.LEXICAL_TOP_K, allowed)
+            return scatter_topk_bm25_scores(len(self.doc_ids), positions, scores)
+        else:
+            raise ValueError(f"Unknown lexical backend: {backend}")
+
+    def _bm25_top_candidates(self, tokenized_query, k, metadata_filter=None):
+        """
+        BM25 상위 k개 (위치 배열, 원본 점수 배열) - 점수 내림차순, 0점 문서 제외
+        
+        RRF 결합용으로 전체 문서 정규화 없이 순위만 구합니다 (maxscore는 상위 후보만 채점).
+        metadata_filter가 있으면 허용 문서만 채점합니다.
+        """
+        backend = self.config.LEXICAL_BACKEND
+        
+        if backend == "sparse":
+            if metadata_filter is None:
+                return self._top_candidates_from_scores(self.bm25.get_scores(tokenized_query), k)
+            positions, scores = self._top_candidates_from_scores(
+                self.bm25.get_scores(tokenized_query, metadata_filter.positions), k
+            )
+            return metadata_filter.positions[positions], scores
+        elif backend == "maxscore":
+            allowed = None if metadata_filter is None else metadata_filter.mask
+            return self.bm25_topk.top_k(tokenized_query, k, allowed)
+        else:
+            raise ValueError(f"Unknown lexical backend: {backend}")
+
+    @staticmethod
+    def _top_candidates_from_scores(scores, k):
+        positions = top_k_positions(scores, k)
+        positions = positions[scores[positions] > 0]
+        return positions, scores[positions]
+
+    def _bm25_stage(self, query, fusion="alpha", n_candidates=None, metadata_filter=None):
+        """질의 토큰화 + BM25 (alpha: 정규화된 전체 점수 / rrf: 상위 n_candidates개 후보)"""
+        tokenized_query = self.tokenize_query(query)
+        if fusion == "rrf":
+            return self._bm25_top_candidates(tokenized_query, n_candidates, metadata_filter)
+        return self._bm25_normalized_scores(tokenized_query, metadata_filter)
+
+    @staticmethod
+    def _check_fusion(fusion):
+        if fusion not in ("alpha", "rrf"):
+            raise ValueError(f"Unknown fusion: {fusion}")
 
     @staticmethod
-    def _min_max_normalize(scores):
-        """0~1 범위로 정규화"""
-        scores = np.array(scores)
-        min_score = scores.min()
-        max_score = scores.max()
+    def _timed(fn, *args):
+        """(fn 결과, 실행 시간(초))"""
+        start = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - start
+
+    @staticmethod
+    def _attach_timings(results, timings):
+        """검색 결과마다 단계별 소요 시간(초) 기록"""
+        for doc in results:
+            doc['timings'] = dict(timings)
+
+    def _bm25_normalized_scores_many(self, tokenized_queries):
+        """여러 질의의 정규화된 BM25 점수 (sparse 백엔드는 질의 묶음 단위 행렬 곱)"""
+        if self.config.LEXICAL_BACKEND != "sparse":
+            for tokenized_query in tokenized_queries:
+                yield self._bm25_normalized_scores(tokenized_query)
+            return
+        
+        batch_size = self.config.BM25_QUERY_BATCH_SIZE
+        for start in range(0, len(tokenized_queries), batch_size):
+            score_matrix = self.bm25.get_scores_many(tokenized_queries[start:start + batch_size])
+            for scores in score_matrix:
+                yield min_max_normalize(scores)
+
+    def _bm25_stage_many(self, tokenized_queries, fusion="alpha", n_candidates=None):
+        """여러 질의의 BM25 단계 결과 (_bm25_stage와 같은 값, sparse 백엔드는 질의 묶음 단위 행렬 곱)"""
+        if fusion != "rrf":
+            yield from self._bm25_normalized_scores_many(tokenized_queries)
+            return
         
-        if max_score == min_score:
-            return np.full_like(scores, 0.5, dtype=float)
+        if self.config.LEXICAL_BACKEND != "sparse":
+            for tokenized_query in tokenized_queries:
+                yield self._bm25_top_candidates(tokenized_query, n_candidates)
+            return
         
-        return (scores - min_score) / (max_score - min_score)
+        batch_size = self.config.BM25_QUERY_BATCH_SIZE
+        for start in range(0, len(tokenized_queries), batch_size):
+            score_matrix = self.bm25.get_scores_many(tokenized_queries[start:start + batch_size])
+            for scores in score_matrix:
+                yield self._top_candidates_from_scores(scores, n_candidates)
 
-    def _find_doc_id_by_content(self, content):
-        """문서 content로 ID 찾기"""
-        return self.content_to_id.get(content, None)
+    def _embed_queries(self, queries):
+        """여러 질의를 한 번의 배치 요청으로 임베딩"""
+        return embed_queries(self.embeddings, queries)
+
+    def _chroma_dense_search(self, query_vector, k, metadata_filter=None):
+        """
+        Chroma HNSW 검색 → (문서 위치 배열, 거리 배열)
+        
+        컬렉션에 ID와 거리만 요청하고 (본문/메타데이터 제외) ID로 문서 위치를 찾습니다.
+        본문이 같은 청크도 각자의 위치로 구분됩니다.
+        metadata_filter는 허용 값 목록($in) where 조건으로 Chroma에 넘깁니다.
+        """
+        query_kwargs = {}
+        if metadata_filter is not None:
+            query_kwargs['where'] = metadata_filter.chroma_where()
+            k = min(k, len(metadata_filter))
+        result = self.vectorstore._collection.query(
+            query_embeddings=[query_vector], n_results=k, include=['distances'], **query_kwargs
+        )
+        positions = []
+        distances = []
+        for doc_id, distance in zip(result['ids'][0], result['distances'][0]):
+            position = self.id_to_position.get(doc_id)
+            if position is not None:
+                positions.append(position)
+                distances.append(distance)
+        
+        return np.array(positions, dtype=np.int64), np.array(distances, dtype=float)
+
+    def _dense_search(self, query_vector, k, metadata_filter=None):
+        """
+        질의 벡터 → (문서 위치 배열, 원본 유사도 배열, 질의 벡터)
+        
+        DENSE_BACKEND에 따라 Chroma / 전수 / 양자화 검색을 사용합니다.
+        질의 벡터는 union 점수 계산을 위해 결합 단계로 함께 넘깁니다.
+        """
+        backend = self.config.DENSE_BACKEND
+        
+        if backend == "chroma":
+            positions, distances = self._chroma_dense_search(query_vector, k, metadata_filter)
+        elif backend == "exact" or backend in QUANTIZATION_METHODS:
+            positions, distances = self._exact_dense_search(query_vector, k, metadata_filter)
+        else:
+            raise ValueError(f"Unknown dense backend: {backend}")
+        
+        return positions, 1 / (1 + distances), query_vector
+
+    def _exact_dense_search(self, query_vector, k, metadata_filter=None):
+        """
+        메모리 매핑 인덱스 검색 (전수 또는 양자화 + 재채점) → (문서 위치 배열, 거리 배열)
+        
+        metadata_filter가 있으면 허용 문서의 행만 float 벡터로 거리를 계산합니다.
+        """
+        if metadata_filter is not None:
+            positions = metadata_filter.positions
+            rows = positions if self.dense_position_rows is None else self.dense_position_rows[positions]
+            distances = self.dense_index.row_distances(rows, query_vector)
+            order = top_k_positions(-distances, k)
+            return positions[order], distances[order]
+        
+        rows, distances = self.dense_index.search(query_vector, k)
+        if self.dense_row_positions is not None:
+            rows = self.dense_row_positions[rows]
+        return rows, distances
+
+    def _dense_stage(self, query, k, metadata_filter=None):
+        """질의 임베딩 + 임베딩 검색 (hybrid_search의 dense 단계)"""
+        return self._dense_search(self.embeddings.embed_query(query), k, metadata_filter)
+
+    def _format_hybrid_result(self, idx, hybrid_score, bm25_score, embed_score):
+        """위치 idx의 문서를 hybrid 검색 결과 형식으로 변환"""
+        metadata = self.doc_metadatas[idx]
+        return {
+            'id': self.doc_ids[idx],
+            'content': self.doc_texts[idx],
+            'metadata': metadata,
+            'hybrid_score': float(hybrid_score),
+            'bm25_score': float(bm25_score),
+            'embed_score': float(embed_score),
+            'filename': metadata.get('파일명', 'N/A'),
+            'organization': metadata.get('발주 기관', 'N/A')
+        }
+
+    @staticmethod
+    def _chunk_key(doc):
+        """Re-rank 캐시용 청크 식별자 (ID가 없으면 본문 해시)"""
+        doc_id = doc.get('id')
+        if doc_id:
+            return doc_id
+        return hashlib.sha1(doc['content'].encode('utf-8')).hexdigest()
+
+    def _n_candidates(self, top_k, metadata_filter=None):
+        """Hybrid 검색에서 BM25 / 임베딩 검색 각각 가져올 후보 수"""
+        n_docs = len(self.doc_texts) if metadata_filter is None else len(metadata_filter)
+        return min(top_k * self.config.HYBRID_CANDIDATE_MULTIPLIER, n_docs)
+
+    def _resolve_filter(self, filter):
+        """
+        filter 인자 → MetadataFilter (없으면 None)
+        
+        {필드: 값 / 값 목록 / {"$gte": ..., "$lte": ..., "$in": [...]}} 조건을 필드별 역색인으로
+        허용 문서 위치 배열로 바꿉니다 (필드 간 AND, 날짜는 ISO 문자열 비교).
+        Chroma where와 같은 {"$and": [...]} / {"$or": [...]} 조합도 받습니다.
+        """
+        if isinstance(filter, MetadataFilter):
+            return filter
+        if not filter:
+            return None
+        return self.doc_metadatas.prepare_filter(filter)
+
+    @staticmethod
+    def _filter_key(filter):
+        """결과 캐시 키에 붙일 필터 부분 (필터가 없으면 빈 튜플 - 기존 캐시 키 그대로)"""
+        if isinstance(filter, MetadataFilter):
+            return (filter.key,)
+        return (filter_key(filter),) if filter else ()
+
+    @staticmethod
+    def _top_positions(scores, k, metadata_filter=None):
+        """전체 문서 점수 배열의 상위 k개 위치 (필터가 있으면 허용 문서 안에서만)"""
+        if metadata_filter is None:
+            return top_k_positions(scores, k)
+        allowed = metadata_filter.positions
+        return allowed[top_k_positions(scores[allowed], k)]
+
+    def _union_dense_scores(self, bm25_normalized, positions, query_vector, n_candidates, metadata_filter=None):
+        """
+        BM25 상위 후보 ∪ 임베딩 검색 후보 전체의 정확한 임베딩 유사도
+        
+        임베딩 검색에 없던 BM25 후보도 0점 대신 저장된 벡터와의 실제 유사도를 받습니다.
+        (행 선택 + 행렬-벡터 곱 한 번)
+        """
+        bm25_top = self._top_positions(bm25_normalized, n_candidates, metadata_filter)
+        bm25_top = bm25_top[bm25_normalized[bm25_top] > 0]
+        union = np.union1d(positions, bm25_top)
+        
+        rows = union if self.dense_position_rows is None else self.dense_position_rows[union]
+        distances = self.dense_index.row_distances(rows, query_vector)
+        return union, 1 / (1 + distances)
+
+    def _fuse_and_format(self, bm25_normalized, dense_hits, top_k, alpha, metadata_filter=None):
+        """
+        BM25 점수 + 임베딩 검색 결과(위치, 원본 유사도, 질의 벡터) → 상위 top_k개 hybrid 결과
+        
+        metadata_filter가 있으면 허용 문서 안에서만 상위 k개를 고릅니다.
+        """
+        positions, raw_scores, query_vector = dense_hits
+        if self.config.HYBRID_UNION_SCORING:
+            positions, raw_scores = self._union_dense_scores(
+                bm25_normalized, positions, query_vector, len(positions), metadata_filter
+            )
+        
+        # 임베딩 점수를 전체 문서 배열로 펼쳐 정규화
+        embed_scores = scatter_dense_scores(len(self.doc_ids), positions, raw_scores)
+        
+        # 하이브리드 점수 계산 및 상위 k개 선택
+        hybrid_scores = fuse_scores(bm25_normalized, embed_scores, alpha)
+        top_positions = self._top_positions(hybrid_scores, top_k, metadata_filter)
+        
+        return [
+            self._format_hybrid_result(idx, hybrid_scores[idx], bm25_normalized[idx], embed_scores[idx])
+            for idx in top_positions
+        ]
+
+    def _rrf_fuse_and_format(self, bm25_hits, dense_hits, top_k, alpha, metadata_filter=None):
+        """
+        BM25 상위 후보(위치, 점수) + 임베딩 검색 결과 → RRF 상위 top_k개 hybrid 결과
+        
+        순위만 결합하므로 후보 크기의 배열만 다룹니다. (가중치: BM25 1 - alpha, 임베딩 alpha)
+        메타데이터 필터는 후보 검색 단계에서 이미 적용되어 있습니다.
+        결과의 bm25_score / embed_score는 alpha 결합과 같은 정규화 값입니다
+        (BM25는 최고점 대비, 임베딩은 후보 내 min-max).
+        """
+        bm25_positions, bm25_scores = bm25_hits
+        dense_positions, dense_scores, _ = dense_hits
+        
+        # 0점 이하 BM25 후보는 순위에서 제외 (전부 0이어도 0으로 나누지 않음)
+        keep = bm25_scores > 0
+        bm25_positions, bm25_scores = bm25_positions[keep], bm25_scores[keep]
+        
+        positions, rrf_scores = rrf_fuse(
+            [bm25_positions, dense_positions], weights=[1 - alpha, alpha], k=self.config.RRF_K
+        )
+        
+        bm25_normalized = bm25_scores / bm25_scores.max() if bm25_scores.size else bm25_scores
+        bm25_lookup = dict(zip(bm25_positions.tolist(), bm25_normalized.tolist()))
+        embed_lookup = dict(zip(dense_positions.tolist(), min_max_normalize(dense_scores).tolist()))
+        
+        return [
+            self._format_hybrid_result(
+                positions[i], rrf_scores[i],
+                bm25_lookup.get(int(positions[i]), 0.0), embed_lookup.get(int(positions[i]), 0.0)
+            )
+            for i in top_k_positions(rrf_scores, top_k)
+        ]
+
+    def _candidate_embeddings(self, documents):
+        """검색 결과 문서들의 저장된 임베딩 (임베딩 인덱스가 있으면 mmap 행, 없으면 Chroma 조회)"""
+        ids = [doc['id'] for doc in documents]
+        
+        if self.dense_index is not None:
+            positions = np.array([self.id_to_position[doc_id] for doc_id in ids], dtype=np.int64)
+            rows = positions if self.dense_position_rows is None else self.dense_position_rows[positions]
+            return self.dense_index.row_vectors(rows)
+        
+        result = self.vectorstore._collection.get(ids=ids, include=['embeddings'])
+        vectors_by_id = dict(zip(result['ids'], result['embeddings']))
+        return np.array([vectors_by_id[doc_id] for doc_id in ids], dtype=np.float32)
+
+    def _diversify(self, candidates, top_k):
+        """
+        MMR_ENABLED이면 Re-rank 전 후보를 MMR로 top_k * MMR_CANDIDATE_MULTIPLIER개로 줄임
+        
+        같은 RFP의 겹치는 인접 청크처럼 서로 비슷한 후보를 빼서
+        CrossEncoder가 채점할 쌍을 줄이고 더 다양한 문서를 남깁니다.
+        """
+        n_keep = top_k * self.config.MMR_CANDIDATE_MULTIPLIER
+        if not self.config.MMR_ENABLED or len(candidates) <= n_keep:
+            return candidates
+        
+        relevance = min_max_normalize([doc['hybrid_score'] for doc in candidates])
+        selected = mmr_select(
+            relevance, self._candidate_embeddings(candidates), n_keep, self.config.MMR_LAMBDA
+        )
+        return [candidates[i] for i in selected]
 
     def _rerank(self, query, documents, top_k):
         """
@@ -90,28 +912,65 @@ class RAGRetriever:
         if len(documents) == 0:
             return []
         
-        # 1. (query, document) 쌍 생성
-        pairs = [[query, doc['content']] for doc in documents]
+        return self._rerank_many([query], [documents], top_k)[0]
+
+    def _rerank_many(self, queries, documents_list, top_k):
+        """
+        여러 질의의 검색 결과 재정렬 (캐시에 없는 모든 쌍을 CrossEncoder 배치 한 번으로 계산)
         
-        # 2. CrossEncoder로 점수 계산
-        scores = self.reranker.predict(pairs)
+        Args:
+            queries: 검색 쿼리 리스트
+            documents_list: 질의별 검색 결과 리스트
+            top_k: 질의별 최종 반환할 문서 수
         
-        # 3. 점수를 문서에 추가
-        for i, doc in enumerate(documents):
-            doc['rerank_score'] = float(scores[i])
+        Returns:
+            질의별 재정렬된 상위 k개 문서 리스트
+        """
+        # 1. 캐시된 (query, chunk) 점수 조회
+        keys = [
+            [(normalize_query(query), self._chunk_key(doc), self.reranker_id) for doc in documents]
+            for query, documents in zip(queries, documents_list)
+        ]
+        scores = [[self.rerank_cache.get(key) for key in query_keys] for query_keys in keys]
+        missing = [
+            (q, i)
+            for q, query_scores in enumerate(scores)
+            for i, score in enumerate(query_scores)
+            if score is None
+        ]
+        
+        # 2. 캐시에 없는 쌍만 CrossEncoder로 점수 계산
+        if missing:
+            pairs = [[queries[q], documents_list[q][i]['content']] for q, i in missing]
+            new_scores = self.reranker.predict(pairs, batch_size=self.config.RERANK_BATCH_SIZE)
+            for (q, i), score in zip(missing, new_scores):
+                scores[q][i] = float(score)
+                self.rerank_cache.put(keys[q][i], scores[q][i])
         
-        # 4. 정렬 및 반환
-        sorted_docs = sorted(documents, 
-                            key=lambda x: x['rerank_score'], 
-                            reverse=True)
+        total_pairs = sum(len(documents) for documents in documents_list)
+        cached_pairs = total_pairs - len(missing)
+        if cached_pairs:
+            print(f"⚡ Re-rank 점수 캐시: {cached_pairs}/{total_pairs}쌍 재사용")
         
-        return sorted_docs[:top_k]
+        # 3. 점수를 문서에 추가, 정렬 및 반환
+        results = []
+        for documents, query_scores in zip(documents_list, scores):
+            for doc, score in zip(documents, query_scores):
+                doc['rerank_score'] = score
+            
+            sorted_docs = sorted(documents, 
+                                key=lambda x: x['rerank_score'], 
+                                reverse=True)
+            results.append(sorted_docs[:top_k])
+        
+        return results
 
     @traceable(
         name="RAG_Hybrid_Search",
         metadata={"component": "retriever", "version": "2.0"}
     )
-    def hybrid_search(self, query, top_k=None, alpha=0.5):
+    @_pinned_state
+    def hybrid_search(self, query, top_k=None, alpha=0.5, fusion="alpha", filter=None):
         """
         Hybrid Search: BM25 + 임베딩 결합
         
@@ -119,72 +978,72 @@ class RAGRetriever:
             query: 검색 쿼리
             top_k: 반환할 문서 수
             alpha: 임베딩 가중치 (0~1)
+            fusion: "alpha" (min-max 정규화 점수 가중합) / "rrf" (Reciprocal Rank Fusion)
+            filter: 메타데이터 사전 필터 (예: {"발주 기관": "한국전력공사"},
+                    {"공개 일자": {"$gte": "2024-01-01"}}) - 조건을 만족하는 문서만 채점
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
+        self._check_fusion(fusion)
         
         if top_k is None:
             top_k = self.config.DEFAULT_TOP_K
         
-        # 1. BM25 검색
-        tokenized_query = query.split()
-        bm25_scores = self.bm25.get_scores(tokenized_query)
-        bm25_normalized = self._min_max_normalize(bm25_scores)
+        metadata_filter = self._resolve_filter(filter)
+        if metadata_filter is not None and len(metadata_filter) == 0:
+            print("🔍 Hybrid 검색: 필터 조건을 만족하는 문서가 없습니다")
+            return []
         
-        # 2. 임베딩 검색
-        embedding_results = self.vectorstore.similarity_search_with_score(
-            query, k=min(top_k * 3, len(self.doc_texts))
-        )
+        n_dense = self._n_candidates(top_k, metadata_filter)
         
-        # 3. 임베딩 점수 정규화
-        embedding_scores_raw = {}
-        for doc, distance in embedding_results:
-            doc_id = self._find_doc_id_by_content(doc.page_content)
-            if doc_id:
-                embedding_scores_raw[doc_id] = 1 / (1 + distance)
-        
-        if embedding_scores_raw:
-            embed_values = np.array(list(embedding_scores_raw.values()))
-            embed_normalized = self._min_max_normalize(embed_values)
-            embedding_scores = dict(zip(embedding_scores_raw.keys(), embed_normalized))
+        # 1~2. BM25 검색(CPU)과 임베딩 검색(네트워크)
+        if self.config.HYBRID_PARALLEL:
+            # BM25는 작업 스레드에서, 임베딩 검색은 현재 스레드에서 동시에 실행
+            bm25_future = self._submit(
+                self._timed, self._bm25_stage, query, fusion, n_dense, metadata_filter
+            )
+            dense_hits, dense_time = self._timed(self._dense_stage, query, n_dense, metadata_filter)
+            bm25_result, bm25_time = bm25_future.result()
         else:
-            embedding_scores = {}
-        
-        # 4. 하이브리드 점수 계산
-        hybrid_scores = {}
-        for i, doc_id in enumerate(self.doc_ids):
-            bm25_score = bm25_normalized[i]
-            embed_score = embedding_scores.get(doc_id, 0)
-            hybrid_scores[doc_id] = (1 - alpha) * bm25_score + alpha * embed_score
-        
-        # 5. 정렬 및 상위 k개 선택
-        sorted_ids = sorted(hybrid_scores.keys(), 
-                           key=lambda x: hybrid_scores[x], 
-                           reverse=True)
-        top_ids = sorted_ids[:top_k]
-        
-        # 6. 결과 포맷팅
-        formatted_results = []
-        for doc_id in top_ids:
-            idx = self.doc_ids.index(doc_id)
-            formatted_results.append({
-                'content': self.doc_texts[idx],
-                'metadata': self.doc_metadatas[idx],
-                'hybrid_score': hybrid_scores[doc_id],
-                'bm25_score': float(bm25_normalized[idx]),
-                'embed_score': embedding_scores.get(doc_id, 0),
-                'filename': self.doc_metadatas[idx].get('파일명', 'N/A'),
-                'organization': self.doc_metadatas[idx].get('발주 기관', 'N/A')
-            })
+            bm25_result, bm25_time = self._timed(self._bm25_stage, query, fusion, n_dense, metadata_filter)
+            dense_hits, dense_time = self._timed(self._dense_stage, query, n_dense, metadata_filter)
         
-        end_time = time.time()
-        print(f"🔍 Hybrid 검색 완료: {len(formatted_results)}개 (alpha={alpha}, {end_time-start_time:.3f}초)")
+        # 3. 점수 결합, 상위 k개 선택 및 포맷팅
+        return self._finish_hybrid(
+            bm25_result, dense_hits, top_k, alpha, bm25_time, dense_time, start_time, fusion,
+            metadata_filter
+        )
+
+    def _finish_hybrid(self, bm25_result, dense_hits, top_k, alpha,
+                       bm25_time, dense_time, start_time, fusion="alpha", metadata_filter=None):
+        """점수 결합 + 단계별 소요 시간 기록 (hybrid_search / ahybrid_search 공통)"""
+        fuse = self._rrf_fuse_and_format if fusion == "rrf" else self._fuse_and_format
+        formatted_results, fusion_time = self._timed(
+            fuse, bm25_result, dense_hits, top_k, alpha, metadata_filter
+        )
+        
+        total_time = time.perf_counter() - start_time
+        timings = {
+            'bm25': bm25_time,
+            'dense': dense_time,
+            'fusion': fusion_time,
+            'total': total_time,
+            'parallel': self.config.HYBRID_PARALLEL,
+        }
+        self._attach_timings(formatted_results, timings)
+        
+        print(f"🔍 Hybrid 검색 완료: {len(formatted_results)}개 ({fusion}, alpha={alpha}, {total_time:.3f}초 "
+              f"= BM25 {bm25_time:.3f} / 임베딩 {dense_time:.3f}"
+              f"{' 병렬' if self.config.HYBRID_PARALLEL else ' 순차'}"
+              f"{'' if metadata_filter is None else f', 필터 {len(metadata_filter)}개 문서'})")
         return formatted_results
 
     @traceable(
         name="RAG_Hybrid_Search_Rerank",
         metadata={"component": "retriever", "version": "3.0"}
     )
-    def hybrid_search_with_rerank(self, query, top_k=None, alpha=0.5, rerank_candidates=None):
+    @_pinned_state
+    def hybrid_search_with_rerank(self, query, top_k=None, alpha=0.5, rerank_candidates=None, fusion="alpha",
+                                  filter=None):
         """
         Hybrid Search + Re-ranking
         
@@ -193,6 +1052,8 @@ class RAGRetriever:
             top_k: 최종 반환할 문서 수
             alpha: BM25/임베딩 가중치
             rerank_candidates: Re-rank할 후보 수 (None이면 top_k * 3)
+            fusion: 후보 검색의 점수 결합 방식 ("alpha" / "rrf")
+            filter: 메타데이터 사전 필터 (hybrid_search와 같은 형식)
         """
         start_time = time.time()
         
@@ -202,37 +1063,207 @@ class RAGRetriever:
         if rerank_candidates is None:
             rerank_candidates = top_k * 3
         
-        # 1. Hybrid Search로 후보 문서 가져오기
-        candidates = self.hybrid_search(query, top_k=rerank_candidates, alpha=alpha)
+        cache_key = (self._rerank_mode(fusion), normalize_query(query), top_k, alpha, rerank_candidates)
+        cache_key += self._filter_key(filter)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        
+        # 1. Hybrid Search로 후보 문서 가져오기 (+ MMR 다양성 선택)
+        candidates = self.hybrid_search(
+            query, top_k=rerank_candidates, alpha=alpha, fusion=fusion, filter=filter
+        )
+        candidates = self._diversify(candidates, top_k)
         
         # 2. Re-ranking
+        rerank_start = time.time()
         if len(candidates) > 0:
             results = self._rerank(query, candidates, top_k)
         else:
             results = []
         
+        return self._finish_rerank(cache_key, candidates, results, start_time, rerank_start)
+
+    @staticmethod
+    def _rerank_mode(fusion):
+        """Re-rank 결과 캐시 키의 모드 이름 (search_with_mode / search_many와 공유)"""
+        return "hybrid_rrf_rerank" if fusion == "rrf" else "hybrid_rerank"
+
+    def _finish_rerank(self, cache_key, candidates, results, start_time, rerank_start):
+        """Re-rank 소요 시간 기록 + 결과 캐시 저장 (동기/비동기 공통)"""
         end_time = time.time()
+        for doc in results:
+            doc['timings'].update(rerank=end_time - rerank_start, total=end_time - start_time)
         print(f"🔄 Re-ranking 완료: {len(candidates)}개 → {len(results)}개 ({end_time-start_time:.3f}초)")
         
+        self._put_cached_results(cache_key, results)
         return results
 
-    def search_with_mode(self, query, top_k=None, mode="hybrid_rerank", alpha=0.5):
-        """검색 모드 선택"""
+    @_pinned_state
+    def search_with_mode(self, query, top_k=None, mode="hybrid_rerank", alpha=0.5, filter=None):
+        """
+        검색 모드 선택 (결과 캐시 사용)
+        
+        mode: "embedding" / "bm25" / "hybrid" / "hybrid_rerank"
+              / "hybrid_rrf" / "hybrid_rrf_rerank" (RRF 결합)
+        filter: 메타데이터 사전 필터 (모든 모드 공통, 조건을 만족하는 문서 안에서만 검색)
+        """
+        if mode == "hybrid_rerank":
+            # hybrid_search_with_rerank 자체가 캐시됨
+            return self.hybrid_search_with_rerank(query, top_k, alpha, filter=filter)
+        if mode == "hybrid_rrf_rerank":
+            return self.hybrid_search_with_rerank(query, top_k, alpha, fusion="rrf", filter=filter)
+        
+        if top_k is None:
+            top_k = self.config.DEFAULT_TOP_K
+        
+        cache_key = (mode, normalize_query(query), top_k, alpha) + self._filter_key(filter)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        
         if mode == "embedding":
-            return self.search(query, top_k)
+            results = self.search(query, top_k, filter_metadata=filter)
         elif mode == "bm25":
-            return self.hybrid_search(query, top_k, alpha=0.0)
+            results = self.hybrid_search(query, top_k, alpha=0.0, filter=filter)
         elif mode == "hybrid":
-            return self.hybrid_search(query, top_k, alpha=alpha)
-        elif mode == "hybrid_rerank":
-            return self.hybrid_search_with_rerank(query, top_k, alpha)
+            results = self.hybrid_search(query, top_k, alpha=alpha, filter=filter)
+        elif mode == "hybrid_rrf":
+            results = self.hybrid_search(query, top_k, alpha=alpha, fusion="rrf", filter=filter)
+        else:
+            raise ValueError(f"Unknown mode: {mode}")
+        
+        self._put_cached_results(cache_key, results)
+        return results
+
+    @_pinned_state
+    def search_many(self, queries, top_k=None, mode="hybrid_rerank", alpha=0.5):
+        """
+        여러 질의 일괄 검색 (search_with_mode를 질의마다 호출한 것과 같은 결과)
+        
+        질의 임베딩은 배치 요청 한 번, BM25는 질의 x 문서 점수 행렬,
+        Re-ranking은 모든 (질의, 후보) 쌍을 큰 CrossEncoder 배치로 계산합니다.
+        결과 캐시도 질의별로 그대로 사용합니다.
+        
+        Args:
+            queries: 검색 쿼리 리스트
+            top_k: 질의별 반환할 문서 수
+            mode: search_with_mode와 같은 검색 모드
+            alpha: 임베딩 가중치
+        
+        Returns:
+            질의별 검색 결과 리스트
+        """
+        start_time = time.time()
+        
+        if top_k is None:
+            top_k = self.config.DEFAULT_TOP_K
+        
+        rerank_candidates = top_k * 3
+        
+        rerank = mode in ("hybrid_rerank", "hybrid_rrf_rerank")
+        fusion = "rrf" if mode in ("hybrid_rrf", "hybrid_rrf_rerank") else "alpha"
+        
+        if rerank:
+            make_key = lambda q: (mode, normalize_query(q), top_k, alpha, rerank_candidates)
+        elif mode in ("embedding", "bm25", "hybrid", "hybrid_rrf"):
+            make_key = lambda q: (mode, normalize_query(q), top_k, alpha)
         else:
             raise ValueError(f"Unknown mode: {mode}")
+        
+        # 1. 결과 캐시 조회 (캐시 키가 같은 질의는 처음 나온 질의로 한 번만 검색)
+        keys = [make_key(query) for query in queries]
+        results = [self._get_cached_results(key) for key in keys]
+        first_index = {}
+        for i, cached in enumerate(results):
+            if cached is None:
+                first_index.setdefault(keys[i], i)
+        pending = list(first_index.values())
+        
+        if pending:
+            pending_queries = [queries[i] for i in pending]
+            
+            # 2. 질의 임베딩 (배치 요청 한 번)
+            query_vectors = self._embed_queries(pending_queries)
+            
+            # 3. 모드별 검색
+            if mode == "embedding":
+                computed = [self._search_by_vector(vector, top_k) for vector in query_vectors]
+            else:
+                hybrid_top_k = rerank_candidates if rerank else top_k
+                hybrid_alpha = 0.0 if mode == "bm25" else alpha
+                computed = self._hybrid_search_batch(
+                    pending_queries, query_vectors, hybrid_top_k, hybrid_alpha, fusion
+                )
+                
+                # 4. Re-ranking (MMR 선택 후 모든 쌍을 한 번에, 소요 시간은 질의 수로 나눠 기록)
+                if rerank:
+                    computed = [self._diversify(candidates, top_k) for candidates in computed]
+                    computed, rerank_time = self._timed(
+                        self._rerank_many, pending_queries, computed, top_k
+                    )
+                    for query_results in computed:
+                        for doc in query_results:
+                            doc['timings']['rerank'] = rerank_time / len(pending)
+                            doc['timings']['total'] += rerank_time / len(pending)
+            
+            # 5. 결과 캐시 저장, 같은 키의 나머지 질의는 캐시 복사본 사용
+            for i, query_results in zip(pending, computed):
+                self._put_cached_results(keys[i], query_results)
+                results[i] = query_results
+            
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = copy.deepcopy(results[first_index[key]])
+        
+        end_time = time.time()
+        print(f"🔍 일괄 검색 완료: {len(queries)}개 질의 (새로 검색 {len(pending)}개, "
+              f"mode={mode}, {end_time-start_time:.3f}초)")
+        return results
+
+    def _hybrid_search_batch(self, queries, query_vectors, top_k, alpha, fusion="alpha"):
+        """
+        임베딩된 여러 질의의 hybrid 검색 (hybrid_search와 같은 결과)
+        
+        BM25는 질의 묶음 단위로 계산되어 묶음의 첫 질의에서 시간이 몰리므로,
+        전체 BM25 시간을 질의 수로 나눠 각 질의의 timings['bm25']로 기록합니다.
+        """
+        tokenized_queries = [self.tokenize_query(query) for query in queries]
+        n_dense = self._n_candidates(top_k)
+        
+        bm25_rows = self._bm25_stage_many(tokenized_queries, fusion, n_dense)
+        fuse = self._rrf_fuse_and_format if fusion == "rrf" else self._fuse_and_format
+        
+        results = []
+        stage_times = []
+        bm25_total = 0.0
+        for vector in query_vectors:
+            bm25_result, bm25_time = self._timed(next, bm25_rows)
+            bm25_total += bm25_time
+            dense_hits, dense_time = self._timed(self._dense_search, vector, n_dense)
+            formatted_results, fusion_time = self._timed(
+                fuse, bm25_result, dense_hits, top_k, alpha
+            )
+            results.append(formatted_results)
+            stage_times.append((dense_time, fusion_time))
+        
+        bm25_time = bm25_total / len(results) if results else 0.0
+        for formatted_results, (dense_time, fusion_time) in zip(results, stage_times):
+            self._attach_timings(formatted_results, {
+                'bm25': bm25_time,
+                'dense': dense_time,
+                'fusion': fusion_time,
+                'total': bm25_time + dense_time + fusion_time,
+                'parallel': False,
+            })
+        
+        return results
 
     @traceable(
         name="RAG_Retriever_Search",
         metadata={"component": "retriever", "version": "1.0"}
     )
+    @_pinned_state
     def search(self, query: str, top_k: int = None, filter_metadata: dict = None):
         """
         유사 문서 검색 (임베딩 기반)
@@ -241,18 +1272,57 @@ class RAGRetriever:
         if top_k is None:
             top_k = self.config.DEFAULT_TOP_K
 
-        if filter_metadata:
-            results = self.vectorstore.similarity_search_with_score(
-                query, k=top_k, filter=filter_metadata
-            )
-        else:
-            results = self.vectorstore.similarity_search_with_score(
-                query, k=top_k
-            )
+        query_vector = self.embeddings.embed_query(query)
+        formatted_results = self._search_by_vector(query_vector, top_k, filter_metadata)
+
+        end_time = time.time()
+        print(f"🔍 검색 완료: {len(formatted_results)}개 ({end_time-start_time:.3f}초)")
+        return formatted_results
+
+    def _search_by_vector(self, query_vector, top_k, filter_metadata=None):
+        """
+        질의 벡터로 임베딩 검색 결과 생성
+        
+        메타데이터 필터는 허용 문서 위치로 바꿔 임베딩 인덱스의 해당 행만 검색하고,
+        chroma 백엔드는 허용 값 목록 where 조건으로 Chroma에서 처리합니다.
+        """
+        metadata_filter = self._resolve_filter(filter_metadata)
+        if metadata_filter is not None and len(metadata_filter) == 0:
+            return []
+        
+        if self.config.DENSE_BACKEND != "chroma":
+            positions, distances = self._exact_dense_search(query_vector, top_k, metadata_filter)
+            return [
+                self._format_position_result(idx, distance)
+                for idx, distance in zip(positions, distances)
+            ]
+
+        results = self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+            query_vector, k=top_k,
+            filter=None if metadata_filter is None else metadata_filter.chroma_where()
+        )
+        return self._format_embedding_results(results)
 
+    def _format_position_result(self, idx, distance):
+        """위치 idx의 문서를 임베딩 검색 결과 형식으로 변환"""
+        metadata = self.doc_metadatas[idx]
+        return {
+            'id': self.doc_ids[idx],
+            'content': self.doc_texts[idx],
+            'metadata': metadata,
+            'distance': float(distance),
+            'relevance_score': 1 - float(distance),
+            'filename': metadata.get('파일명', 'N/A'),
+            'organization': metadata.get('발주 기관', 'N/A')
+        }
+
+    @staticmethod
+    def _format_embedding_results(results):
+        """(Document, distance) 리스트를 임베딩 검색 결과 형식으로 변환"""
         formatted_results = []
         for doc, score in results:
             formatted_results.append({
+                'id': getattr(doc, 'id', None),
                 'content': doc.page_content,
                 'metadata': doc.metadata,
                 'distance': score,
@@ -260,11 +1330,9 @@ class RAGRetriever:
                 'filename': doc.metadata.get('파일명', 'N/A'),
                 'organization': doc.metadata.get('발주 기관', 'N/A')
             })
-
-        end_time = time.time()
-        print(f"🔍 검색 완료: {len(results)}개 ({end_time-start_time:.3f}초)")
         return formatted_results
 
+    @_pinned_state
     def search_with_rerank(self, query, top_k=None, rerank_candidates=None):
         """
         임베딩 검색 + Re-ranking
@@ -285,6 +1353,11 @@ class RAGRetriever:
         if rerank_candidates is None:
             rerank_candidates = top_k * 3
         
+        cache_key = ("embedding_rerank", normalize_query(query), top_k, rerank_candidates)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        
         # 1. 임베딩 검색으로 후보 가져오기
         candidates = self.search(query, top_k=rerank_candidates)
         
@@ -297,8 +1370,146 @@ class RAGRetriever:
         end_time = time.time()
         print(f"🔄 Embedding + Re-ranking 완료: {len(candidates)}개 → {len(results)}개 ({end_time-start_time:.3f}초)")
         
+        self._put_cached_results(cache_key, results)
         return results
 
+    # ============================================================
+    # 비동기 API
+    # ============================================================
+    # 질의 임베딩은 비동기 OpenAI 클라이언트로, BM25/CrossEncoder/Chroma 조회는
+    # 검색기 스레드 풀에서 실행하여 이벤트 루프 하나가 여러 요청을 동시에 처리합니다.
+
+    async def _run_in_executor(self, fn, *args, **kwargs):
+        """동기 함수를 검색기 스레드 풀에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        )
+
+    async def _aensure_components(self, *components):
+        """아직 초기화하지 않은 구성 요소를 스레드 풀에서 초기화 (모델/인덱스 로드가 이벤트 루프를 막지 않도록)"""
+        pending = [name for name in components if not self.is_ready(name)]
+        if pending:
+            await self._run_in_executor(self.warmup, pending)
+
+    async def _adense_stage(self, query, k, metadata_filter=None):
+        """비동기 질의 임베딩 + 임베딩 검색 → (문서 위치 배열, 원본 유사도 배열)"""
+        query_vector = await self.embeddings.aembed_query(query)
+        return await self._run_in_executor(self._dense_search, query_vector, k, metadata_filter)
+
+    async def _atimed(self, coro):
+        """(코루틴 결과, 실행 시간(초))"""
+        start = time.perf_counter()
+        result = await coro
+        return result, time.perf_counter() - start
+
+    @traceable(
+        name="RAG_Retriever_Search_Async",
+        metadata={"component": "retriever", "version": "1.0"}
+    )
+    @_pinned_state
+    async def asearch(self, query: str, top_k: int = None, filter_metadata: dict = None):
+        """유사 문서 검색 (임베딩 기반, search의 비동기 버전)"""
+        start_time = time.time()
+        if top_k is None:
+            top_k = self.config.DEFAULT_TOP_K
+
+        await self._aensure_components('embeddings')
+        query_vector = await self.embeddings.aembed_query(query)
+        formatted_results = await self._run_in_executor(
+            self._search_by_vector, query_vector, top_k, filter_metadata
+        )
+
+        end_time = time.time()
+        print(f"🔍 검색 완료: {len(formatted_results)}개 ({end_time-start_time:.3f}초)")
+        return formatted_results
+
+    @traceable(
+        name="RAG_Hybrid_Search_Async",
+        metadata={"component": "retriever", "version": "2.0"}
+    )
+    @_pinned_state
+    async def ahybrid_search(self, query, top_k=None, alpha=0.5, fusion="alpha", filter=None):
+        """Hybrid Search (hybrid_search의 비동기 버전)"""
+        start_time = time.perf_counter()
+        self._check_fusion(fusion)
+        
+        if top_k is None:
+            top_k = self.config.DEFAULT_TOP_K
+        
+        await self._aensure_components('embeddings', 'bm25')
+        metadata_filter = self._resolve_filter(filter)
+        if metadata_filter is not None and len(metadata_filter) == 0:
+            print("🔍 Hybrid 검색: 필터 조건을 만족하는 문서가 없습니다")
+            return []
+        
+        n_dense = self._n_candidates(top_k, metadata_filter)
+        
+        def bm25_task():
+            return self._run_in_executor(
+                self._timed, self._bm25_stage, query, fusion, n_dense, metadata_filter
+            )
+        
+        def dense_task():
+            return self._atimed(self._adense_stage(query, n_dense, metadata_filter))
+        
+        # 1~2. BM25 검색(스레드 풀)과 임베딩 검색(비동기 I/O)
+        # 순차 실행에서는 BM25가 끝난 뒤에 임베딩 코루틴을 만듦 (BM25 실패 시 대기 코루틴이 남지 않도록)
+        if self.config.HYBRID_PARALLEL:
+            (bm25_result, bm25_time), (dense_hits, dense_time) = await asyncio.gather(
+                bm25_task(), dense_task()
+            )
+        else:
+            bm25_result, bm25_time = await bm25_task()
+            dense_hits, dense_time = await dense_task()
+        
+        # 3. 점수 결합, 상위 k개 선택 및 포맷팅
+        # (스레드 풀에서: union 점수 계산은 임베딩 인덱스를 처음 로드/내보낼 수 있음)
+        return await self._run_in_executor(
+            self._finish_hybrid,
+            bm25_result, dense_hits, top_k, alpha, bm25_time, dense_time, start_time, fusion,
+            metadata_filter
+        )
+
+    @traceable(
+        name="RAG_Hybrid_Search_Rerank_Async",
+        metadata={"component": "retriever", "version": "3.0"}
+    )
+    @_pinned_state
+    async def ahybrid_search_with_rerank(self, query, top_k=None, alpha=0.5, rerank_candidates=None,
+                                         fusion="alpha", filter=None):
+        """Hybrid Search + Re-ranking (hybrid_search_with_rerank의 비동기 버전, 결과 캐시 공유)"""
+        start_time = time.time()
+        
+        if top_k is None:
+            top_k = self.config.DEFAULT_TOP_K
+        
+        if rerank_candidates is None:
+            rerank_candidates = top_k * 3
+        
+        cache_key = (self._rerank_mode(fusion), normalize_query(query), top_k, alpha, rerank_candidates)
+        cache_key += self._filter_key(filter)
+        # 인덱스 재구축 확인(재로드)도 스레드 풀에서
+        cached = await self._run_in_executor(self._get_cached_results, cache_key)
+        if cached is not None:
+            return cached
+        
+        # 1. Hybrid Search로 후보 문서 가져오기 (+ MMR 다양성 선택)
+        candidates = await self.ahybrid_search(
+            query, top_k=rerank_candidates, alpha=alpha, fusion=fusion, filter=filter
+        )
+        candidates = await self._run_in_executor(self._diversify, candidates, top_k)
+        
+        # 2. Re-ranking (CrossEncoder는 스레드 풀에서)
+        rerank_start = time.time()
+        if len(candidates) > 0:
+            results = await self._run_in_executor(self._rerank, query, candidates, top_k)
+        else:
+            results = []
+        
+        return self._finish_rerank(cache_key, candidates, results, start_time, rerank_start)
+
+    @_pinned_state
     def search_by_organization(self, query: str, organization: str, top_k: int = None):
         """특정 발주기관만 검색"""
         return self.search(
@@ -0,0 +1,201 @@
+"""
+검색기 스냅샷 (단일 파일)
+
+검색기 시작에 필요한 문서 상태(청크 ID, 본문, 메타데이터)와 BM25 통계를
+임베딩 단계에서 파일 하나로 저장하고, 검색기는 np.memmap 한 번으로 매핑합니다.
+ChromaDB 전체 덤프(get)와 Python 객체 재구성 없이 시작할 수 있습니다.
+
+파일 구조:
+    MAGIC(8바이트) | 헤더 길이(uint64) | 헤더 JSON | 배열 영역 (각 배열 64바이트 정렬)
+
+헤더에는 메타데이터와 배열별 (dtype, shape, 오프셋)을 기록합니다.
+문자열 목록은 UTF-8 바이트 배열 + 오프셋 배열(TextStore)로,
+메타데이터는 필드별 정수 코드 + 고유 값 테이블(사전 인코딩)로 저장합니다.
+"""
+
+import os
+import json
+import uuid
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from src.retriever.bm25_index import BM25Index, corpus_fingerprint
+from src.retriever.metadata_store import MetadataStore
+from src.retriever.text_store import TextStore
+
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_MAGIC = b"RAGSNAP1"
+_ALIGNMENT = 64
+
+
+class RetrieverSnapshot:
+    """검색기 시작 상태 (ID / 본문 / 메타데이터 / BM25)"""
+
+    def __init__(self, ids, texts, metadata, bm25_index, meta):
+        """
+        Args:
+            ids: 청크 ID TextStore (Chroma get() 순서 = BM25 문서 순서)
+            texts: 청크 본문 TextStore
+            metadata: 컬럼형 메타데이터 (MetadataStore)
+            bm25_index: 같은 문서 순서의 BM25Index
+            meta: 스냅샷 메타데이터
+        """
+        self.ids = ids
+        self.texts = texts
+        self.metadata = metadata
+        self.bm25_index = bm25_index
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def version(self):
+        """스냅샷 빌드 식별자"""
+        return self.meta['build_id']
+
+    # === 구축 ===
+
+    @classmethod
+    def build(cls, ids, texts, metadatas, bm25_index, extra_meta=None):
+        """Chroma 덤프 순서의 문서 목록과 같은 순서로 만든 BM25 인덱스로 스냅샷 생성"""
+        if not (len(ids) == len(texts) == len(metadatas) == bm25_index.corpus_size):
+            raise ValueError("스냅샷 데이터 길이 불일치")
+
+        meta = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'build_id': uuid.uuid4().hex,
+            'created_at': datetime.now().isoformat(),
+            'n_docs': len(ids),
+            'corpus_fingerprint': corpus_fingerprint(ids),
+            'bm25': bm25_index.meta,
+        }
+        meta.update(extra_meta or {})
+
+        return cls(
+            ids=TextStore.from_strings(ids),
+            texts=TextStore.from_strings(texts),
+            metadata=MetadataStore.from_dicts(metadatas or [{} for _ in ids]),
+            bm25_index=bm25_index,
+            meta=meta,
+        )
+
+    # === 저장 / 로드 ===
+
+    def _arrays(self):
+        arrays = {
+            'ids_blob': self.ids.blob,
+            'ids_offsets': self.ids.offsets,
+            'texts_blob': self.texts.blob,
+            'texts_offsets': self.texts.offsets,
+        }
+        for field_no, (codes, values) in enumerate(self.metadata.columns.values()):
+            table = TextStore.from_strings(
+                [json.dumps(value, ensure_ascii=False) for value in values]
+            )
+            arrays[f'meta{field_no}_codes'] = codes
+            arrays[f'meta{field_no}_values_blob'] = table.blob
+            arrays[f'meta{field_no}_values_offsets'] = table.offsets
+        for name, array in self.bm25_index.arrays().items():
+            arrays[f'bm25_{name}'] = array
+        return arrays
+
+    def save(self, path):
+        """파일 하나로 저장 (임시 파일에 쓴 뒤 교체)"""
+        arrays = {name: np.ascontiguousarray(array) for name, array in self._arrays().items()}
+
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+            layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset += array.nbytes
+
+        header = json.dumps({
+            'meta': self.meta,
+            'metadata_fields': self.metadata.fields,
+            'arrays': layout,
+        }, ensure_ascii=False).encode('utf-8')
+        data_start = -(-(len(_MAGIC) + 8 + len(header)) // _ALIGNMENT) * _ALIGNMENT
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+        with open(tmp_path, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name]['offset'])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_header(f):
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("검색기 스냅샷 파일 형식이 아닙니다")
+        (header_len,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_len).decode('utf-8'))
+        data_start = -(-(len(_MAGIC) + 8 + header_len) // _ALIGNMENT) * _ALIGNMENT
+        return header, data_start
+
+    @classmethod
+    def read_meta(cls, path):
+        """메타데이터만 읽기 (없으면 None)"""
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            header, _ = cls._read_header(f)
+        return header['meta']
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """저장된 스냅샷 로드 (기본: 파일 전체를 한 번 메모리 매핑)"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"검색기 스냅샷을 찾을 수 없습니다: {path}")
+
+        with open(path, 'rb') as f:
+            header, data_start = cls._read_header(f)
+
+        meta = header['meta']
+        if meta.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"검색기 스냅샷 버전 불일치: {meta.get('format_version')} "
+                f"(필요: {SNAPSHOT_FORMAT_VERSION})"
+            )
+
+        if mmap:
+            buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        else:
+            buffer = np.fromfile(path, dtype=np.uint8)
+
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            start = data_start + spec['offset']
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            arrays[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+
+        metadata_columns = {}
+        for field_no, field in enumerate(header['metadata_fields']):
+            values = TextStore(
+                arrays[f'meta{field_no}_values_blob'], arrays[f'meta{field_no}_values_offsets']
+            )
+            metadata_columns[field] = (
+                arrays[f'meta{field_no}_codes'],
+                [json.loads(value) for value in values.tolist()],
+            )
+
+        bm25_arrays = {name[len('bm25_'):]: array for name, array in arrays.items() if name.startswith('bm25_')}
+
+        return cls(
+            ids=TextStore(arrays['ids_blob'], arrays['ids_offsets']),
+            texts=TextStore(arrays['texts_blob'], arrays['texts_offsets']),
+            metadata=MetadataStore(metadata_columns, len(arrays['ids_offsets']) - 1),
+            bm25_index=BM25Index.from_arrays(bm25_arrays, meta['bm25']),
+            meta=meta,
+        )
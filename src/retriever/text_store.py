@@ -0,0 +1,49 @@
+"""
+오프셋 인덱스 UTF-8 문자열 저장소
+
+청크 본문 전체를 바이트 배열 하나(blob)와 int64 오프셋 배열로 보관하고,
+i번째 문자열은 접근할 때만 디코딩합니다. 검색기 스냅샷에서 로드하면 두 배열 모두
+메모리 매핑 상태이므로 최종 후보의 본문만 페이지 단위로 읽습니다.
+"""
+
+import numpy as np
+
+
+class TextStore:
+    """UTF-8 바이트 배열 + 오프셋 배열로 저장한 문자열 목록 (i번째만 디코딩)"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def take(self, positions):
+        """여러 위치의 문자열 목록"""
+        return [self[i] for i in positions]
+
+    def tolist(self):
+        """전체 문자열 리스트 (한 번에 디코딩)"""
+        data = self.blob.tobytes()
+        offsets = self.offsets.tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+    @property
+    def nbytes(self):
+        return self.blob.nbytes + self.offsets.nbytes
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(blob, offsets)
@@ -0,0 +1,184 @@
+"""
+BM25용 토크나이저
+
+- whitespace: 공백 분리 (기존 str.split()과 동일)
+- char_ngram: 어절별 문자 n-gram ("사업의" → "사업", "업의")
+- josa: 사전 없이 어절 끝의 조사를 떼어내는 정규화 ("사업의" → "사업")
+
+코퍼스 토큰 스트림은 (토크나이저, 코퍼스) 단위로 디스크에 캐시하여
+인덱스를 다시 만들 때 재토큰화하지 않습니다. 질의 토큰화는 LRU 캐시를 씁니다.
+"""
+
+import os
+import re
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# 긴 조사부터 매칭
+_JOSA_SUFFIXES = sorted([
+    "으로부터", "에서부터", "로부터", "에게서", "으로서", "으로써", "이라는", "이라고",
+    "에서는", "에서도", "에게는", "으로는", "까지는", "부터는", "에서", "에게", "께서",
+    "으로", "로서", "로써", "라는", "라고", "까지", "부터", "보다", "처럼", "만큼",
+    "이나", "이며", "이고", "과의", "와의", "에는", "에도", "은", "는", "이", "가",
+    "을", "를", "의", "에", "와", "과", "도", "로", "만", "나",
+], key=len, reverse=True)
+
+
+class WhitespaceTokenizer:
+    """공백 분리 토크나이저"""
+
+    name = "whitespace"
+
+    @property
+    def signature(self):
+        return self.name
+
+    def tokenize(self, text):
+        return text.split()
+
+
+class CharNgramTokenizer:
+    """어절 단위 문자 n-gram 토크나이저 (n보다 짧은 어절은 그대로)"""
+
+    name = "char_ngram"
+
+    def __init__(self, n=2):
+        self.n = n
+
+    @property
+    def signature(self):
+        return f"{self.name}:n={self.n}"
+
+    def tokenize(self, text):
+        n = self.n
+        tokens = []
+        for word in _WORD_PATTERN.findall(text.lower()):
+            if len(word) <= n:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+        return tokens
+
+
+class JosaStripTokenizer:
+    """어절 끝 조사 제거 토크나이저 (어간이 min_stem_length 이상 남을 때만)"""
+
+    name = "josa"
+
+    def __init__(self, min_stem_length=2):
+        self.min_stem_length = min_stem_length
+
+    @property
+    def signature(self):
+        return f"{self.name}:min_stem={self.min_stem_length}"
+
+    def _strip(self, word):
+        for suffix in _JOSA_SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= self.min_stem_length:
+                return word[:-len(suffix)]
+        return word
+
+    def tokenize(self, text):
+        return [self._strip(word) for word in _WORD_PATTERN.findall(text.lower())]
+
+
+def get_tokenizer(config):
+    """RAGConfig.BM25_TOKENIZER에 맞는 토크나이저 생성"""
+    name = config.BM25_TOKENIZER
+
+    if name == "whitespace":
+        return WhitespaceTokenizer()
+    elif name == "char_ngram":
+        return CharNgramTokenizer(n=config.BM25_NGRAM_SIZE)
+    elif name == "josa":
+        return JosaStripTokenizer()
+    else:
+        raise ValueError(f"Unknown tokenizer: {name}")
+
+
+class QueryTokenizer:
+    """질의 토큰화 LRU 캐시"""
+
+    def __init__(self, tokenizer, maxsize=1024):
+        self.tokenizer = tokenizer
+        self._tokenize = lru_cache(maxsize=maxsize)(lambda text: tuple(tokenizer.tokenize(text)))
+
+    def __call__(self, query):
+        return list(self._tokenize(query))
+
+
+# ============================================================
+# 코퍼스 토큰 스트림 디스크 캐시
+# ============================================================
+
+def _cache_key(tokenizer, doc_ids, texts):
+    digest = hashlib.sha1(tokenizer.signature.encode('utf-8'))
+    for doc_id, text in zip(doc_ids, texts):
+        digest.update(str(doc_id).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:20]
+
+
+def _save_token_streams(path, tokenized_docs):
+    vocab = {}
+    token_ids = [vocab.setdefault(token, len(vocab)) for doc in tokenized_docs for token in doc]
+    offsets = np.zeros(len(tokenized_docs) + 1, dtype=np.int64)
+    np.cumsum([len(doc) for doc in tokenized_docs], out=offsets[1:])
+
+    # 토큰에는 공백이 없으므로 어휘는 줄바꿈으로 이어 UTF-8 바이트로 저장
+    vocab_blob = np.frombuffer("\n".join(vocab).encode('utf-8'), dtype=np.uint8)
+
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(
+        tmp_path,
+        vocab=vocab_blob,
+        tokens=np.array(token_ids, dtype=np.int32),
+        offsets=offsets,
+    )
+    os.replace(tmp_path, path)
+
+
+def _load_token_streams(path):
+    with np.load(path) as data:
+        vocab = data['vocab'].tobytes().decode('utf-8').split("\n")
+        tokens = data['tokens'].tolist()
+        offsets = data['offsets'].tolist()
+
+    return [
+        [vocab[t] for t in tokens[offsets[i]:offsets[i + 1]]]
+        for i in range(len(offsets) - 1)
+    ]
+
+
+def tokenize_corpus(tokenizer, doc_ids, texts, cache_dir=None):
+    """
+    코퍼스 토큰화 (디스크 캐시 사용)
+
+    캐시 키는 토크나이저 설정과 (문서 ID, 본문) 전체의 해시이므로
+    코퍼스나 토크나이저가 바뀌면 자동으로 새로 만듭니다.
+    """
+    if cache_dir is None:
+        return [tokenizer.tokenize(text) for text in texts]
+
+    path = os.path.join(cache_dir, f"{_cache_key(tokenizer, doc_ids, texts)}.npz")
+
+    if os.path.exists(path):
+        print(f"✅ 토큰 캐시 사용: {path}")
+        return _load_token_streams(path)
+
+    tokenized_docs = [tokenizer.tokenize(text) for text in texts]
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _save_token_streams(path, tokenized_docs)
+    except OSError as e:
+        print(f"⚠️ 토큰 캐시 저장 실패: {e}")
+
+    return tokenized_docs
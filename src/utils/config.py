@@ -10,6 +10,8 @@ class Config:
         load_dotenv()
         
         # ===== API 키 =====
+        # 임베딩 제공자: "openai" / "local" (sentence-transformers, CPU - API 키 없이 검색 가능)
+        self.EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
         self.OPENAI_API_KEY = self._get_api_key()
         
         # ===== 경로 설정 =====
@@ -29,21 +31,101 @@ class Config:
         self.MIN_TEXT_LENGTH = 100
         
         # ===== 임베딩 설정 =====
-        self.EMBEDDING_MODEL_NAME = "text-embedding-3-small"
+        self.EMBEDDING_MODEL_NAME = os.getenv(
+            "EMBEDDING_MODEL_NAME",
+            "text-embedding-3-small" if self.EMBEDDING_PROVIDER == "openai" else "intfloat/multilingual-e5-base"
+        )
+        # Matryoshka 차원 축소 (예: 256, 512 - 앞쪽 차원만 저장 후 재정규화, 0이면 전체 차원)
+        self.EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None
+        self.LOCAL_EMBEDDING_BACKEND = os.getenv("LOCAL_EMBEDDING_BACKEND", "torch")  # "torch" / "onnx"
+        self.LOCAL_EMBEDDING_BATCH_SIZE = 32
         self.BATCH_SIZE = 50
         self.MAX_TOKENS_PER_BATCH = 250000
         
+        # 임베딩 디스크 캐시 (빈 문자열이면 비활성화)
+        self.EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3")
+        
         # 청크 검증 기준
         self.MIN_CHUNK_LENGTH = 10
         self.MAX_CHUNK_LENGTH = 10000
         
         # ===== 벡터 DB 설정 =====
-        self.COLLECTION_NAME = "rag_documents"
+        self.COLLECTION_NAME = os.getenv("COLLECTION_NAME", "rag_documents")
+        
+        # 임베딩 검색 백엔드: "chroma" (HNSW) / "exact" (메모리 매핑 행렬 전수 검색)
+        #                    / "int8", "binary" (양자화 코드 1차 검색 + float 재채점)
+        self.DENSE_BACKEND = os.getenv("DENSE_BACKEND", "chroma")
+        self.DENSE_INDEX_DIRECTORY = os.getenv(
+            "DENSE_INDEX_PATH", os.path.join(self.DB_DIRECTORY, "dense_index")
+        )
+        self.DENSE_INDEX_DTYPE = os.getenv("DENSE_INDEX_DTYPE", "float32")  # "float32" / "float16" (메모리 절반, 변환 비용)
+        self.DENSE_RESCORE_FACTOR = 10  # 양자화 백엔드: top_k * 배수만큼 후보를 float로 재채점
+        
+        # ===== BM25 인덱스 설정 =====
+        # 임베딩 단계에서 chroma_db 안에 저장, 검색기는 mmap으로 로드
+        self.BM25_INDEX_DIRECTORY = os.getenv(
+            "BM25_INDEX_PATH", os.path.join(self.DB_DIRECTORY, "bm25_index")
+        )
+        # 검색기 스냅샷: 청크 ID/본문/메타데이터 + BM25를 파일 하나로 저장 (시작 시 ChromaDB 덤프 생략)
+        self.RETRIEVER_SNAPSHOT_PATH = os.getenv(
+            "RETRIEVER_SNAPSHOT_PATH", os.path.join(self.DB_DIRECTORY, "retriever_snapshot.bin")
+        )
+        # 토크나이저: "whitespace" / "char_ngram" / "josa" (조사 제거)
+        self.BM25_TOKENIZER = os.getenv("BM25_TOKENIZER", "whitespace")
+        self.BM25_NGRAM_SIZE = 2
+        self.TOKEN_CACHE_DIRECTORY = os.path.join(self.DB_DIRECTORY, "token_cache")
+        self.BM25_K1 = 1.5
+        self.BM25_B = 0.75
+        self.BM25_EPSILON = 0.25
         
         # ===== 검색 설정 =====
         self.DEFAULT_TOP_K = 10
         self.DEFAULT_ALPHA = 0.5
-        self.DEFAULT_SEARCH_MODE = "hybrid_rerank"
+        self.DEFAULT_SEARCH_MODE = "hybrid_rerank"  # hybrid_rrf / hybrid_rrf_rerank: RRF 결합
+        self.RRF_K = 60  # Reciprocal Rank Fusion 상수
+        
+        # BM25 백엔드: "sparse" (전체 문서 채점) / "maxscore" (상위 후보만, MaxScore 가지치기)
+        self.LEXICAL_BACKEND = os.getenv("LEXICAL_BACKEND", "sparse")
+        self.LEXICAL_TOP_K = 300  # maxscore 백엔드의 BM25 후보 수
+        self.BM25_QUERY_BATCH_SIZE = 64  # search_many에서 한 번에 채점할 질의 수
+        
+        # 메타데이터 사전 필터: 검색기 시작 시 값 → 문서 위치 역색인을 미리 만들 필드 (filter= 인자)
+        self.METADATA_FILTER_FIELDS = [
+            "발주 기관", "파일명", "공개 일자", "입찰 참여 시작일", "입찰 참여 마감일"
+        ]
+        
+        # Hybrid 검색 후보 수 = top_k * 배수 (BM25 / 임베딩 검색 각각)
+        self.HYBRID_CANDIDATE_MULTIPLIER = int(os.getenv("HYBRID_CANDIDATE_MULTIPLIER", "3"))
+        # true: BM25 후보 ∪ 임베딩 후보 전체의 임베딩 유사도를 저장된 벡터로 계산 (false: 임베딩 후보 외 0점)
+        self.HYBRID_UNION_SCORING = os.getenv("HYBRID_UNION_SCORING", "false").lower() == "true"
+        
+        # Hybrid 검색에서 BM25(CPU)와 임베딩 검색(네트워크)을 동시에 실행 (false: 순차 실행, 디버깅용)
+        self.HYBRID_PARALLEL = os.getenv("HYBRID_PARALLEL", "true").lower() == "true"
+        self.RETRIEVER_WORKERS = 4  # 검색 단계 병렬 실행 스레드 수
+        
+        # 검색기 구성 요소(임베딩/ChromaDB/BM25/Re-ranker) 초기화 시점
+        # lazy: 처음 사용할 때 / background: 생성 직후 백그라운드로 미리 / eager: 생성자에서 모두 (이전 동작)
+        self.RETRIEVER_WARMUP = os.getenv("RETRIEVER_WARMUP", "background")
+        
+        # Re-rank 전 MMR 다양성 선택 (겹치는 인접 청크 제거, Re-rank 후보 = top_k * 배수)
+        self.MMR_ENABLED = os.getenv("MMR_ENABLED", "false").lower() == "true"
+        self.MMR_LAMBDA = 0.7  # 1이면 관련도 순, 0이면 다양성만
+        self.MMR_CANDIDATE_MULTIPLIER = 2
+        
+        # 검색 결과 캐시 (LRU + TTL, 0이면 비활성화)
+        self.QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "256"))
+        self.QUERY_CACHE_TTL = 3600  # 초
+        
+        # ===== Re-ranker 설정 =====
+        self.RERANKER_MODEL_NAME = "BAAI/bge-reranker-base"
+        # 백엔드: "torch" (CrossEncoder fp32) / "onnx_int8" (onnxruntime CPU, 동적 int8 양자화)
+        self.RERANKER_BACKEND = os.getenv("RERANKER_BACKEND", "torch")
+        # ONNX 내보내기 상위 폴더 (모델 이름별 하위 폴더에 저장)
+        self.RERANKER_ONNX_DIRECTORY = os.getenv("RERANKER_ONNX_PATH", ".cache/reranker_onnx")
+        self.RERANKER_MAX_LENGTH = 512
+        self.RERANK_BATCH_SIZE = 64
+        # (질의, 청크 ID, 모델) → CrossEncoder 점수 캐시 (0이면 비활성화)
+        self.RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "20000"))
         
         # ===== LLM 설정 =====
         self.LLM_MODEL_NAME = "gpt-4o-mini"
@@ -84,6 +166,10 @@ class Config:
         """환경변수에서 API 키 로드"""
         api_key = os.getenv("OPENAI_API_KEY")
         
+        # 로컬 임베딩은 키 없이 동작 (GPT 생성 단계에서만 필요)
+        if not api_key and self.EMBEDDING_PROVIDER == "local":
+            return ""
+        
         if not api_key:
             raise ValueError(
                 "OPENAI_API_KEY가 설정되지 않았습니다.\n"
@@ -112,7 +198,7 @@ class Config:
 
     def validate_rag(self):
         """RAG 설정 유효성 검사"""
-        if not self.OPENAI_API_KEY:
+        if not self.OPENAI_API_KEY and self.EMBEDDING_PROVIDER == "openai":
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다")
         
         return True
@@ -0,0 +1,63 @@
+"""
+MaxScore top-k BM25 동등성
+
+MaxScoreBM25.top_k가 전체 채점(SparseBM25) 후 0점 이하를 뺀 상위 k개와
+같은 문서/점수를 내는지 확인합니다. idf가 0 이하인 용어(df ≥ N/2)도 포함합니다.
+"""
+
+import numpy as np
+import pytest
+
+from src.retriever.bm25_index import BM25Index
+from src.retriever.bm25_maxscore import MaxScoreBM25
+from src.retriever.bm25_sparse import SparseBM25
+from src.retriever.fusion import top_k_positions
+
+
+def expected_top_k(sparse, query, k, allowed=None):
+    """sparse 백엔드와 같은 기준: 전체 점수 상위 k개 중 0점 초과만"""
+    scores = sparse.get_scores(query)
+    if allowed is not None:
+        scores = np.where(allowed, scores, 0.0)
+    positions = top_k_positions(scores, k)
+    positions = positions[scores[positions] > 0]
+    return positions, scores[positions]
+
+
+def assert_same_top_k(corpus, queries, ks, allowed=None):
+    index = BM25Index.build(corpus)
+    sparse, maxscore = SparseBM25(index), MaxScoreBM25(index)
+    for query in queries:
+        for k in ks:
+            positions, scores = maxscore.top_k(query, k, allowed)
+            expected_positions, expected_scores = expected_top_k(sparse, query, k, allowed)
+            np.testing.assert_array_equal(positions, expected_positions)
+            np.testing.assert_allclose(scores, expected_scores, rtol=1e-9, atol=1e-12)
+
+
+def test_zero_idf_term_returns_nothing():
+    # "a"는 df = N/2 → idf = 0, 모든 가중치 0 → sparse와 같이 결과 없음
+    index = BM25Index.build([["a", "b"], ["a"], ["c"], ["d"]])
+    positions, scores = MaxScoreBM25(index).top_k(["a"], 5)
+    assert positions.size == 0 and scores.size == 0
+
+
+def test_non_positive_terms_match_full_scoring():
+    corpus = [["a", "b"], ["a"], ["c"], ["d"], ["a", "c"], ["a", "a", "b"]]
+    queries = [["a"], ["a", "b"], ["a", "c"], ["b", "c", "d"], ["a", "a", "d"], ["없음"]]
+    assert_same_top_k(corpus, queries, ks=[1, 2, 3, 10])
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_random_corpus_matches_full_scoring(seed):
+    rng = np.random.default_rng(seed)
+    # 흔한 어휘(df > N/2 → 음수 idf / epsilon 하한)와 드문 어휘가 섞인 코퍼스
+    corpus = [
+        [f"t{t}" for t in np.minimum(rng.zipf(1.3, size=rng.integers(3, 15)), 40)]
+        for _ in range(60)
+    ]
+    queries = [[f"t{t}" for t in rng.integers(1, 40, size=rng.integers(1, 5))] for _ in range(20)]
+    allowed = rng.random(len(corpus)) < 0.5
+
+    assert_same_top_k(corpus, queries, ks=[1, 5, 20])
+    assert_same_top_k(corpus, queries, ks=[1, 5, 20], allowed=allowed)
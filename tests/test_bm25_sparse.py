@@ -0,0 +1,69 @@
+"""
+CSR BM25 점수 동등성
+
+SparseBM25.get_scores / get_scores_many가 rank_bm25.BM25Okapi.get_scores와
+모든 질의(반복 토큰, 사전에 없는 토큰 포함)에서 같은 점수를 내는지 확인합니다.
+"""
+
+import numpy as np
+import pytest
+
+rank_bm25 = pytest.importorskip("rank_bm25")
+
+from src.retriever.bm25_index import BM25Index
+from src.retriever.bm25_sparse import SparseBM25
+
+
+CORPUS = [
+    ["사업", "예산", "은", "10억", "원"],
+    ["입찰", "참여", "마감일", "은", "5월", "입찰"],
+    ["보안", "요구사항", "과", "보안", "인증"],
+    ["사업", "수행", "기간", "은", "12개월"],
+    ["제안서", "평가", "기준", "과", "배점"],
+    ["하자보수", "기간", "은", "1년"],
+    ["발주", "기관", "담당", "부서"],
+    ["사업", "사업", "사업", "범위"],
+]
+
+QUERIES = [
+    ["사업", "예산"],
+    ["입찰", "입찰", "마감일"],          # 반복 토큰
+    ["보안", "없는토큰"],                # 사전에 없는 토큰
+    ["없는토큰", "또없는토큰"],          # 사전에 없는 토큰만
+    [],
+    ["은", "기간", "은", "사업"],         # 흔한 어휘 (idf 하한 적용) + 반복
+    ["배점", "부서", "12개월", "범위"],
+]
+
+
+@pytest.fixture(scope="module")
+def scorers():
+    reference = rank_bm25.BM25Okapi(CORPUS)
+    sparse = SparseBM25(BM25Index.build(CORPUS))
+    return reference, sparse
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_get_scores_matches_bm25okapi(scorers, query):
+    reference, sparse = scorers
+    np.testing.assert_allclose(sparse.get_scores(query), reference.get_scores(query), rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_get_scores_positions_subset(scorers, query):
+    reference, sparse = scorers
+    positions = np.array([6, 0, 3, 1], dtype=np.int64)
+    np.testing.assert_allclose(
+        sparse.get_scores(query, positions=positions), reference.get_scores(query)[positions],
+        rtol=1e-9, atol=1e-12
+    )
+
+
+def test_get_scores_many_matches_single(scorers):
+    reference, sparse = scorers
+    score_matrix = sparse.get_scores_many(QUERIES)
+
+    assert score_matrix.shape == (len(QUERIES), len(CORPUS))
+    for query, scores in zip(QUERIES, score_matrix):
+        np.testing.assert_array_equal(scores, sparse.get_scores(query))
+        np.testing.assert_allclose(scores, reference.get_scores(query), rtol=1e-9, atol=1e-12)
@@ -0,0 +1,103 @@
+"""
+Chroma 임베딩 검색 결과 → 문서 위치 연결
+
+_chroma_dense_search는 본문이 아니라 청크 ID로 문서 위치를 찾습니다.
+본문이 같은 청크(여러 공고에 반복되는 안내 문구 등)도 각자의 ID/메타데이터와
+각자의 임베딩 점수를 가져야 합니다.
+"""
+
+import pytest
+
+pytest.importorskip("langchain_chroma")
+
+from src.retriever.retriever import RAGRetriever
+from src.utils.config import RAGConfig
+
+
+DUPLICATE_TEXT = "입찰 참가 자격 및 제출 서류 안내"
+
+# (ID, 본문, 메타데이터, 질의와의 거리)
+CHUNKS = [
+    ("chunk_a", DUPLICATE_TEXT, {"파일명": "사업A.hwp", "발주 기관": "기관A"}, 0.1),
+    ("chunk_b", "사업 예산 및 계약 기간", {"파일명": "사업B.hwp", "발주 기관": "기관B"}, 0.5),
+    ("chunk_c", DUPLICATE_TEXT, {"파일명": "사업C.hwp", "발주 기관": "기관C"}, 0.9),
+    ("chunk_d", "제안서 평가 기준", {"파일명": "사업D.hwp", "발주 기관": "기관D"}, 2.0),
+]
+DISTANCES = {chunk_id: distance for chunk_id, _, _, distance in CHUNKS}
+
+
+class FakeCollection:
+    """ID별로 정해진 거리를 돌려주는 메모리 컬렉션 (본문이 같아도 거리는 ID마다 다름)"""
+
+    def query(self, query_embeddings, n_results, include=None, where=None):
+        ranked = sorted(CHUNKS, key=lambda chunk: chunk[3])[:n_results]
+        result = {
+            'ids': [[chunk[0] for chunk in ranked]],
+            'distances': [[chunk[3] for chunk in ranked]],
+        }
+        # 요청하지 않은 본문/메타데이터는 돌려주지 않음 (ID로만 연결되는지 확인)
+        if include and 'documents' in include:
+            result['documents'] = [[chunk[1] for chunk in ranked]]
+        return result
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self._collection = FakeCollection()
+
+    def get(self):
+        return {
+            'ids': [chunk[0] for chunk in CHUNKS],
+            'documents': [chunk[1] for chunk in CHUNKS],
+            'metadatas': [dict(chunk[2]) for chunk in CHUNKS],
+        }
+
+
+class FakeEmbeddings:
+    def embed_query(self, text):
+        return [1.0, 0.0]
+
+    def embed_queries(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+@pytest.fixture
+def retriever(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHROMA_DB_PATH", str(tmp_path))
+    monkeypatch.setenv("EMBEDDING_PROVIDER", "local")
+    monkeypatch.setenv("RETRIEVER_WARMUP", "lazy")
+    monkeypatch.setenv("DENSE_BACKEND", "chroma")
+    monkeypatch.setenv("HYBRID_UNION_SCORING", "false")
+    retriever = RAGRetriever(RAGConfig())
+
+    # 외부 구성 요소(임베딩 모델, ChromaDB)만 메모리 가짜로 대체
+    retriever.embeddings = FakeEmbeddings()
+    retriever.vectorstore = FakeVectorStore()
+    retriever._ready.update({'embeddings', 'vectorstore'})
+    return retriever
+
+
+def test_dense_hits_keep_their_own_id_score(retriever):
+    positions, similarities, _ = retriever._dense_search([1.0, 0.0], k=len(CHUNKS))
+
+    hit_ids = [retriever.doc_ids[position] for position in positions]
+    assert hit_ids == ["chunk_a", "chunk_b", "chunk_c", "chunk_d"]
+    for chunk_id, similarity in zip(hit_ids, similarities):
+        assert similarity == pytest.approx(1 / (1 + DISTANCES[chunk_id]))
+
+
+def test_duplicate_texts_stay_separate_in_hybrid_results(retriever):
+    results = retriever.hybrid_search("제안서 평가 방법", top_k=len(CHUNKS), alpha=1.0)
+    by_id = {doc['id']: doc for doc in results}
+
+    assert set(by_id) == {chunk_id for chunk_id, _, _, _ in CHUNKS}
+    for chunk_id, text, metadata, _ in CHUNKS:
+        assert by_id[chunk_id]['content'] == text
+        for field, value in metadata.items():
+            assert by_id[chunk_id]['metadata'][field] == value
+
+    # 본문이 같아도 각자의 거리로 정규화된 점수 (가장 가까운 a = 1, 가장 먼 d = 0)
+    assert by_id["chunk_a"]['embed_score'] == pytest.approx(1.0)
+    assert by_id["chunk_d"]['embed_score'] == pytest.approx(0.0)
+    assert by_id["chunk_a"]['embed_score'] > by_id["chunk_c"]['embed_score']
+    assert [doc['id'] for doc in results][:3] == ["chunk_a", "chunk_b", "chunk_c"]
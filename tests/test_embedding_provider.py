@@ -0,0 +1,89 @@
+"""
+질의 배치 임베딩 일관성
+
+search_many 등은 여러 질의를 embed_queries로 한 번에 임베딩합니다.
+e5 계열처럼 질의/문서 지시어가 다른 모델에서도 배치 결과가 embed_query와 같아야 하고,
+캐시에 질의 벡터로 문서 지시어 벡터가 저장되면 안 됩니다.
+"""
+
+import sys
+import types
+import hashlib
+
+import numpy as np
+import pytest
+
+from src.embedding.embedding_cache import CachedEmbeddings
+from src.embedding.embedding_provider import LocalEmbeddings, TruncatedEmbeddings, embed_queries
+
+
+QUERIES = ["입찰 참여 마감일이 언제인가요?", "사업 예산은 얼마인가요?", "입찰 참여 마감일이 언제인가요?"]
+
+
+class FakeSentenceTransformer:
+    """입력 문자열(지시어 포함) 해시로 정규화 벡터를 만드는 인코더"""
+
+    def __init__(self, model_name, device=None, backend=None):
+        self.model_name = model_name
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True,
+               show_progress_bar=False):
+        vectors = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:4], 'little')
+            vector = np.random.default_rng(seed).normal(size=8)
+            vectors.append(vector / np.linalg.norm(vector))
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class QueryOnlyEmbeddings:
+    """embed_queries가 없고 문서/질의 벡터가 다른 임베딩 (대체 경로 확인용)"""
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def embed_documents(self, texts):
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.inner.embed_query(text)
+
+
+@pytest.fixture
+def e5(monkeypatch):
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeSentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    return LocalEmbeddings("intfloat/multilingual-e5-base")
+
+
+def single(embeddings, texts):
+    return [embeddings.embed_query(text) for text in texts]
+
+
+def test_local_embed_queries_uses_query_prefix(e5):
+    assert np.allclose(e5.embed_queries(QUERIES), single(e5, QUERIES))
+    assert not np.allclose(e5.embed_queries(QUERIES[:1]), e5.embed_documents(QUERIES[:1]))
+
+
+def test_cached_embed_queries_matches_embed_query(e5, tmp_path):
+    expected = single(e5, QUERIES)
+    cached = CachedEmbeddings(e5, model_name="local:e5", path=str(tmp_path / "emb.sqlite3"))
+
+    assert np.allclose(cached.embed_queries(QUERIES), expected, atol=1e-6)
+    # 배치로 저장된 캐시 벡터를 단건 질의가 그대로 사용
+    assert np.allclose(single(cached, QUERIES), expected, atol=1e-6)
+    assert cached.misses == 2
+
+
+def test_cached_embed_queries_without_batch_falls_back_to_embed_query(e5, tmp_path):
+    cached = CachedEmbeddings(QueryOnlyEmbeddings(e5), model_name="local:e5", path=str(tmp_path / "emb.sqlite3"))
+    assert np.allclose(cached.embed_queries(QUERIES), single(e5, QUERIES), atol=1e-6)
+
+
+def test_truncated_and_helper_embed_queries_match_embed_query(e5, tmp_path):
+    cached = CachedEmbeddings(e5, model_name="local:e5", path=str(tmp_path / "emb.sqlite3"))
+    for embeddings in (TruncatedEmbeddings(cached, 4), TruncatedEmbeddings(QueryOnlyEmbeddings(e5), 4)):
+        assert np.allclose(embeddings.embed_queries(QUERIES), single(embeddings, QUERIES), atol=1e-6)
+
+    assert np.allclose(embed_queries(QueryOnlyEmbeddings(e5), QUERIES), single(e5, QUERIES))
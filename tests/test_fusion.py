@@ -0,0 +1,64 @@
+"""
+Hybrid 점수 결합 동등성
+
+위치 배열 기반 결합(scatter_dense_scores + fuse_scores + top_k_positions)이
+기존 dict 기반 결합과 같은 순위와 점수를 내는지 확인합니다.
+두 구현은 벤치마크(benchmark_retrieval fusion)와 같은 함수를 사용합니다.
+"""
+
+import numpy as np
+import pytest
+
+from src.evaluation.benchmark_retrieval import legacy_fusion, vectorized_fusion
+
+
+def assert_same_fusion(bm25_scores, positions, distances, alpha, top_k):
+    n_docs = len(bm25_scores)
+    doc_ids = [f"chunk_{i}" for i in range(n_docs)]
+    dense_hits = [(doc_ids[p], d) for p, d in zip(positions, distances)]
+
+    legacy = legacy_fusion(doc_ids, bm25_scores, dense_hits, alpha, top_k)
+    vectorized = vectorized_fusion(n_docs, bm25_scores, positions, distances, alpha, top_k)
+
+    assert [position for position, _ in vectorized] == [position for position, _ in legacy]
+    assert [score for _, score in vectorized] == [score for _, score in legacy]
+
+
+@pytest.mark.parametrize("alpha", [0.0, 0.3, 0.5, 1.0])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_fusion_matches_legacy_random(seed, alpha):
+    rng = np.random.default_rng(seed)
+    n_docs, top_k = 500, 10
+
+    # BM25 점수는 대부분 0 (질의어가 없는 문서)
+    bm25_scores = np.zeros(n_docs)
+    matched = rng.choice(n_docs, size=25, replace=False)
+    bm25_scores[matched] = rng.gamma(2.0, 2.0, size=matched.size)
+
+    positions = rng.choice(n_docs, size=top_k * 3, replace=False)
+    distances = rng.uniform(0.6, 1.4, size=positions.size)
+
+    assert_same_fusion(bm25_scores, positions, distances, alpha, top_k)
+
+
+def test_fusion_matches_legacy_ties():
+    # 동점이 많은 경우: 앞쪽 위치가 먼저 (sorted의 안정 정렬과 같음)
+    bm25_scores = np.array([0.0, 2.0, 2.0, 0.0, 1.0, 1.0, 0.0, 2.0])
+    positions = np.array([6, 3, 0])
+    distances = np.array([0.5, 0.5, 1.0])
+    assert_same_fusion(bm25_scores, positions, distances, alpha=0.5, top_k=6)
+
+
+def test_fusion_matches_legacy_duplicate_dense_hits():
+    # 같은 문서가 여러 번 검색되면 마지막 거리가 남음
+    bm25_scores = np.array([3.0, 0.0, 1.0, 0.0, 0.0])
+    positions = np.array([1, 3, 1, 4])
+    distances = np.array([0.2, 0.7, 0.9, 1.1])
+    assert_same_fusion(bm25_scores, positions, distances, alpha=0.5, top_k=5)
+
+
+def test_fusion_matches_legacy_degenerate_inputs():
+    # BM25 점수가 모두 같고 (0.5로 정규화) 임베딩 결과도 없는 경우
+    assert_same_fusion(np.zeros(6), np.array([], dtype=np.int64), np.array([]), alpha=0.5, top_k=4)
+    # 임베딩 후보가 하나뿐인 경우 (0.5로 정규화)
+    assert_same_fusion(np.array([0.0, 1.0, 4.0]), np.array([2]), np.array([0.3]), alpha=0.7, top_k=3)
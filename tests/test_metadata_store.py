@@ -0,0 +1,66 @@
+"""
+메타데이터 저장소 필터
+
+prepare_filter는 필드별 조건과 Chroma where 형식의 $and / $or 조합을 받아
+허용 문서 위치와 같은 조건의 Chroma where를 만듭니다.
+"""
+
+import pytest
+
+from src.retriever.metadata_store import MetadataStore
+
+
+METADATAS = [
+    {"발주 기관": "기관A", "공개 일자": "2024-01-10", "사업 금액": 1},
+    {"발주 기관": "기관B", "공개 일자": "2024-02-10", "사업 금액": 1.0},
+    {"발주 기관": "기관A", "공개 일자": "2024-03-10", "사업 금액": True},
+    {"발주 기관": "기관C"},
+]
+
+
+@pytest.fixture
+def store():
+    return MetadataStore.from_dicts(METADATAS)
+
+
+def test_values_of_different_types_keep_separate_codes(store):
+    assert store.values("사업 금액") == [1, 1.0, True]
+    assert [store.code_of("사업 금액", value) for value in (1, 1.0, True)] == [0, 1, 2]
+    assert [type(store.get(i, "사업 금액")) for i in range(3)] == [int, float, bool]
+
+
+def test_field_conditions_are_combined_with_and(store):
+    metadata_filter = store.prepare_filter({"발주 기관": "기관A", "공개 일자": {"$gte": "2024-02-01"}})
+
+    assert metadata_filter.positions.tolist() == [2]
+    assert metadata_filter.chroma_where() == {"$and": [
+        {"발주 기관": {"$in": ["기관A"]}},
+        {"공개 일자": {"$in": ["2024-02-10", "2024-03-10"]}},
+    ]}
+
+
+def test_chroma_style_or_and(store):
+    metadata_filter = store.prepare_filter({"$or": [{"발주 기관": "기관B"}, {"발주 기관": "기관C"}]})
+    assert metadata_filter.positions.tolist() == [1, 3]
+    assert metadata_filter.chroma_where() == {"$or": [
+        {"발주 기관": {"$in": ["기관B"]}},
+        {"발주 기관": {"$in": ["기관C"]}},
+    ]}
+
+    metadata_filter = store.prepare_filter({"$and": [
+        {"$or": [{"발주 기관": "기관A"}, {"발주 기관": "없는 기관"}]},
+        {"공개 일자": {"$lt": "2024-02-01"}},
+    ]})
+    assert metadata_filter.positions.tolist() == [0]
+    # 만족하는 문서가 없는 $or 분기는 where에서 빠짐
+    assert metadata_filter.chroma_where() == {"$and": [
+        {"발주 기관": {"$in": ["기관A"]}},
+        {"공개 일자": {"$in": ["2024-01-10"]}},
+    ]}
+
+
+def test_unsupported_operator_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.prepare_filter({"$not": {"발주 기관": "기관A"}})
+    with pytest.raises(ValueError):
+        store.prepare_filter({"$or": []})